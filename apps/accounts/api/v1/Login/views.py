@@ -1,6 +1,8 @@
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import generics, status
+from rest_framework.exceptions import Throttled
 from rest_framework.response import Response
+from apps.accounts.hashing import PasswordCheckBusy
 from .serializers import EmailLoginSerializer
 
 class EmailLoginAPIView(generics.GenericAPIView):
@@ -9,7 +11,11 @@ class EmailLoginAPIView(generics.GenericAPIView):
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except PasswordCheckBusy:
+            # Parol tekshiruv navbati to'lgan - worker larni band qilmasdan 429
+            raise Throttled(wait=1, detail="Too many login attempts in progress, retry shortly")
         user = serializer.validated_data.get("user")
 
         refresh = RefreshToken.for_user(user)
@@ -1,6 +1,8 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
+from apps.accounts.cache import revoke_tokens
 
 class LogoutAPIView(generics.GenericAPIView):
 
@@ -9,6 +11,9 @@ class LogoutAPIView(generics.GenericAPIView):
             refresh_token = request.data["refresh"]
             token = RefreshToken(refresh_token)
             token.blacklist()
+            # Shu paytgacha berilgan access tokenlar (WebSocket / cache) va so'rovdagi token ham bekor
+            jti = request.auth.get(api_settings.JTI_CLAIM) if request.auth is not None else None
+            revoke_tokens(token.payload[api_settings.USER_ID_CLAIM], jti=jti)
             return Response({"message": "✅ Logout muvaffaqiyatli"}, status=status.HTTP_205_RESET_CONTENT)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
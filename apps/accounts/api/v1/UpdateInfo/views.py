@@ -1,13 +1,22 @@
 from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.accounts.cache import invalidate_user
 from .serializers import UpdateInfoSerializer
 
+User = get_user_model()
+
 class UpdateInfoView(generics.UpdateAPIView):
     serializer_class = UpdateInfoSerializer
 
     def get_object(self):
-        return self.request.user
+        # request.user cache dagi snapshot - yozish uchun DB dagi joriy qator olinadi
+        return User.objects.get(pk=self.request.user.pk)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate_user(serializer.instance.pk)
 
     def patch(self, request, *args, **kwargs):
         partial = True  
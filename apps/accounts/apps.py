@@ -7,3 +7,4 @@ class AccountsConfig(AppConfig):
     
     def ready(self):
         from . import translation # noqa
+        from . import signals # noqa
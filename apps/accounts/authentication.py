@@ -0,0 +1,23 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .cache import get_user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, lekin user har so'rovda DB dan emas, qisqa TTL li snapshot dan olinadi
+    (apps.accounts.cache). Snapshot User saqlanganda / logout da tashlanadi
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = get_user(user_id, issued_at=validated_token.get('iat'), jti=validated_token.get(api_settings.JTI_CLAIM))
+        if user is None:
+            raise AuthenticationFailed(_("User not found, inactive or logged out"), code="user_not_found")
+        return user
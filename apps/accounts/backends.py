@@ -1,17 +1,25 @@
-from django.contrib.auth.backends import BaseBackend
+from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from .hashing import check_password, run_dummy_hash
 
 User = get_user_model()
 
-class EmailBackend(BaseBackend):
+class EmailBackend(ModelBackend):
+    """
+    Email + parol. Hash lash request thread ida emas, cheklangan executor da
+    (apps.accounts.hashing); executor to'lsa PasswordCheckBusy ko'tariladi
+    """
     def authenticate(self, request, email=None, password=None, **kwargs):
+        # Admin login formasi email ni `username` sifatida yuboradi
+        email = email or kwargs.get(User.USERNAME_FIELD) or kwargs.get('username')
         if email is None or password is None:
             return None
         try:
             user = User.objects.get(email=email)
         except User.DoesNotExist:
+            run_dummy_hash(password)
             return None
-        if user.check_password(password):
+        if check_password(user, password) and self.user_can_authenticate(user):
             return user
         return None
 
@@ -0,0 +1,164 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from modeltranslation.utils import get_translation_fields
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+DEFAULTS = {
+    # User snapshot va logout belgilari uchun CACHES alias
+    'CACHE_ALIAS': 'default',
+    # User snapshot yashash vaqti (soniya)
+    'USER_TTL': 60,
+    # Process ichidagi tekshirilgan tokenlar soni
+    'TOKEN_CACHE_SIZE': 10000,
+}
+
+
+# Snapshot da saqlanadigan fieldlar - parol hash i va boshqa maxfiy ma'lumotlar cache ga tushmaydi.
+# O'qish endpointlari (Me) ishlatadigan tarjima fieldlari ham shu yerda, aks holda har biri alohida SELECT
+SNAPSHOT_FIELDS = (
+    'id', 'email', 'first_name', 'last_name', 'is_active', 'is_staff', 'is_superuser',
+    *get_translation_fields('bio'),
+)
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'ACCOUNTS_AUTH_CACHE', {})}
+
+
+def get_cache():
+    return caches[get_config()['CACHE_ALIAS']]
+
+
+def user_key(user_id) -> str:
+    return f"accounts:user_snapshot:{user_id}"
+
+
+def revoked_key(user_id) -> str:
+    return f"accounts:revoked:{user_id}"
+
+
+def revoked_jti_key(jti) -> str:
+    return f"accounts:revoked_jti:{jti}"
+
+
+def to_snapshot(user) -> dict:
+    return {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+
+
+def from_snapshot(snapshot):
+    """Snapshot dan User: qolgan fieldlar deferred (kerak bo'lsa DB dan o'qiladi), save() faqat shu fieldlarni yozadi"""
+    User = get_user_model()
+    # from_db qiymatlarni model fieldlari tartibida kutadi
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in snapshot]
+    return User.from_db(DEFAULT_DB_ALIAS, names, [snapshot[name] for name in names])
+
+
+class TokenCache:
+    """
+    Tekshirilgan access token payload lari (process ichida, LRU, token exp gacha).
+    Kalit - token digest i: imzosi tekshirilmagan token hech qachon cache ga tushmaydi
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(raw_token) -> str:
+        if isinstance(raw_token, str):
+            raw_token = raw_token.encode()
+        return hashlib.sha256(raw_token).hexdigest()
+
+    def get(self, raw_token):
+        key = self.digest(raw_token)
+        with self._lock:
+            payload = self._items.get(key)
+            if payload is None:
+                return None
+            if payload['exp'] <= time.time():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return payload
+
+    def set(self, raw_token, payload):
+        key = self.digest(raw_token)
+        with self._lock:
+            self._items[key] = payload
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+token_cache = TokenCache(get_config()['TOKEN_CACHE_SIZE'])
+
+
+def verify_access_token(raw_token) -> dict:
+    """
+    Access token ni bir marta tekshirish (imzo, exp, token_type), keyingi ulanishlarda - cache dan.
+    Noto'g'ri token uchun TokenError
+    """
+    payload = token_cache.get(raw_token)
+    if payload is None:
+        payload = dict(AccessToken(raw_token).payload)
+        token_cache.set(raw_token, payload)
+    return payload
+
+
+def get_user(user_id, issued_at=None, jti=None):
+    """
+    User ni qisqa TTL li snapshot dan olish (steady state da DB so'rovsiz).
+    Logout soniyasidan oldin berilgan token (iat < revoked, ikkalasi butun soniya) va logout
+    qilgan tokenning o'zi (jti) uchun None. Logout bilan bir soniyada qayta login qilib olingan token qabul qilinadi
+    """
+    cache = get_cache()
+    keys = [user_key(user_id), revoked_key(user_id)]
+    if jti:
+        keys.append(revoked_jti_key(jti))
+    cached = cache.get_many(keys)
+    if jti and cached.get(revoked_jti_key(jti)):
+        return None
+    revoked_at = cached.get(revoked_key(user_id))
+    if revoked_at is not None and issued_at is not None and int(issued_at) < revoked_at:
+        return None
+
+    snapshot = cached.get(user_key(user_id))
+    if snapshot is None:
+        User = get_user_model()
+        user = User.objects.filter(pk=user_id).only(*SNAPSHOT_FIELDS).first()
+        if user is None:
+            return None
+        cache.set(user_key(user_id), to_snapshot(user), get_config()['USER_TTL'])
+    else:
+        user = from_snapshot(snapshot)
+    return user if user.is_active else None
+
+
+def invalidate_user(user_id):
+    get_cache().delete(user_key(user_id))
+
+
+def revoke_tokens(user_id, jti=None):
+    """
+    Logout: shu soniyadan oldin berilgan access tokenlar endi qabul qilinmaydi.
+    iat butun soniya bo'lgani uchun logout qilayotgan token (jti) alohida belgilanadi
+    """
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()) + 1
+    cache = get_cache()
+    values = {revoked_key(user_id): int(time.time())}
+    if jti:
+        values[revoked_jti_key(jti)] = True
+    cache.set_many(values, timeout)
+    cache.delete(user_key(user_id))
@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # Parol hash lash uchun ajratilgan thread lar (process bo'yicha)
+    'WORKERS': 4,
+    # Navbatda kutishi mumkin bo'lgan tekshiruvlar (bajarilayotganlari bilan); oshsa - 429
+    'MAX_PENDING': 16,
+    # Bitta tekshiruvni kutish chegarasi (soniya)
+    'TIMEOUT': 5,
+    # Telemetriya hisoblagichlari uchun CACHES alias
+    'CACHE_ALIAS': 'default',
+}
+
+STATS_KEYS = ('checks', 'failed', 'rehashed', 'rejected', 'hash_ms')
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'ACCOUNTS_PASSWORD_EXECUTOR', {})}
+
+
+class PasswordCheckBusy(Exception):
+    """Hash executor to'lgan - so'rovni keyinroq qaytarish kerak"""
+
+
+class PasswordExecutor:
+    """
+    Parol tekshiruvlari uchun cheklangan pool: bir vaqtdagi hash lar soni WORKERS bilan,
+    navbat MAX_PENDING bilan cheklangan. Navbat to'lsa kutmasdan PasswordCheckBusy
+    """
+
+    def __init__(self, workers=4, max_pending=16, timeout=5):
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self.slots = threading.BoundedSemaphore(max_pending)
+
+    def run(self, func, *args):
+        if not self.slots.acquire(blocking=False):
+            record('rejected')
+            raise PasswordCheckBusy()
+        try:
+            future = self.executor.submit(func, *args)
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            record('rejected')
+            raise PasswordCheckBusy()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> PasswordExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                config = get_config()
+                _executor = PasswordExecutor(config['WORKERS'], config['MAX_PENDING'], config['TIMEOUT'])
+    return _executor
+
+
+def check_password(user, raw_password) -> bool:
+    """
+    user.check_password ni executor da bajarish. Hasher eskirgan bo'lsa Django
+    parolni shu yerda qayta hash lab saqlaydi (rehash-on-login) - bu ham hisobga olinadi.
+
+    Rehash dagi save() pool thread ining o'z DB ulanishida bajariladi: request
+    tranzaksiyasidan tashqarida (ATOMIC_REQUESTS bo'lsa ham) darhol commit bo'ladi
+    va request rollback bo'lsa ham yangi hash saqlanib qoladi
+    """
+    def check():
+        # Pool thread ining DB ulanishi (rehash save) eskirgan bo'lsa yopiladi
+        close_old_connections()
+        old_hash = user.password
+        started = time.perf_counter()
+        valid = user.check_password(raw_password)
+        record('hash_ms', int((time.perf_counter() - started) * 1000))
+        record('checks')
+        if not valid:
+            record('failed')
+        elif user.password != old_hash:
+            record('rehashed')
+        return valid
+
+    return get_executor().run(check)
+
+
+def run_dummy_hash(raw_password):
+    """Mavjud bo'lmagan email uchun ham bir xil vaqt (user enumeration dan himoya)"""
+    from django.contrib.auth import get_user_model
+
+    get_executor().run(get_user_model()().set_password, raw_password)
+
+
+def record(name, value=1):
+    cache = caches[get_config()['CACHE_ALIAS']]
+    key = f"accounts:password:{name}"
+    try:
+        cache.incr(key, value)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key, value)
+    except Exception:
+        logger.debug(f"Password telemetry write failed: {name}", exc_info=True)
+
+
+def get_stats() -> dict:
+    cache = caches[get_config()['CACHE_ALIAS']]
+    values = cache.get_many([f"accounts:password:{name}" for name in STATS_KEYS])
+    return {name: values.get(f"accounts:password:{name}", 0) for name in STATS_KEYS}
+
+
+def reset_stats():
+    caches[get_config()['CACHE_ALIAS']].delete_many([f"accounts:password:{name}" for name in STATS_KEYS])
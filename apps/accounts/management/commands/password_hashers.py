@@ -0,0 +1,62 @@
+import time
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+from apps.accounts.hashing import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = "Parol hasher lari: bitta hash narxi, userlar qaysi hasher / iteratsiyada (rehash-on-login), login telemetriyasi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=3, help="Har bir hasher uchun o'lchovlar soni")
+        parser.add_argument('--reset-stats', action='store_true', help="Login hisoblagichlarini nollash")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        hashers = get_hashers()
+        total = User.objects.count()
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Hasherlar (birinchisi - joriy)"))
+        for index, hasher in enumerate(hashers):
+            users = User.objects.filter(password__startswith=f"{hasher.algorithm}$").count()
+            try:
+                cost = f"{self.measure(hasher, options['rounds']):.1f} ms/hash"
+            except ValueError:
+                # Kutubxonasi o'rnatilmagan hasher (argon2, bcrypt)
+                cost = "not available"
+            line = f"  {hasher.algorithm}: {cost}, users={users}"
+            iterations = getattr(hasher, 'iterations', None)
+            if index == 0 and iterations:
+                current = User.objects.filter(password__startswith=f"{hasher.algorithm}${iterations}$").count()
+                line += f", current iterations ({iterations})={current}"
+            self.stdout.write(line)
+
+        # Joriy hasher va iteratsiyada bo'lmaganlar keyingi login da qayta hash lanadi
+        current_hasher = hashers[0]
+        prefix = f"{current_hasher.algorithm}$"
+        if getattr(current_hasher, 'iterations', None):
+            prefix += f"{current_hasher.iterations}$"
+        unusable = User.objects.filter(password__startswith='!').count()
+        outdated = total - User.objects.filter(password__startswith=prefix).count() - unusable
+        self.stdout.write(self.style.MIGRATE_HEADING("Rehash-on-login"))
+        self.stdout.write(f"  users={total}, outdated={outdated}, unusable={unusable}")
+
+        stats = get_stats()
+        average = stats['hash_ms'] / stats['checks'] if stats['checks'] else 0
+        self.stdout.write(self.style.MIGRATE_HEADING("Login telemetriyasi"))
+        self.stdout.write(
+            f"  checks={stats['checks']}, failed={stats['failed']}, rehashed={stats['rehashed']}, "
+            f"rejected(429)={stats['rejected']}, avg={average:.1f} ms"
+        )
+
+        if options['reset_stats']:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS("Hisoblagichlar nollandi"))
+
+    def measure(self, hasher, rounds) -> float:
+        salt = hasher.salt()
+        started = time.perf_counter()
+        for _ in range(rounds):
+            hasher.encode('benchmark-password', salt)
+        return (time.perf_counter() - started) * 1000 / rounds
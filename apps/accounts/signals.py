@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .cache import invalidate_user
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """User snapshot ni commit dan keyin tashlash (eski holat qayta cache ga tushmasligi uchun)"""
+    transaction.on_commit(lambda: invalidate_user(instance.pk))
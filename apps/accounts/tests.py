@@ -1,3 +1,132 @@
-from django.test import TestCase
+import pickle
+import threading
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from . import hashing
+from .cache import get_user, revoke_tokens, revoked_key, user_key
+from .models import User
 
-# Create your tests here.
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'accounts-tests'}},
+)
+class UserCacheTests(TestCase):
+    """User snapshot (parolsiz) va logout bo'yicha tokenlarni bekor qilish"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='cache@example.com', password='secret', first_name='Ali')
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def test_snapshot_has_no_password(self):
+        get_user(self.user.pk)
+        snapshot = caches['default'].get(user_key(self.user.pk))
+        self.assertNotIn('password', snapshot)
+        self.assertNotIn(self.user.password.encode(), pickle.dumps(snapshot))
+
+        with self.assertNumQueries(0):
+            user = get_user(self.user.pk)
+        self.assertEqual((user.pk, user.email, user.first_name), (self.user.pk, 'cache@example.com', 'Ali'))
+        self.assertIn('password', user.get_deferred_fields())
+
+    def test_relogin_in_logout_second(self):
+        old = AccessToken.for_user(self.user)
+        revoke_tokens(self.user.pk, jti=old['jti'])
+        revoked_at = caches['default'].get(revoked_key(self.user.pk))
+        self.assertIsInstance(revoked_at, int)
+
+        # Logout qilgan token, oldingi soniyada berilgan token va shu soniyada qayta login
+        self.assertIsNone(get_user(self.user.pk, issued_at=revoked_at, jti=old['jti']))
+        self.assertIsNone(get_user(self.user.pk, issued_at=revoked_at - 1, jti='earlier'))
+        new = AccessToken.for_user(self.user)
+        self.assertEqual(get_user(self.user.pk, issued_at=revoked_at, jti=new['jti']), self.user)
+
+    def test_me_without_queries(self):
+        self.user.bio_uz, self.user.bio_en = 'Dasturchi', 'Developer'
+        self.user.save()
+        caches['default'].clear()
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+        # Birinchi so'rov snapshot ni yozadi
+        self.client.get(reverse('me'), **headers)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('me'), **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['bio'], {'bio_uz': 'Dasturchi', 'bio_ru': None, 'bio_en': 'Developer'})
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'accounts-hashing'}},
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.PBKDF2PasswordHasher', 'django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class PasswordExecutorTests(TransactionTestCase):
+    """Login paroli cheklangan executor da: navbat to'lsa / kutish tugasa 429, rehash telemetriyada"""
+
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user(email='login@example.com', password='secret')
+
+    def use_executor(self, **kwargs):
+        executor = hashing.PasswordExecutor(**{'workers': 1, 'max_pending': 1, 'timeout': 5, **kwargs})
+        previous, hashing._executor = hashing._executor, executor
+        self.addCleanup(setattr, hashing, '_executor', previous)
+        self.addCleanup(executor.executor.shutdown)
+        return executor
+
+    def login(self):
+        return self.client.post(reverse('email-login'), {'email': 'login@example.com', 'password': 'secret'})
+
+    def test_full_queue_returns_429(self):
+        executor = self.use_executor()
+        started, release = threading.Event(), threading.Event()
+
+        def hold():
+            started.set()
+            release.wait(5)
+
+        holder = threading.Thread(target=executor.run, args=(hold,))
+        holder.start()
+        self.addCleanup(holder.join)
+        self.addCleanup(release.set)
+        self.assertTrue(started.wait(5))
+
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(hashing.get_stats()['rejected'], 1)
+
+        release.set()
+        holder.join()
+        self.assertEqual(self.login().status_code, 200)
+
+    def test_timeout_releases_slot_when_done(self):
+        executor = self.use_executor(timeout=0.05)
+        release = threading.Event()
+
+        with self.assertRaises(hashing.PasswordCheckBusy):
+            executor.run(release.wait, 5)
+        self.assertEqual(hashing.get_stats()['rejected'], 1)
+        # Kutish tugadi, lekin hash hali bajarilmoqda - slot band
+        self.assertEqual(self.login().status_code, 429)
+
+        release.set()
+        executor.executor.submit(lambda: None).result()
+        self.assertEqual(executor.run(lambda: 'ok'), 'ok')
+
+    def test_rehash_on_login_counted(self):
+        self.use_executor()
+        User.objects.filter(pk=self.user.pk).update(password=make_password('secret', hasher='md5'))
+
+        self.assertEqual(self.login().status_code, 200)
+        self.assertEqual(self.login().status_code, 200)
+        stats = hashing.get_stats()
+        self.assertEqual({name: stats[name] for name in ('checks', 'failed', 'rehashed', 'rejected')},
+                         {'checks': 2, 'failed': 0, 'rehashed': 1, 'rejected': 0})
+        # Yangi hash pool thread ulanishida saqlangan
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
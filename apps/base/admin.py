@@ -1,3 +1,174 @@
-from django.contrib import admin
+import base64
+import json
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.templatetags.admin_list import pagination
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
 
-# Register your models here.
+CURSOR_VAR = 'cursor'
+
+
+def estimate_count(queryset):
+    """
+    PostgreSQL statistikasi (ANALYZE / autovacuum) bo'yicha jadvaldagi taxminiy qatorlar soni.
+    Partitionlangan jadvalda partitionlar yig'indisi; statistika bo'lmasa None
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    table = queryset.model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT sum(reltuples) FILTER (WHERE reltuples >= 0) FROM pg_class "
+            "WHERE (oid = %s::regclass AND relkind <> 'p') "
+            "OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass)",
+            [table, table],
+        )
+        estimate = cursor.fetchone()[0]
+    return None if estimate is None else int(estimate)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Admin changelist uchun: filtrsiz ro'yxatda COUNT(*) o'rniga pg_class.reltuples,
+    filtr / qidiruv bo'lsa `count_limit` tagacha sanaladi (LIMIT li subquery)
+    """
+
+    # Shundan kichik jadvallarda aniq COUNT arzon
+    exact_threshold = 10000
+    count_limit = 10000
+
+    estimated = False
+    capped = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate > self.exact_threshold:
+                self.estimated = True
+                return estimate
+
+        # values('pk') - annotatsiyalar (subquery count lar) COUNT ichida hisoblanmaydi
+        count = queryset.values('pk').order_by()[:self.count_limit + 1].count()
+        if count > self.count_limit:
+            self.capped = True
+            return self.count_limit
+        return count
+
+
+def seek_filter(ordering, values):
+    """(a, -b) bo'yicha tartiblangan ro'yxatda (x, y) dan keyingi qatorlar: a > x OR (a = x AND b < y)"""
+    condition = Q()
+    for index, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        step = Q(**{f'{name}__{lookup}': values[index]})
+        for prev_field, prev_value in zip(ordering[:index], values[:index]):
+            step &= Q(**{prev_field.lstrip('-'): prev_value})
+        condition |= step
+    return condition
+
+
+def encode_cursor(values):
+    payload = json.dumps([value if isinstance(value, (int, float)) else str(value) for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(encoded, length):
+    try:
+        padded = encoded + '=' * (-len(encoded) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise IncorrectLookupParameters('Invalid cursor')
+    if not isinstance(values, list) or len(values) != length:
+        raise IncorrectLookupParameters('Invalid cursor')
+    return values
+
+
+class KeysetChangeList(ChangeList):
+    """
+    Admin o'z tartibi (`keyset_ordering`) bo'yicha ko'rsatilganda OFFSET o'rniga
+    ?cursor=<oxirgi qator kaliti> bilan "keyingi sahifa" - chuqur sahifalar ham indeks bo'yicha o'qiladi.
+    Ustun bo'yicha tartiblansa oddiy sahifalashga qaytadi
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = request.GET.get(CURSOR_VAR)
+        self.next_url = None
+        self.first_url = None
+        super().__init__(request, *args, **kwargs)
+
+    @cached_property
+    def keyset(self):
+        return ORDER_VAR not in self.params and not self.list_editable
+
+    @property
+    def keyset_ordering(self):
+        return tuple(self.model_admin.keyset_ordering)
+
+    @cached_property
+    def pagination(self):
+        """Sahifalash bloki konteksti (large_table_change_list.html)"""
+        context = pagination(self)
+        context['keyset_paging'] = bool(self.next_url or self.first_url)
+        return context
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Filtr, qidiruv, tartib linklari birinchi sahifadan boshlanadi
+        if CURSOR_VAR not in (new_params or {}):
+            remove = [*(remove or []), CURSOR_VAR]
+        return super().get_query_string(new_params, remove)
+
+    def get_ordering(self, request, queryset):
+        if self.keyset:
+            return list(self.keyset_ordering)
+        return super().get_ordering(request, queryset)
+
+    def get_results(self, request):
+        super().get_results(request)
+        if not self.keyset or (self.show_all and self.can_show_all) or not (self.multi_page or self.cursor):
+            return
+
+        queryset = self.queryset
+        try:
+            if self.cursor:
+                values = decode_cursor(self.cursor, len(self.keyset_ordering))
+                queryset = queryset.filter(seek_filter(self.keyset_ordering, values))
+                self.first_url = self.get_query_string()
+            rows = list(queryset[:self.list_per_page + 1])
+        except (ValidationError, ValueError, TypeError):
+            # Cursor qiymatlari field turiga mos kelmadi
+            raise IncorrectLookupParameters('Invalid cursor')
+
+        self.result_list = rows[:self.list_per_page]
+        if len(rows) > self.list_per_page:
+            last = self.result_list[-1]
+            values = [getattr(last, field.lstrip('-')) for field in self.keyset_ordering]
+            self.next_url = self.get_query_string({CURSOR_VAR: encode_cursor(values)})
+
+
+class LargeTableAdminMixin:
+    """
+    Katta jadvallar uchun changelist: taxminiy / chegaralangan COUNT va keyset sahifalash.
+    `keyset_ordering` - indeksli fieldlar, oxirgisi unikal
+    """
+
+    paginator = EstimatedCountPaginator
+    # Filtrsiz umumiy COUNT(*) ham so'ralmaydi
+    show_full_result_count = False
+    keyset_ordering = ('-created_at', '-id')
+    change_list_template = 'admin/large_table_change_list.html'
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
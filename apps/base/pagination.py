@@ -0,0 +1,117 @@
+import base64
+import json
+from itertools import islice
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination: offset o'rniga oxirgi qatorning kaliti bo'yicha
+    `WHERE (a, b) > (x, y) ORDER BY a, b LIMIT n` - chuqur sahifalarda ham tez.
+    View da `keyset_ordering` (o'sish tartibida, oxirgisi unikal) berilishi kerak
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 50
+    max_page_size = 500
+    ordering = ('id',)
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, 'keyset_ordering', self.ordering))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self.get_ordering(view)
+        page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        try:
+            if cursor is not None:
+                queryset = queryset.filter(self.build_seek_filter(cursor))
+            rows = list(queryset.order_by(*self.ordering)[:page_size + 1])
+        except (DjangoValidationError, ValueError, TypeError):
+            # Cursor qiymatlari field turiga mos kelmadi
+            raise NotFound(self.invalid_cursor_message)
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def paginate_stream(self, make_stream, request, view=None):
+        """
+        Oldindan tartiblangan oqim uchun (masalan RRULE takrorlanishlari).
+        make_stream(cursor, limit) cursor dan keyingi elementlarni qaytarishi kerak
+        """
+        self.request = request
+        self.ordering = self.get_ordering(view)
+        page_size = self.get_page_size(request)
+
+        rows = list(islice(make_stream(self.decode_cursor(request), page_size + 1), page_size + 1))
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def build_seek_filter(self, values):
+        """(a, b, c) > (x, y, z) ni Q lar bilan ifodalash"""
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            step = Q(**{f'{field}__gt': values[index]})
+            for prev_field, prev_value in zip(self.ordering[:index], values[:index]):
+                step &= Q(**{prev_field: prev_value})
+            condition |= step
+        return condition
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_cursor_values(self, obj):
+        return [getattr(obj, field) for field in self.ordering]
+
+    def encode_cursor(self, values):
+        payload = json.dumps([str(value) if not isinstance(value, (int, float)) else value for value in values])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.get_cursor_values(self.page[-1])))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -1,19 +1,35 @@
 from django.contrib import admin
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
-from .models import UserRequest,Event, EventInvite, EventAlert, ParsedEventDraft, AuditLog
+from apps.base.admin import LargeTableAdminMixin
+from .models import UserRequest,Event, EventException, EventOccurrence, EventInvite, EventAlert, ParsedEventDraft, AuditLog
 from .filters import FutureEventsFilter
 
 
+def related_count(model, field='event'):
+    """Bog'liq qatorlar soni - har bir qator uchun alohida so'rov o'rniga subquery"""
+    counts = (
+        model.objects.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
 @admin.register(UserRequest)
-class UserRequestAdmin(admin.ModelAdmin):
+class UserRequestAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('user', 'text', 'created_at')
-    search_fields = ('user__username', 'text')
+    list_select_related = ('user',)
+    search_fields = ('user__email', 'text')
     readonly_fields = ('created_at', 'updated_at')
     
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         'title', 
         'user_link', 
@@ -36,7 +52,6 @@ class EventAdmin(admin.ModelAdmin):
     search_fields = (
         'title', 
         'note', 
-        'user__username', 
         'user__email',
         'timezone',
     )
@@ -71,14 +86,25 @@ class EventAdmin(admin.ModelAdmin):
     )
     date_hierarchy = 'time_start'
     ordering = ('-time_start',)
+    keyset_ordering = ('-time_start', '-id')
     list_per_page = 25
     actions = ['mark_as_cancelled', 'mark_as_active']
     
+    def get_queryset(self, request):
+        # user, invite / alert sonlari changelist da bitta so'rovda
+        queryset = super().get_queryset(request).select_related('user').annotate(
+            invites_total=related_count(EventInvite),
+            alerts_total=related_count(EventAlert),
+        )
+        if request.resolver_match and request.resolver_match.url_name.endswith('_change'):
+            queryset = queryset.prefetch_related('invites', 'alerts')
+        return queryset
+    
     def user_link(self, obj):
-        url = reverse("admin:auth_user_change", args=[obj.user.id])
-        return format_html('<a href="{}">{}</a>', url, obj.user.username)
+        url = reverse("admin:accounts_user_change", args=[obj.user.id])
+        return format_html('<a href="{}">{}</a>', url, obj.user.email)
     user_link.short_description = _('User')
-    user_link.admin_order_field = 'user__username'
+    user_link.admin_order_field = 'user__email'
     
     def all_day_display(self, obj):
         if obj.all_day:
@@ -103,16 +129,16 @@ class EventAdmin(admin.ModelAdmin):
     duration_display.short_description = _('Duration')
     
     def invites_count(self, obj):
-        count = obj.invites.count()
-        url = reverse("admin:events_eventinvite_changelist") + f"?event__id__exact={obj.id}"
-        return format_html('<a href="{}">{}</a>', url, count)
+        url = reverse("admin:calendarapp_eventinvite_changelist") + f"?event__id__exact={obj.id}"
+        return format_html('<a href="{}">{}</a>', url, obj.invites_total)
     invites_count.short_description = _('Invites')
+    invites_count.admin_order_field = 'invites_total'
     
     def alerts_count(self, obj):
-        count = obj.alerts.count()
-        url = reverse("admin:events_eventalert_changelist") + f"?event__id__exact={obj.id}"
-        return format_html('<a href="{}">{}</a>', url, count)
+        url = reverse("admin:calendarapp_eventalert_changelist") + f"?event__id__exact={obj.id}"
+        return format_html('<a href="{}">{}</a>', url, obj.alerts_total)
     alerts_count.short_description = _('Alerts')
+    alerts_count.admin_order_field = 'alerts_total'
     
     def invites_list(self, obj):
         invites = obj.invites.all()
@@ -157,12 +183,35 @@ class EventAdmin(admin.ModelAdmin):
     mark_as_active.short_description = _('Mark selected events as active')
 
 
+@admin.register(EventException)
+class EventExceptionAdmin(admin.ModelAdmin):
+    list_display = ('event', 'original_start', 'is_cancelled', 'time_start', 'time_end')
+    list_select_related = ('event',)
+    list_filter = ('is_cancelled',)
+    search_fields = ('event__title', 'title')
+    readonly_fields = ('created_at', 'updated_at')
+    autocomplete_fields = ('event',)
+    list_per_page = 50
+
+
+@admin.register(EventOccurrence)
+class EventOccurrenceAdmin(admin.ModelAdmin):
+    list_display = ('event', 'user', 'time_start', 'time_end', 'original_start')
+    list_select_related = ('event', 'user')
+    search_fields = ('event__title', 'user__email')
+    readonly_fields = ('created_at', 'updated_at')
+    raw_id_fields = ('event', 'user')
+    date_hierarchy = 'time_start'
+    list_per_page = 50
+
+
 @admin.register(EventInvite)
 class EventInviteAdmin(admin.ModelAdmin):
     list_display = (
         'email', 
         'event_link', 
         'status_display', 
+        'sent_at',
         'created_at',
     )
     list_filter = (
@@ -173,15 +222,16 @@ class EventInviteAdmin(admin.ModelAdmin):
     search_fields = (
         'email', 
         'event__title',
-        'event__user__username',
+        'event__user__email',
     )
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('sent_at', 'claimed_at', 'send_attempts', 'created_at', 'updated_at')
+    list_select_related = ('event',)
     autocomplete_fields = ('event',)
     list_per_page = 50
     actions = ['mark_as_accepted', 'mark_as_declined', 'mark_as_pending']
     
     def event_link(self, obj):
-        url = reverse("admin:events_event_change", args=[obj.event.id])
+        url = reverse("admin:calendarapp_event_change", args=[obj.event.id])
         return format_html('<a href="{}">{}</a>', url, obj.event.title)
     event_link.short_description = _('Event')
     event_link.admin_order_field = 'event__title'
@@ -232,7 +282,7 @@ class EventAlertAdmin(admin.ModelAdmin):
     )
     search_fields = (
         'event__title',
-        'event__user__username',
+        'event__user__email',
     )
     readonly_fields = (
         'created_at', 
@@ -240,12 +290,13 @@ class EventAlertAdmin(admin.ModelAdmin):
         'offset_display',
         'display_text',
     )
+    list_select_related = ('event',)
     autocomplete_fields = ('event',)
     list_per_page = 50
     actions = ['mark_as_sent', 'mark_as_unsent']
     
     def event_link(self, obj):
-        url = reverse("admin:events_event_change", args=[obj.event.id])
+        url = reverse("admin:calendarapp_event_change", args=[obj.event.id])
         return format_html('<a href="{}">{}</a>', url, obj.event.title)
     event_link.short_description = _('Event')
     event_link.admin_order_field = 'event__title'
@@ -293,7 +344,7 @@ class ParsedEventDraftAdmin(admin.ModelAdmin):
     search_fields = (
         'original_text', 
         'intent',
-        'user__username',
+        'user__email',
         'extracted_data',
     )
     readonly_fields = (
@@ -319,12 +370,13 @@ class ParsedEventDraftAdmin(admin.ModelAdmin):
         }),
     )
     list_per_page = 25
+    list_select_related = ('user',)
     actions = ['mark_as_confirmed', 'mark_as_unconfirmed']
     
     def user_link(self, obj):
         if obj.user:
-            url = reverse("admin:auth_user_change", args=[obj.user.id])
-            return format_html('<a href="{}">{}</a>', url, obj.user.username)
+            url = reverse("admin:accounts_user_change", args=[obj.user.id])
+            return format_html('<a href="{}">{}</a>', url, obj.user.email)
         return '-'
     user_link.short_description = _('User')
     
@@ -373,7 +425,7 @@ class ParsedEventDraftAdmin(admin.ModelAdmin):
 
 
 @admin.register(AuditLog)
-class AuditLogAdmin(admin.ModelAdmin):
+class AuditLogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         'action_display', 
         'model_name', 
@@ -387,10 +439,11 @@ class AuditLogAdmin(admin.ModelAdmin):
         'created_at',
     )
     search_fields = (
-        'user__username',
+        'user__email',
         'event__title',
         'model_name',
-        'object_id',
+        # Aniq moslik - auditlog_object_id index i ishlatiladi
+        '=object_id',
     )
     readonly_fields = (
         'created_at', 
@@ -413,17 +466,18 @@ class AuditLogAdmin(admin.ModelAdmin):
     )
     date_hierarchy = 'created_at'
     list_per_page = 50
+    list_select_related = ('user', 'event')
     
     def user_link(self, obj):
         if obj.user:
-            url = reverse("admin:auth_user_change", args=[obj.user.id])
-            return format_html('<a href="{}">{}</a>', url, obj.user.username)
+            url = reverse("admin:accounts_user_change", args=[obj.user.id])
+            return format_html('<a href="{}">{}</a>', url, obj.user.email)
         return '-'
     user_link.short_description = _('User')
     
     def event_link(self, obj):
         if obj.event:
-            url = reverse("admin:events_event_change", args=[obj.event.id])
+            url = reverse("admin:calendarapp_event_change", args=[obj.event.id])
             return format_html('<a href="{}">{}</a>', url, obj.event.title)
         return '-'
     event_link.short_description = _('Event')
@@ -456,7 +510,7 @@ class AuditLogAdmin(admin.ModelAdmin):
         try:
             # Import all models from your app
             from django.apps import apps
-            model_class = apps.get_model('events', obj.model_name.lower())
+            model_class = apps.get_model('calendarapp', obj.model_name.lower())
             
             # Try to get the object
             model_obj = model_class.objects.filter(pk=obj.object_id).first()
@@ -0,0 +1,17 @@
+from rest_framework import serializers
+from apps.calendarapp.rsvp import STATUSES, get_config
+
+
+class RsvpItemSerializer(serializers.Serializer):
+    id = serializers.UUIDField(required=False)
+    email = serializers.EmailField(required=False)
+    status = serializers.ChoiceField(choices=STATUSES)
+    
+    def validate(self, attrs):
+        if ('id' in attrs) == ('email' in attrs):
+            raise serializers.ValidationError("Exactly one of id or email is required")
+        return attrs
+
+
+class EventInviteBulkRsvpSerializer(serializers.Serializer):
+    items = RsvpItemSerializer(many=True, allow_empty=False, max_length=get_config()['MAX_ITEMS'])
@@ -0,0 +1,65 @@
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.shortcuts import get_object_or_404
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+from .serializers import EventInviteBulkRsvpSerializer
+from apps.calendarapp.models import Event, EventInvite
+from apps.calendarapp.rsvp import invite_counts, push_counts, set_statuses
+
+
+class EventInviteBulkRsvpView(GenericAPIView):
+    """
+    Organizer uchun ko'p invite javobini bitta requestda o'zgartirish (id yoki email bo'yicha).
+    Bitta SELECT, har bir status uchun UPDATE ... WHERE id IN (...) va yig'ma sonlar
+    POST /events/<id>/invites/rsvp/ {"items": [{"email": "...", "status": "accepted"}, ...]}
+    """
+    serializer_class = EventInviteBulkRsvpSerializer
+    
+    def post(self, request, pk):
+        event = get_object_or_404(Event.objects.for_user(request.user).only('id', 'user_id'), pk=pk)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['items']
+        
+        emails = {item['email'].lower() for item in items if 'email' in item}
+        ids = {item['id'] for item in items if 'id' in item}
+        by_email, known_ids = {}, set()
+        rows = (
+            EventInvite.objects
+            .filter(event=event)
+            .alias(email_lower=Lower('email'))
+            .filter(Q(email_lower__in=emails) | Q(pk__in=ids))
+        )
+        for invite_id, email in rows.values_list('id', 'email'):
+            by_email[email.lower()] = invite_id
+            known_ids.add(invite_id)
+        
+        changes = defaultdict(list)
+        not_found = []
+        # Bir invite bir necha marta kelsa - oxirgisi
+        targets = {}
+        for item in items:
+            invite_id = by_email.get(item['email'].lower()) if 'email' in item else item['id']
+            if invite_id is None or invite_id not in known_ids:
+                not_found.append(item.get('email') or str(item['id']))
+                continue
+            targets[invite_id] = item['status']
+        for invite_id, status in targets.items():
+            changes[status].append(invite_id)
+        
+        with transaction.atomic():
+            updated = set_statuses(event.id, changes)
+            counts = invite_counts(event.id)
+            push_counts(event.user_id, event.id, counts)
+        
+        return Response({
+            'updated': updated,
+            'not_found': not_found,
+            'counts': counts,
+        })
+
+
+__all__ = ['EventInviteBulkRsvpView']
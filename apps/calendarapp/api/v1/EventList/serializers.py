@@ -0,0 +1,49 @@
+import pytz
+from rest_framework import serializers
+from apps.calendarapp.manager import day_range
+from apps.calendarapp.models import Event
+
+
+class EventRangeQuerySerializer(serializers.Serializer):
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    # start / end o'rniga: timezone dagi bitta kun
+    date = serializers.DateField(required=False)
+    timezone = serializers.CharField(max_length=50, required=False)
+    
+    def validate_timezone(self, value):
+        if value not in pytz.all_timezones_set:
+            raise serializers.ValidationError("Unknown timezone")
+        return value
+    
+    def validate(self, attrs):
+        if 'date' in attrs:
+            attrs['start'], attrs['end'] = day_range(attrs['date'], attrs.get('timezone'))
+            return attrs
+        missing = {field: "This field is required." for field in ('start', 'end') if field not in attrs}
+        if missing:
+            raise serializers.ValidationError(missing)
+        if attrs['end'] <= attrs['start']:
+            raise serializers.ValidationError({'end': "end must be later than start"})
+        return attrs
+
+
+class EventListSerializer(serializers.ModelSerializer):
+    # Takrorlanuvchi eventlar uchun RRULE bo'yicha asl boshlanish vaqti
+    original_start = serializers.DateTimeField(read_only=True, default=None)
+    
+    class Meta:
+        model = Event
+        fields = [
+            'id',
+            'title',
+            'all_day',
+            'time_start',
+            'time_end',
+            'repeat',
+            'url',
+            'note',
+            'is_cancelled',
+            'timezone',
+            'original_start',
+        ]
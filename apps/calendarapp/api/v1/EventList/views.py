@@ -0,0 +1,64 @@
+import uuid
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import ListAPIView
+from .serializers import EventListSerializer, EventRangeQuerySerializer
+from apps.base.pagination import KeysetPagination
+from apps.calendarapp.models import Event, EventOccurrence
+from apps.calendarapp.occurrences import materialized_until, to_occurrence
+from apps.calendarapp.recurrence import RecurrenceExpander
+
+
+class EventListView(ListAPIView):
+    """
+    Berilgan [start, end) oralig'idagi eventlar (kesishish bo'yicha).
+    Takrorlanuvchi (RRULE) eventlar har bir takrorlanish sifatida qaytariladi:
+    horizon ichida EventOccurrence jadvalidan, undan keyin RRULE ni ochib
+    GET /events/?start=...&end=...&cursor=...
+    GET /events/?date=2025-01-31&timezone=Asia/Tashkent - shu kun (yarim tundan o'tadiganlar ham)
+    """
+    serializer_class = EventListSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('time_start', 'id')
+    
+    def get_queryset(self):
+        return Event.objects.for_user(self.request.user).active()
+    
+    def list(self, request, *args, **kwargs):
+        params = EventRangeQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        start = params.validated_data['start']
+        end = params.validated_data['end']
+        
+        if end <= materialized_until():
+            queryset = (
+                EventOccurrence.objects
+                .for_user(request.user)
+                .overlapping(start, end)
+                .select_related('event')
+            )
+            page = [to_occurrence(row) for row in self.paginate_queryset(queryset)]
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        expander = RecurrenceExpander.from_settings()
+        
+        def make_stream(cursor, limit):
+            after = None
+            if cursor is not None:
+                try:
+                    cursor_start = parse_datetime(str(cursor[0]))
+                    cursor_id = uuid.UUID(str(cursor[1]))
+                except ValueError:
+                    cursor_start = None
+                if cursor_start is None:
+                    raise NotFound(self.paginator.invalid_cursor_message)
+                after = (cursor_start, str(cursor_id))
+            return expander.expand(self.get_queryset(), start, end, after=after, limit=limit)
+        
+        page = self.paginator.paginate_stream(make_stream, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+__all__ = ['EventListView']
@@ -0,0 +1,6 @@
+from rest_framework import serializers
+from apps.calendarapp.rsvp import RESPONSES
+
+
+class InviteRsvpSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=RESPONSES)
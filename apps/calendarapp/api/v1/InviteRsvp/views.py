@@ -0,0 +1,52 @@
+from django.core import signing
+from django.db import transaction
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer, TemplateHTMLRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .serializers import InviteRsvpSerializer
+from apps.calendarapp.rsvp import push_counts, read_token, set_statuses
+
+
+class InviteRsvpView(APIView):
+    """
+    Taklif emailidagi javob linki (autentifikatsiyasiz, imzolangan token).
+    GET hech narsani o'zgartirmaydi - tasdiqlash sahifasi (link preview / pochta skanerlari
+    javobni o'zgartirib yubormasligi uchun), javob faqat POST da: bitta UPDATE.
+    Token tekshirilmaguncha DB ga murojaat qilinmaydi
+    GET|POST /rsvp/<token>/?status=accepted|declined
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    renderer_classes = [JSONRenderer, TemplateHTMLRenderer]
+    template_name = 'calendar/rsvp.html'
+    invalid_token_message = 'Invalid or expired RSVP link'
+    
+    def get(self, request, token):
+        invite_id, event_id, _, status = self.validate(token, request.query_params)
+        return Response({'invite_id': invite_id, 'event_id': event_id, 'status': status, 'confirmed': False})
+    
+    def post(self, request, token):
+        # Body dagi status query string dagisidan ustun (QueryDict.get - oxirgi qiymat)
+        data = request.query_params.copy()
+        data.update(request.data)
+        invite_id, event_id, owner_id, status = self.validate(token, data)
+        with transaction.atomic():
+            if not set_statuses(event_id, {status: [invite_id]}):
+                # Invite yoki event o'chirilgan
+                raise NotFound(self.invalid_token_message)
+            push_counts(owner_id, event_id)
+        return Response({'invite_id': invite_id, 'event_id': event_id, 'status': status, 'confirmed': True})
+    
+    def validate(self, token, data):
+        try:
+            invite_id, event_id, owner_id = read_token(token)
+        except signing.BadSignature:
+            raise NotFound(self.invalid_token_message)
+        serializer = InviteRsvpSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        return invite_id, event_id, owner_id, serializer.validated_data['status']
+
+
+__all__ = ['InviteRsvpView']
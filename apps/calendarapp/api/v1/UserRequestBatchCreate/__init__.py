@@ -0,0 +1 @@
+from .views import *
\ No newline at end of file
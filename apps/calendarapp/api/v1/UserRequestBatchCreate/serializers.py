@@ -0,0 +1,18 @@
+import pytz
+from django.conf import settings
+from rest_framework import serializers
+
+
+class UserRequestBatchCreateSerializer(serializers.Serializer):
+    texts = serializers.ListField(
+        child=serializers.CharField(),
+        min_length=1,
+        max_length=getattr(settings, 'CALENDAR_NLP_BATCH_MAX_ITEMS', 500),
+    )
+    language = serializers.ChoiceField(choices=['uz', 'ru', 'en'], required=False)
+    timezone = serializers.CharField(max_length=50, required=False)
+    
+    def validate_timezone(self, value):
+        if value not in pytz.all_timezones_set:
+            raise serializers.ValidationError("Unknown timezone")
+        return value
@@ -0,0 +1,34 @@
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+from .serializers import UserRequestBatchCreateSerializer
+from apps.calendarapp.nlp_parser import get_parser
+from apps.calendarapp.service import bulk_create_user_requests
+
+
+class UserRequestBatchCreateView(GenericAPIView):
+    """
+    Ko'p so'rovlarni bitta requestda yaratish (chat exportlardan bulk import)
+    """
+    serializer_class = UserRequestBatchCreateSerializer
+    
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        texts = serializer.validated_data['texts']
+        parse_results = get_parser().parse_many(
+            texts,
+            language=serializer.validated_data.get('language'),
+            user_timezone=serializer.validated_data.get('timezone'),
+        )
+        results = bulk_create_user_requests(request.user, texts, parse_results)
+        
+        return Response({
+            'count': len(results),
+            'created': sum(1 for item in results if item['status'] == 'created'),
+            'results': results,
+        }, status=status.HTTP_201_CREATED)
+
+
+__all__ = ['UserRequestBatchCreateView']
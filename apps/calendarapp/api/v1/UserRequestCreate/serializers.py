@@ -11,5 +11,7 @@ class UserRequestCreateSerializer(serializers.ModelSerializer):
         representation = super().to_representation(instance)
         representation['id'] = str(instance.id)
         representation['user'] = instance.user.username
+        representation['status'] = instance.status
+        representation['result'] = instance.result
         representation['created_at'] = instance.created_at.isoformat()
         return representation
@@ -0,0 +1,8 @@
+from rest_framework import serializers
+from apps.calendarapp.models import UserRequest
+
+
+class UserRequestDetailSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UserRequest
+        fields = ['id', 'text', 'status', 'result', 'created_at', 'updated_at']
@@ -0,0 +1,17 @@
+from rest_framework.generics import RetrieveAPIView
+from .serializers import UserRequestDetailSerializer
+from apps.calendarapp.models import UserRequest
+
+
+class UserRequestDetailView(RetrieveAPIView):
+    """
+    Async so'rov holati va natijasi (polling uchun)
+    GET /user-requests/<id>/
+    """
+    serializer_class = UserRequestDetailSerializer
+    
+    def get_queryset(self):
+        return UserRequest.objects.filter(user=self.request.user)
+
+
+__all__ = ['UserRequestDetailView']
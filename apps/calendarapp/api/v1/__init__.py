@@ -1 +1,6 @@
-from .UserRequestCreate.views import *
\ No newline at end of file
+from .UserRequestCreate.views import *
+from .UserRequestBatchCreate.views import *
+from .UserRequestDetail.views import *
+from .EventList.views import *
+from .InviteRsvp.views import *
+from .EventInviteBulkRsvp.views import *
\ No newline at end of file
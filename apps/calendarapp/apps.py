@@ -7,3 +7,5 @@ class CalendarappConfig(AppConfig):
     
     def ready(self):
         import apps.calendarapp.signals # noqa
+        # Parser warm-up bu yerda emas (migrate, celery beat, testlar ham ready() ni chaqiradi) -
+        # faqat server process larida: core.wsgi / core.asgi dagi nlp_parser.warm_up_server()
@@ -0,0 +1,184 @@
+import atexit
+import logging
+import threading
+import time
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import close_old_connections, transaction
+from .models import AuditLog, Event
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # Buffer shu hajmga yetsa darhol yoziladi
+    'MAX_SIZE': 200,
+    # Buffer dagi eng eski yozuv shuncha soniyadan ko'p kutmaydi
+    'MAX_AGE': 2.0,
+    # Buffer shundan oshsa yozuv thread ini kutmasdan qo'shayotgan thread ning o'zida yoziladi (backpressure)
+    'MAX_BACKLOG': 10000,
+    # True - yozuvlar Celery (broker) orqali yoziladi: process o'lsa ham yo'qolmaydi
+    'SPOOL': False,
+    'BATCH_SIZE': 500,
+    # PostgreSQL oylik partitionlari (partitions.py): oldindan yaratish, saqlash muddati, arxiv papkasi
+    'PARTITION_AHEAD_MONTHS': 3,
+    'RETENTION_MONTHS': 12,
+    'ARCHIVE_DIR': 'archive/auditlog',
+}
+
+FIELDS = ('id', 'user_id', 'event_id', 'action', 'model_name', 'object_id', 'changes', 'created_at')
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'CALENDAR_AUDIT', {})}
+
+
+def to_row(log: AuditLog) -> dict:
+    """Celery spool uchun JSON ga tushadigan ko'rinish"""
+    row = {field: getattr(log, field) for field in FIELDS}
+    for field in ('id', 'event_id', 'object_id'):
+        if row[field] is not None:
+            row[field] = str(row[field])
+    row['created_at'] = row['created_at'].isoformat()
+    return row
+
+
+def write_logs(logs, batch_size=500) -> int:
+    """
+    AuditLog larni bulk_create bilan yozish. Yozilgunga qadar o'chirilgan
+    event / user larga havola NULL qilinadi (FK SET NULL bilan bir xil natija)
+    """
+    if not logs:
+        return 0
+    from django.contrib.auth import get_user_model
+
+    event_ids = {log.event_id for log in logs if log.event_id is not None}
+    user_ids = {log.user_id for log in logs if log.user_id is not None}
+    events = set(Event.objects.filter(pk__in=event_ids).values_list('pk', flat=True)) if event_ids else set()
+    users = set(get_user_model().objects.filter(pk__in=user_ids).values_list('pk', flat=True)) if user_ids else set()
+    for log in logs:
+        if log.event_id is not None and log.event_id not in events:
+            log.event_id = None
+        if log.user_id is not None and log.user_id not in users:
+            log.user_id = None
+    AuditLog.objects.bulk_create(logs, batch_size=batch_size, ignore_conflicts=True)
+    return len(logs)
+
+
+class AuditSink:
+    """
+    AuditLog yozuvlarini process ichida yig'ib, alohida thread da bulk_create qiladi:
+    hajm (MAX_SIZE), vaqt (MAX_AGE) yoki request tugashi bo'yicha.
+    Request thread i INSERT qilmaydi; yozuvlar faqat tranzaksiya commit bo'lgach buffer ga tushadi
+    """
+
+    def __init__(self, max_size=200, max_age=2.0, max_backlog=10000, spool=False, batch_size=500):
+        self.max_size = max_size
+        self.max_age = max_age
+        self.max_backlog = max_backlog
+        self.spool = spool
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def record(self, logs):
+        """Tranzaksiya commit bo'lgach buffer ga qo'shish (rollback bo'lsa yozilmaydi)"""
+        logs = list(logs)
+        if logs:
+            transaction.on_commit(lambda: self.add(logs))
+
+    def add(self, logs):
+        with self._lock:
+            self._pending.extend(logs)
+            backlog = len(self._pending)
+        if backlog > self.max_backlog:
+            # Yozuv thread i ulgurmayapti (yoki DB ishlamayapti) - yozuvlar tashlanmaydi,
+            # qo'shayotgan thread o'zi yozadi; xato bo'lsa ular buffer ga qaytadi
+            logger.warning(f"Audit backlog full ({backlog} entries), flushing synchronously")
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit synchronous flush failed")
+        self.start()
+        if backlog >= self.max_size:
+            self._wake.set()
+
+    def wake(self):
+        """Request tugadi - kutmasdan yozish"""
+        if self._pending:
+            self._wake.set()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self.run, name='audit-sink', daemon=True)
+                    self._thread.start()
+
+    def run(self):
+        while True:
+            self._wake.wait(self.max_age)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit flush failed")
+            # Thread ning DB ulanishi CONN_MAX_AGE bo'yicha yopiladi
+            close_old_connections()
+
+    def flush(self) -> int:
+        with self._lock:
+            logs, self._pending = self._pending, []
+        if not logs:
+            return 0
+
+        if self.spool:
+            from .tasks import write_audit_logs
+
+            for index in range(0, len(logs), self.batch_size):
+                write_audit_logs.delay([to_row(log) for log in logs[index:index + self.batch_size]])
+            return len(logs)
+
+        started = time.perf_counter()
+        try:
+            written = write_logs(logs, self.batch_size)
+        except Exception:
+            # Keyingi urinishda qayta yoziladi
+            with self._lock:
+                self._pending[:0] = logs
+            raise
+        logger.debug(f"Audit flushed: {written} entries in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return written
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_sink() -> AuditSink:
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                config = get_config()
+                _sink = AuditSink(
+                    max_size=config['MAX_SIZE'],
+                    max_age=config['MAX_AGE'],
+                    max_backlog=config['MAX_BACKLOG'],
+                    spool=config['SPOOL'],
+                    batch_size=config['BATCH_SIZE'],
+                )
+                request_finished.connect(_request_finished, dispatch_uid='calendar_audit_sink')
+                # Process tugashidan oldin (management command, celery) qolganlarini yozish
+                atexit.register(_sink.flush)
+    return _sink
+
+
+def _request_finished(sender, **kwargs):
+    get_sink().wake()
+
+
+def record(logs):
+    """AuditLog (saqlanmagan) obyektlarini yozish uchun navbatga qo'yish"""
+    get_sink().record(logs)
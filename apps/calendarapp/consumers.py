@@ -1,7 +1,11 @@
 # apps/calendar/consumers.py
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.utils import timezone
 from datetime import timedelta
 import logging
@@ -9,18 +13,36 @@ from .models import (
     UserRequest, ParsedEventDraft, Event, 
     EventInvite, EventAlert
 )
-from .nlp_parser import CalendarNLPParser
+from .nlp_parser import get_parser
+from . import service
 
 logger = logging.getLogger(__name__)
 
+WS_CONFIG = {
+    # Parse va DB ishlari uchun umumiy thread pool hajmi (process bo'yicha)
+    'WORKERS': 8,
+    # Bitta ulanishdagi bir vaqtda bajarilayotgan buyruqlar soni
+    'MAX_INFLIGHT': 4,
+    **getattr(settings, 'CALENDAR_WS', {}),
+}
+
+command_executor = ThreadPoolExecutor(max_workers=WS_CONFIG['WORKERS'], thread_name_prefix='calendar-ws')
+
+
+def run_in_pool(func):
+    """Sinxron (DB / parse) ishni cheklangan pool da bajarish"""
+    return database_sync_to_async(func, thread_sensitive=False, executor=command_executor)
+
 class CalendarConsumer(AsyncWebsocketConsumer):
     """Calendar uchun WebSocket consumer"""
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.parser = CalendarNLPParser()
+        self.parser = get_parser()
         self.user = None
         self.room_group_name = None
+        self.inflight = asyncio.Semaphore(WS_CONFIG['MAX_INFLIGHT'])
+        self.tasks = set()
     
     async def connect(self):
         """WebSocket ga ulanish"""
@@ -56,12 +78,131 @@ class CalendarConsumer(AsyncWebsocketConsumer):
     
     async def disconnect(self, close_code):
         """WebSocket dan uzilish"""
+        for task in self.tasks:
+            task.cancel()
+        
         if self.room_group_name:
             await self.channel_layer.group_discard(
                 self.room_group_name,
                 self.channel_name
             )
         
-        logger.info(f"❌ WebSocket disconnected: {self.user.email if self.user else 'Anonymous'}")
+        logger.info(f"❌ WebSocket disconnected: {self.user.email if self.user and self.user.is_authenticated else 'Anonymous'}")
     
-    
\ No newline at end of file
+    async def receive(self, text_data=None, bytes_data=None):
+        """
+        Buyruqlar (har biri bitta frame, javobda client yuborgan `ref` qaytariladi):
+        {"type": "command", "text": "...", "timezone": "...", "confirm": false} -> draft / result
+        {"type": "confirm", "draft_id": "..."} -> result
+        {"type": "op", "op": "cancel|restore|delete", "event_id": "..."} -> result
+        """
+        try:
+            message = json.loads(text_data or '')
+        except ValueError:
+            await self.reply_error(None, 'invalid_json', "Message must be JSON")
+            return
+        if not isinstance(message, dict):
+            await self.reply_error(None, 'invalid_message', "Message must be an object")
+            return
+        
+        ref = message.get('ref')
+        handler = self.handlers.get(message.get('type'))
+        if handler is None:
+            await self.reply_error(ref, 'unknown_type', f"Unknown message type: {message.get('type')}")
+            return
+        if self.inflight.locked():
+            await self.reply_error(ref, 'busy', "Too many commands in flight")
+            return
+        
+        # Keyingi frame larni kutmasdan qabul qilish uchun alohida task da
+        await self.inflight.acquire()
+        task = asyncio.ensure_future(self.run_handler(handler, message, ref))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+    
+    async def run_handler(self, handler, message, ref):
+        try:
+            await handler(self, message, ref)
+        except Exception:
+            logger.exception(f"WebSocket command failed: {message.get('type')}")
+            await self.reply_error(ref, 'internal_error', "Command failed")
+        finally:
+            self.inflight.release()
+    
+    async def handle_command(self, message, ref):
+        text = (message.get('text') or '').strip()
+        if not text:
+            await self.reply_error(ref, 'invalid_message', "'text' is required")
+            return
+        
+        parsed = await run_in_pool(self.parser.parse)(text, user_timezone=message.get('timezone'))
+        actionable = (
+            parsed.get('intent') in service.ACTIONABLE_INTENTS
+            and parsed.get('confidence', 0.0) >= service.MIN_CONFIDENCE
+        )
+        if not actionable:
+            await self.reply('result', ref, result=await run_in_pool(self.record_request)(text, parsed))
+            return
+        
+        if message.get('confirm'):
+            result = await run_in_pool(self.record_request)(text, parsed)
+            await self.reply('result', ref, result=result)
+            return
+        
+        draft = await run_in_pool(service.create_draft)(self.user, text, parsed)
+        await self.reply('draft', ref, draft_id=str(draft.id), expires_at=draft.expires_at.isoformat(), parsed=parsed)
+    
+    async def handle_confirm(self, message, ref):
+        try:
+            result = await run_in_pool(service.confirm_draft)(self.user, message.get('draft_id'))
+        except ValidationError:
+            result = None
+        if result is None:
+            await self.reply_error(ref, 'draft_not_found', "Draft not found, expired or already confirmed")
+            return
+        await self.reply('result', ref, result=result)
+    
+    async def handle_op(self, message, ref):
+        try:
+            result = await run_in_pool(service.apply_event_op)(self.user, message.get('op'), message.get('event_id'))
+        except (ValueError, ValidationError) as exc:
+            await self.reply_error(ref, 'invalid_op', str(exc))
+            return
+        await self.reply('result', ref, result=result)
+    
+    handlers = {
+        'command': handle_command,
+        'confirm': handle_confirm,
+        'op': handle_op,
+    }
+    
+    def record_request(self, text, parsed):
+        """UserRequest + intent - bitta tranzaksiyada (sinxron, pool ichida)"""
+        return service.process_user_request(UserRequest(user=self.user, text=text), parsed, create=True)
+    
+    async def reply(self, message_type, ref, **payload):
+        await self.send(json.dumps({"type": message_type, "ref": ref, **payload}, default=str))
+    
+    async def reply_error(self, ref, code, message):
+        await self.reply('error', ref, code=code, message=message)
+    
+    async def event_alert(self, event):
+        """Alert dispatcher dan kelgan eslatma"""
+        await self.send(json.dumps({
+            "type": "event_alert",
+            "alert": event["alert"],
+        }))
+    
+    async def calendar_changes(self, event):
+        """Event / invite / alert o'zgarishlari (signals -> notifications, batch qilingan)"""
+        await self.send(json.dumps({
+            "type": "calendar_changes",
+            "changes": event["changes"],
+        }))
+    
+    async def user_request_result(self, event):
+        """Async NLP pipeline natijasi"""
+        await self.send(json.dumps({
+            "type": "user_request_result",
+            "request": event["request"],
+        }))
@@ -13,16 +13,11 @@ class FutureEventsFilter(admin.SimpleListFilter):
         )
     
     def queryset(self, request, queryset):
-        from django.utils import timezone
-        now = timezone.now()
-        
+        # TimeRangeQuerySet lookuplari - index bo'yicha, aktiv timezone dagi kun
         if self.value() == 'future':
-            return queryset.filter(time_start__gt=now)
+            return queryset.upcoming()
         if self.value() == 'past':
-            return queryset.filter(time_end__lt=now)
+            return queryset.finished()
         if self.value() == 'today':
-            return queryset.filter(
-                time_start__date=now.date(),
-                time_end__date=now.date()
-            )
-        return queryset
\ No newline at end of file
+            return queryset.on_day()
+        return queryset
@@ -0,0 +1,222 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import escape, strip_tags
+from .models import EventInvite
+from .rsvp import response_buttons
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    # Bitta SMTP ulanish orqali yuboriladigan xatlar soni
+    'BATCH_SIZE': 50,
+    # Bitta task bir ishga tushganda yuboradigan xatlar chegarasi
+    'MAX_PER_RUN': 1000,
+    # Sekundiga xatlar (worker process ichida), 0 - cheklovsiz
+    'RATE_LIMIT': 10,
+    # Shuncha urinishdan keyin taklif navbatdan chiqadi
+    'MAX_ATTEMPTS': 5,
+    # Xatodan keyin qayta urinish (soniya, har safar 2 baravar)
+    'RETRY_DELAY': 60,
+    # Band qilingan, lekin shuncha soniyada yuborilmagan (worker o'lgan) takliflar qayta olinadi
+    'LEASE': 15 * 60,
+    'TEMPLATE': 'calendar/emails/event_invite.html',
+    'SUBJECT': "Taklif: {title}",
+    'FROM_EMAIL': None,
+    'SITE_URL': '',
+    # Process ichida saqlanadigan render qilingan shablonlar (event bo'yicha)
+    'RENDER_CACHE_SIZE': 256,
+}
+
+# Har bir qabul qiluvchi uchun almashtiriladigan joylar (shablon event uchun bir marta render qilinadi)
+PLACEHOLDER = '%%invite:{}%%'
+RECIPIENT_FIELDS = ('email', 'response_buttons', 'unsubscribe_url')
+# HTML sifatida qo'yiladigan qiymatlar, qolganlari escape qilinadi
+SAFE_FIELDS = frozenset(['response_buttons'])
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'CALENDAR_INVITES', {})}
+
+
+class RenderCache:
+    """Event shabloni (placeholder lar bilan), LRU. Kalit event.updated_at ni o'z ichiga oladi"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            html = self._items.get(key)
+            if html is not None:
+                self._items.move_to_end(key)
+                return html
+        html = render()
+        with self._lock:
+            self._items[key] = html
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return html
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+render_cache = RenderCache(get_config()['RENDER_CACHE_SIZE'])
+
+
+class RateLimiter:
+    """Xatlar orasida kamida 1 / rate soniya"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_at = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self.next_at > now:
+            time.sleep(self.next_at - now)
+            now = self.next_at
+        self.next_at = now + self.interval
+
+
+def render_event(event, config) -> str:
+    """Event uchun HTML - qabul qiluvchiga bog'liq joylar PLACEHOLDER bilan"""
+    key = (config['TEMPLATE'], event.pk, event.updated_at)
+    return render_cache.get_or_render(key, lambda: render_to_string(config['TEMPLATE'], {
+        'event': event,
+        'inviter': event.user,
+        'site_url': config['SITE_URL'],
+        **{name: PLACEHOLDER.format(name) for name in RECIPIENT_FIELDS},
+    }))
+
+
+def recipient_values(invite, config) -> dict:
+    return {
+        'email': invite.email,
+        'response_buttons': response_buttons(invite, config['SITE_URL']),
+        'unsubscribe_url': config['SITE_URL'],
+    }
+
+
+def build_message(invite, config, connection) -> EmailMultiAlternatives:
+    html = render_event(invite.event, config)
+    for name, value in recipient_values(invite, config).items():
+        html = html.replace(PLACEHOLDER.format(name), value if name in SAFE_FIELDS else escape(value))
+    message = EmailMultiAlternatives(
+        subject=config['SUBJECT'].format(title=invite.event.title),
+        body=strip_tags(html),
+        from_email=config['FROM_EMAIL'] or settings.DEFAULT_FROM_EMAIL,
+        to=[invite.email],
+        connection=connection,
+    )
+    message.attach_alternative(html, 'text/html')
+    return message
+
+
+def claim_invites(limit, event_ids=None, now=None, max_attempts=5, lease=900, exclude=()) -> list:
+    """
+    Yuborilmagan takliflarni band qilish (claimed_at qo'yiladi, urinish +1) - sent_at faqat
+    yuborilgandan keyin. Boshqa worker ayni paytda band qilganlari (skip_locked) va lease
+    muddati tugamaganlari o'tkazib yuboriladi. Bekor qilingan va tugagan eventlarniki yuborilmaydi
+    """
+    now = now or timezone.now()
+    queryset = (
+        EventInvite.objects
+        .select_for_update(skip_locked=True, of=('self',))
+        .select_related('event__user')
+        .filter(
+            Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - timedelta(seconds=lease)),
+            sent_at__isnull=True,
+            send_attempts__lt=max_attempts,
+            event__is_cancelled=False,
+            event__time_end__gt=now,
+        )
+        .order_by('created_at')
+    )
+    if event_ids:
+        queryset = queryset.filter(event_id__in=event_ids)
+    if exclude:
+        queryset = queryset.exclude(pk__in=exclude)
+    with transaction.atomic():
+        invites = list(queryset[:limit])
+        if invites:
+            EventInvite.objects.filter(pk__in=[invite.pk for invite in invites]).update(
+                claimed_at=now, send_attempts=F('send_attempts') + 1,
+            )
+    return invites
+
+
+def deliver(invites, config) -> list:
+    """
+    Xatlarni bitta SMTP ulanish orqali yuborish. Yuborilmaganlari qaytariladi;
+    xatodan keyin ulanish yopiladi va keyingi xat uchun qayta ochiladi
+    """
+    failed = []
+    limiter = RateLimiter(config['RATE_LIMIT'])
+    connection = get_connection(fail_silently=False)
+    try:
+        for invite in invites:
+            limiter.wait()
+            try:
+                # Ochiq bo'lsa hech narsa qilmaydi; send_messages o'zi ochgan ulanishni har xatdan keyin yopadi
+                connection.open()
+                connection.send_messages([build_message(invite, config, connection)])
+            except Exception:
+                logger.exception(f"Invite email failed: {invite.pk} <{invite.email}>")
+                failed.append(invite)
+                connection.close()
+    finally:
+        connection.close()
+    return failed
+
+
+def send_pending(event_ids=None, limit=None) -> dict:
+    """Yuborilmagan takliflarni BATCH_SIZE lik to'plamlarda yuborish"""
+    config = get_config()
+    limit = limit or config['MAX_PER_RUN']
+    stats = {'sent': 0, 'failed': 0}
+    failed_ids = []
+    while stats['sent'] + stats['failed'] < limit:
+        size = min(config['BATCH_SIZE'], limit - stats['sent'] - stats['failed'])
+        invites = claim_invites(
+            size, event_ids=event_ids, max_attempts=config['MAX_ATTEMPTS'], lease=config['LEASE'],
+            exclude=failed_ids,
+        )
+        if not invites:
+            break
+        failed = [invite.pk for invite in deliver(invites, config)]
+        delivered = [invite.pk for invite in invites if invite.pk not in failed]
+        if delivered:
+            EventInvite.objects.filter(pk__in=delivered).update(sent_at=timezone.now(), claimed_at=None)
+        if failed:
+            # Shu ishga tushishda qayta olinmaydi - task retry / beat da
+            EventInvite.objects.filter(pk__in=failed).update(claimed_at=None)
+            failed_ids.extend(failed)
+        stats['sent'] += len(invites) - len(failed)
+        stats['failed'] += len(failed)
+    return stats
+
+
+def schedule(event_ids):
+    """Tranzaksiya commit bo'lgach yangi takliflarni yuborish"""
+    event_ids = [str(event_id) for event_id in event_ids]
+    if not event_ids or not get_config()['ENABLED']:
+        return
+    from .tasks import send_event_invites
+
+    transaction.on_commit(lambda: send_event_invites.delay(event_ids))
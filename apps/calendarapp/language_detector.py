@@ -0,0 +1,178 @@
+import re
+import threading
+from collections import Counter, OrderedDict, namedtuple
+from langdetect import detect, DetectorFactory
+from langdetect.lang_detect_exception import LangDetectException
+
+# Langdetect uchun seed
+DetectorFactory.seed = 0
+
+
+DetectionResult = namedtuple('DetectionResult', ['language', 'tier', 'cached'])
+
+TIER_EMPTY = 'empty'
+TIER_SCRIPT = 'script'
+TIER_LEXICON = 'lexicon'
+TIER_LANGDETECT = 'langdetect'
+TIER_FALLBACK = 'fallback'
+
+DEFAULT_LANGUAGE = 'uz'
+
+# O'zbek kirill alifbosiga xos harflar
+UZ_CYRILLIC_LETTERS = frozenset('ўқғҳ')
+
+# To'liq so'zlar
+UZ_WORDS = frozenset([
+    'va', 'lekin', 'yoki', 'uchun', 'bilan', 'da', 'ga', 'ni', 'ning', 'har', 'kun', 'kuni',
+    'soat', 'daqiqa', 'hafta', 'oy', 'yil', 'vaqt', 'oldin', 'keyin', 'saat', 'bor', 'men',
+    'mening', 'biz', 'bizning', 'eslatma', 'toliq', 'butun', 'haftasiga', 'oyiga', 'kunlari',
+])
+# So'z boshlanishi (qo'shimchalar bilan ham mos keladi: jumada, ertagaga, uchrashuvim)
+UZ_STEMS = (
+    'ertaga', 'bugun', 'kecha', 'dushanba', 'seshanba', 'chorshanba', 'payshanba', 'juma',
+    'shanba', 'yakshanba', 'uchrash', 'yig\'il', 'yigil', 'majlis', 'eslat', 'ogoh', 'yarat',
+    'qo\'sh', 'qosh', 'kirit', 'o\'zgartir', 'yangila', 'tahrir', 'o\'chir', 'uchir', 'bekor',
+    'ko\'rsat', 'korsat', 'qidir', 'tug\'ilgan', 'suhbat', 'boshlanish', 'tugash', 'bo\'yi',
+)
+EN_WORDS = frozenset([
+    'the', 'and', 'for', 'with', 'that', 'this', 'have', 'has', 'at', 'on', 'in', 'to', 'my',
+    'a', 'an', 'of', 'is', 'me', 'our', 'next', 'every', 'daily', 'weekly', 'monthly', 'all',
+    'whole', 'full', 'entire', 'day', 'days', 'week', 'weeks', 'month', 'hour', 'hours',
+    'minute', 'minutes', 'before', 'after', 'am', 'pm', 'o\'clock', 'tomorrow', 'today',
+    'yesterday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
+    'fridays', 'meeting', 'call', 'lunch', 'dinner', 'appointment', 'create', 'add', 'make',
+    'new', 'update', 'edit', 'change', 'modify', 'delete', 'remove', 'erase', 'cancel',
+    'show', 'view', 'find', 'search', 'remind', 'reminder', 'alert', 'notify', 'stop', 'abort',
+])
+
+TOKEN_RE = re.compile(r"[^\W\d_]+(?:['ʻʼ‘’`][^\W\d_]+)*")
+APOSTROPHE_RE = re.compile(r"[ʻʼ‘’`]")
+# O'zbek lotin yozuvidagi o' va g' harflari
+UZ_MARKER_RE = re.compile(r"[og]'(?!clock\b|s\b|t\b|ll\b|re\b|ve\b|d\b)[a-z]")
+UZ_STEM_RE = re.compile('(?:' + '|'.join(re.escape(stem) for stem in UZ_STEMS) + ')')
+STRIP_RE = re.compile(r'https?://\S+|[\w\.-]+@[\w\.-]+\.\w+|@\w+')
+CYRILLIC_RE = re.compile(r'[а-яёўқғҳ]')
+LATIN_RE = re.compile(r'[a-z]')
+
+# Kirill harflari ulushi shundan yuqori bo'lsa, matn kirillcha hisoblanadi
+SCRIPT_RATIO = 0.6
+# Lexicon bo'yicha qaror uchun minimal farq
+LEXICON_MARGIN = 2
+
+
+class LanguageDetector:
+    """
+    Bosqichma-bosqich til aniqlash:
+    1. Alifbo histogrammasi (kirill / lotin)
+    2. uz/ru/en token lug'ati
+    3. Faqat noaniq matnlar uchun langdetect
+    Natijalar normallashtirilgan matn bo'yicha cheklangan LRU keshda saqlanadi
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = Counter()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Kesh kaliti: kichik harf, bitta probel, bir xil apostrof"""
+        return APOSTROPHE_RE.sub("'", ' '.join(text.lower().split()))
+
+    def detect(self, text: str) -> DetectionResult:
+        """Tilni aniqlash va qaysi bosqich qaror qilganini qaytarish"""
+        if not text or len(text.strip()) < 3:
+            self._count(TIER_EMPTY)
+            return DetectionResult(DEFAULT_LANGUAGE, TIER_EMPTY, False)
+
+        key = self.normalize(text)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._stats['cache_hits'] += 1
+                return DetectionResult(cached[0], cached[1], True)
+            self._stats['cache_misses'] += 1
+
+        language, tier = self._detect(key)
+        self._count(tier)
+
+        with self._lock:
+            self._cache[key] = (language, tier)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return DetectionResult(language, tier, False)
+
+    def _detect(self, text: str):
+        stripped = STRIP_RE.sub(' ', text)
+
+        # 1. Alifbo histogrammasi
+        cyrillic = CYRILLIC_RE.findall(stripped)
+        latin_count = len(LATIN_RE.findall(stripped))
+        letters = len(cyrillic) + latin_count
+        if letters and len(cyrillic) / letters >= SCRIPT_RATIO:
+            if UZ_CYRILLIC_LETTERS.intersection(cyrillic):
+                return 'uz', TIER_SCRIPT
+            return 'ru', TIER_SCRIPT
+
+        # 2. Token lug'ati
+        scores = self._lexicon_scores(stripped)
+        ranked = scores.most_common()
+        best, best_score = ranked[0]
+        runner_up = ranked[1][1]
+        if best_score and (best_score - runner_up >= LEXICON_MARGIN or not runner_up):
+            return best, TIER_LEXICON
+
+        # 3. Noaniq holat - langdetect
+        try:
+            detected = detect(text)
+            if detected in ('en', 'ru'):
+                return detected, TIER_LANGDETECT
+        except LangDetectException:
+            pass
+
+        # 4. Fallback
+        if best_score and best_score > runner_up:
+            return best, TIER_FALLBACK
+        if letters and not latin_count:
+            return 'ru', TIER_FALLBACK
+        return DEFAULT_LANGUAGE, TIER_FALLBACK
+
+    def _lexicon_scores(self, text: str) -> Counter:
+        scores = Counter({'uz': 0, 'ru': 0, 'en': 0})
+        if UZ_MARKER_RE.search(text):
+            scores['uz'] += 2
+        for token in TOKEN_RE.findall(text):
+            if token in UZ_WORDS or UZ_STEM_RE.match(token):
+                scores['uz'] += 1
+            elif token in EN_WORDS:
+                scores['en'] += 1
+            elif CYRILLIC_RE.match(token):
+                scores['uz' if UZ_CYRILLIC_LETTERS.intersection(token) else 'ru'] += 1
+        return scores
+
+    def _count(self, tier: str):
+        with self._lock:
+            self._stats[tier] += 1
+
+    def stats(self) -> dict:
+        """Bosqichlar bo'yicha hisoblagichlar (hit rate o'lchash uchun)"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cache_size'] = len(self._cache)
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._stats.clear()
+
+    def warm_up(self):
+        """langdetect profillarini yuklash (birinchi chaqiruv qimmat)"""
+        try:
+            detect('warm up language profiles')
+        except LangDetectException:
+            pass
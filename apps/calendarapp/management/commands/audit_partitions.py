@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from apps.calendarapp.partitions import apply_retention, ensure_partitions, is_partitioned, list_partitions
+
+
+class Command(BaseCommand):
+    help = "AuditLog partitionlari: keyingi oylar uchun yaratish, eski oylarni jsonl.gz ga arxivlab o'chirish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ahead', type=int, help="Oldindan yaratiladigan oylar soni")
+        parser.add_argument('--retention', type=int, help="Saqlanadigan oylar soni")
+        parser.add_argument('--archive-dir', help="Arxiv papkasi")
+        parser.add_argument('--dry-run', action='store_true', help="Faqat arxivlanadigan partitionlarni ko'rsatish")
+
+    def handle(self, *args, **options):
+        if not is_partitioned():
+            self.stdout.write(self.style.WARNING("AuditLog partitionlanmagan (faqat PostgreSQL, migration 0011)"))
+            return
+
+        if not options['dry_run']:
+            for name in ensure_partitions(ahead=options['ahead']):
+                self.stdout.write(self.style.SUCCESS(f"Yaratildi: {name}"))
+
+        archived = apply_retention(
+            retention_months=options['retention'],
+            archive_dir=options['archive_dir'],
+            dry_run=options['dry_run'],
+        )
+        for name in archived:
+            self.stdout.write(f"{'Arxivlanadi' if options['dry_run'] else 'Arxivlandi'}: {name}")
+
+        partitions = list_partitions()
+        if partitions:
+            self.stdout.write(f"Partitionlar: {min(partitions):%Y-%m} .. {max(partitions):%Y-%m} ({len(partitions)} ta)")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from apps.calendarapp.scheduler import AlertDispatcher
+
+
+class Command(BaseCommand):
+    help = "Alert dispatcher: yaqin alertlarni timing wheel ga yuklab, vaqti kelganda Celery orqali yuborish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resolution', type=int, help="Wheel qadami (soniya)")
+        parser.add_argument('--lookahead', type=int, help="DB dan oldinga yuklanadigan oyna (soniya)")
+        parser.add_argument('--refill-interval', type=int, help="DB dan qayta to'ldirish oralig'i (soniya)")
+        parser.add_argument('--batch-size', type=int, help="Bitta Celery task dagi alertlar soni")
+
+    def handle(self, *args, **options):
+        dispatcher = AlertDispatcher.from_settings(
+            resolution=options['resolution'],
+            lookahead=options['lookahead'],
+            refill_interval=options['refill_interval'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS("Alert dispatcher ishga tushdi"))
+        try:
+            dispatcher.run_forever()
+        except KeyboardInterrupt:
+            self.stdout.write("Alert dispatcher to'xtatildi")
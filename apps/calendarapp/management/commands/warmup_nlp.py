@@ -0,0 +1,13 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.calendarapp.nlp_parser import warm_up
+
+
+class Command(BaseCommand):
+    help = "NLP parserni oldindan yuklash (matcher jadvallari va langdetect profillari)"
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        warm_up()
+        elapsed = (time.perf_counter() - started) * 1000
+        self.stdout.write(self.style.SUCCESS(f"NLP parser tayyor ({elapsed:.1f} ms)"))
@@ -0,0 +1,295 @@
+from datetime import datetime, time, timedelta
+from difflib import SequenceMatcher
+from zoneinfo import ZoneInfo
+from django.db import connections, models
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+
+# queryset.update() dan keyingi ishlar uchun bitta `pk IN (...)` dagi id lar
+ID_BATCH_SIZE = 1000
+
+
+def chunked(items, size=None):
+    size = size or ID_BATCH_SIZE
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
+
+
+def notifications_enabled() -> bool:
+    from .notifications import get_config
+
+    return get_config()['ENABLED']
+
+
+def day_range(day=None, tz=None):
+    """
+    `tz` dagi `day` kuni uchun [00:00, ertasi 00:00) oralig'i (aware datetime).
+    Default - aktiv timezone dagi bugun; DST kunlarida 23 / 25 soat bo'ladi
+    """
+    if tz is None:
+        tz = timezone.get_current_timezone()
+    elif isinstance(tz, str):
+        tz = ZoneInfo(tz)
+    day = day or timezone.localdate(timezone=tz)
+    start = datetime.combine(day, time.min, tzinfo=tz)
+    end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=tz)
+    return start, end
+
+
+class TimeRangeQuerySet(models.QuerySet):
+    """
+    time_start / time_end fieldlari bor modellar uchun index-friendly vaqt oralig'i lookuplari.
+    Ustunlar o'zgartirilmaydi (__date, timezone cast yo'q) - faqat [start, end) taqqoslashlar
+    """
+
+    def for_user(self, user):
+        return self.filter(user=user)
+
+    def starting_between(self, start, end):
+        """time_start [start, end) ichida"""
+        return self.filter(time_start__gte=start, time_start__lt=end)
+
+    def upcoming(self, now=None):
+        """Hali boshlanmaganlar"""
+        return self.filter(time_start__gt=now or timezone.now())
+
+    def finished(self, now=None):
+        """Tugaganlar (time_end kiritilmaydi)"""
+        return self.filter(time_end__lte=now or timezone.now())
+
+    def ongoing(self, now=None):
+        """Ayni paytda davom etayotganlar"""
+        now = now or timezone.now()
+        return self.filter(time_start__lte=now, time_end__gt=now)
+
+    def on_day(self, day=None, tz=None):
+        """`tz` dagi `day` kuni bilan kesishadiganlar - yarim tundan o'tadigan eventlar ham"""
+        return self.overlapping(*day_range(day, tz))
+
+    def overlapping(self, start, end):
+        """
+        [start, end) oralig'i bilan kesishadigan qatorlar:
+        time_start < end AND time_end > start.
+        PostgreSQL da tstzrange(time_start, time_end) && ... ko'rinishida, GiST index orqali
+        """
+        if connections[self.db].vendor == 'postgresql':
+            from django.contrib.postgres.fields import DateTimeRangeField
+            from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+
+            span = models.Func(
+                models.F('time_start'),
+                models.F('time_end'),
+                function='tstzrange',
+                output_field=DateTimeRangeField(),
+            )
+            return self.alias(span=span).filter(span__overlap=DateTimeTZRange(start, end, '[)'))
+        return self.filter(time_start__lt=end, time_end__gt=start)
+
+
+class EventQuerySet(TimeRangeQuerySet):
+    """Event uchun lookuplar"""
+
+    # Shu fieldlar o'zgarsa EventOccurrence qayta hisoblanadi
+    OCCURRENCE_FIELDS = frozenset(['time_start', 'time_end', 'all_day', 'repeat', 'timezone', 'is_cancelled'])
+
+    def active(self):
+        return self.filter(is_cancelled=False)
+
+    def single(self):
+        return self.filter(models.Q(repeat__isnull=True) | models.Q(repeat=''))
+
+    def recurring(self):
+        return self.exclude(repeat__isnull=True).exclude(repeat='')
+
+    def search_title(self, text):
+        """
+        Sarlavha / note bo'yicha qidiruv, `rank` (0..1) bilan.
+        PostgreSQL da pg_trgm word similarity (GIN index, migration 0009),
+        boshqa bazalarda so'zlar bo'yicha icontains
+        """
+        if connections[self.db].vendor == 'postgresql':
+            from django.contrib.postgres.lookups import TrigramWordSimilar
+            from django.contrib.postgres.search import TrigramWordSimilarity
+
+            return self.filter(
+                TrigramWordSimilar(models.F('title'), models.Value(text))
+                | TrigramWordSimilar(models.F('note'), models.Value(text))
+            ).annotate(rank=Greatest(
+                TrigramWordSimilarity(text, 'title'),
+                # note dagi moslik sarlavhadan kuchsizroq hisoblanadi
+                TrigramWordSimilarity(text, 'note') * models.Value(0.5),
+            ))
+
+        words = [word for word in text.split() if len(word) >= 3] or [text]
+        condition = models.Q()
+        for word in words:
+            condition |= models.Q(title__icontains=word)
+        return self.filter(condition).annotate(rank=models.Value(None, output_field=models.FloatField()))
+
+    def best_match(self, text, near=None, limit=20):
+        """
+        Eng mos event: yuqori rank, teng bo'lsa `near` vaqtga eng yaqini (bitta so'rov).
+        PostgreSQL da DB dan rank bo'yicha `limit` ta nomzod olinadi. Boshqa bazalarda rank yo'q,
+        shuning uchun barcha mos qatorlar Python da baholanadi - aks holda eski aniq moslik
+        `limit` ta yangiroq qisman mosliklar orasida tushib qolardi
+        """
+        if not text or not text.strip():
+            return None
+        text = text.strip()
+        queryset = self.search_title(text)
+        if connections[self.db].vendor == 'postgresql':
+            candidates = list(queryset.order_by(models.F('rank').desc(nulls_last=True), '-time_start')[:limit])
+        else:
+            candidates = list(queryset.order_by())
+        if not candidates:
+            return None
+
+        near = near or timezone.now()
+        lowered = text.lower()
+
+        def score(event):
+            rank = event.rank
+            if rank is None:
+                rank = SequenceMatcher(None, lowered, event.title.lower()).ratio()
+            # Rank 0.1 aniqlikda taqqoslanadi, keyin vaqt bo'yicha yaqinlik
+            return -round(rank, 1), abs((event.time_start - near).total_seconds())
+
+        return min(candidates, key=score)
+
+    def update(self, **kwargs):
+        """
+        queryset.update() signal yubormaydi - occurrence jadvali, alert fire_at va
+        WebSocket xabarlarini shu yerda yangilash (masalan admin dagi "bekor qilish" action lari)
+        """
+        from .models import EventAlert
+        from .notifications import UPDATED, notify_many
+        from .occurrences import sync_occurrences
+
+        occurrences = bool(self.OCCURRENCE_FIELDS.intersection(kwargs))
+        notify = notifications_enabled()
+        if not (occurrences or notify):
+            return super().update(**kwargs)
+
+        # id lar UPDATE dan oldin olinadi (filtr yangilangan qatorlarga mos kelmay qolishi mumkin)
+        owners = list(self.values_list('user_id', 'pk'))
+        updated = super().update(**kwargs)
+        for batch in chunked([pk for _, pk in owners]):
+            if occurrences:
+                sync_occurrences(self.model.objects.filter(pk__in=batch))
+            if 'time_start' in kwargs:
+                EventAlert.objects.filter(event_id__in=batch).sync_fire_at()
+            if 'is_cancelled' in kwargs:
+                # Dispatcher keyingi refill da bekor qilingan eventning alertlarini wheel dan olib tashlaydi
+                EventAlert.objects.filter(event_id__in=batch).touch()
+        if notify:
+            notify_many('event', UPDATED, owners, kwargs)
+        return updated
+
+
+class EventOccurrenceQuerySet(TimeRangeQuerySet):
+    """EventOccurrence uchun lookuplar"""
+
+
+class EventAlertQuerySet(models.QuerySet):
+    """EventAlert uchun lookuplar va fire_at sinxronizatsiyasi"""
+
+    # Shu fieldlar o'zgarsa fire_at qayta hisoblanadi
+    FIRE_AT_FIELDS = frozenset(['value', 'unit'])
+
+    def pending(self):
+        """Yuborilmagan, eventi bekor qilinmagan alertlar"""
+        return self.filter(is_sent=False, event__is_cancelled=False)
+
+    def due(self, until, after=None):
+        """(after, until] da yuborilishi kerak bo'lgan alertlar - partial index bo'yicha range scan"""
+        queryset = self.pending().filter(fire_at__lte=until)
+        if after is not None:
+            queryset = queryset.filter(fire_at__gt=after)
+        return queryset.order_by('fire_at')
+
+    def single(self):
+        return self.filter(models.Q(event__repeat__isnull=True) | models.Q(event__repeat=''))
+
+    def recurring(self):
+        return self.exclude(event__repeat__isnull=True).exclude(event__repeat='')
+
+    def sync_fire_at(self, now=None) -> int:
+        """
+        fire_at ni qayta hisoblash (faqat o'zgarganlari yoziladi): oddiy event - time_start bo'yicha,
+        takrorlanuvchi - now dan keyingi birinchi EventOccurrence bo'yicha
+        """
+        from .occurrences import next_fire_at
+        from .recurrence import is_recurring
+
+        now = now or timezone.now()
+        alerts = list(self.select_related('event'))
+        fire_times = next_fire_at([alert for alert in alerts if is_recurring(alert.event)], now)
+        changed = []
+        for alert in alerts:
+            fire_at = fire_times[alert.pk] if alert.pk in fire_times else alert.compute_fire_at()
+            if alert.fire_at != fire_at:
+                alert.fire_at = fire_at
+                alert.updated_at = now
+                changed.append(alert)
+        self.model.objects.bulk_update(changed, ['fire_at', 'updated_at'], batch_size=500)
+        return len(changed)
+
+    def stale(self, before):
+        """Vaqti before dan oldin o'tib ketgan yuborilmaganlar"""
+        return self.filter(is_sent=False, fire_at__lt=before)
+
+    def mark_skipped(self, now=None) -> int:
+        """
+        Yuborilmasdan o'tkazib yuborish (xabar yuborilmaydi): oddiy event alerti yopiladi
+        (is_sent, sent_at bo'sh qoladi), takrorlanuvchisi keyingi occurrence ga o'tadi
+        """
+        return self.recurring().sync_fire_at(now) + self.single().close()
+
+    def close(self) -> int:
+        return super().update(is_sent=True, updated_at=timezone.now())
+
+    def touch(self) -> int:
+        """Faqat updated_at (dispatcher refill i qayta ko'rishi uchun), xabar yuborilmaydi"""
+        return super().update(updated_at=timezone.now())
+
+    def update(self, **kwargs):
+        """
+        queryset.update() auto_now va save() ni chetlab o'tadi: dispatcher o'zgarishni
+        ko'rishi uchun updated_at qo'yiladi, value / unit o'zgarsa fire_at qayta hisoblanadi
+        """
+        from .notifications import UPDATED, notify_many
+
+        kwargs.setdefault('updated_at', timezone.now())
+        fire_at = bool(self.FIRE_AT_FIELDS.intersection(kwargs))
+        notify = notifications_enabled()
+        if not (fire_at or notify):
+            return super().update(**kwargs)
+
+        owners = list(self.values_list('event__user_id', 'pk'))
+        updated = super().update(**kwargs)
+        if fire_at:
+            for batch in chunked([pk for _, pk in owners]):
+                self.model.objects.filter(pk__in=batch).sync_fire_at()
+        if notify:
+            notify_many('alert', UPDATED, owners, {name: value for name, value in kwargs.items() if name != 'updated_at'})
+        return updated
+
+
+class EventInviteQuerySet(models.QuerySet):
+    """EventInvite uchun lookuplar"""
+
+    def update(self, **kwargs):
+        """queryset.update() signal yubormaydi - WebSocket xabarlari shu yerda"""
+        from .notifications import UPDATED, notify_many
+
+        if not notifications_enabled():
+            return super().update(**kwargs)
+        owners = list(self.values_list('event__user_id', 'pk'))
+        updated = super().update(**kwargs)
+        notify_many('invite', UPDATED, owners, kwargs)
+        return updated
+
+    def set_status(self, status) -> int:
+        """RSVP: har bir invite haqida xabar yuborilmaydi - event bo'yicha yig'ma sonlar (rsvp.push_counts)"""
+        return super().update(status=status)
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:05
+
+from django.conf import settings
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+def clamp_inverted_events(apps, schema_editor):
+    # Constraint dan oldin: time_end < time_start bo'lgan eski qatorlar nol davomiylikka keltiriladi
+    Event = apps.get_model('calendarapp', 'Event')
+    Event.objects.using(schema_editor.connection.alias).filter(
+        time_end__lt=models.F('time_start'),
+    ).update(time_end=models.F('time_start'))
+
+
+def create_range_index(apps, schema_editor):
+    # GiST range index faqat PostgreSQL da mavjud
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS calendarapp_event_user_span_gist '
+        'ON calendarapp_event USING gist (user_id, tstzrange(time_start, time_end))'
+    )
+
+
+def drop_range_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS calendarapp_event_user_span_gist')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendarapp', '0002_userrequest'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(clamp_inverted_events, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.CheckConstraint(condition=models.Q(('time_end__gte', models.F('time_start'))), name='event_time_end_gte_start'),
+        ),
+        BtreeGistExtension(),
+        migrations.RunPython(create_range_index, drop_range_index),
+    ]
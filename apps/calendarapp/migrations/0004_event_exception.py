@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:07
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendarapp', '0003_event_range_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventException',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('original_start', models.DateTimeField(verbose_name='Original start')),
+                ('is_cancelled', models.BooleanField(default=False, verbose_name='Is cancelled')),
+                ('time_start', models.DateTimeField(blank=True, null=True, verbose_name='Start time')),
+                ('time_end', models.DateTimeField(blank=True, null=True, verbose_name='End time')),
+                ('title', models.CharField(blank=True, max_length=255, null=True, verbose_name='Title')),
+                ('note', models.TextField(blank=True, null=True, verbose_name='Note')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exceptions', to='calendarapp.event', verbose_name='Event')),
+            ],
+            options={
+                'verbose_name': 'Event exception',
+                'verbose_name_plural': 'Event exceptions',
+                'ordering': ['original_start'],
+                'unique_together': {('event', 'original_start')},
+            },
+        ),
+    ]
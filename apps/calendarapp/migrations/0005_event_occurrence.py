@@ -0,0 +1,55 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:09
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_range_index(apps, schema_editor):
+    # GiST range index faqat PostgreSQL da mavjud
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS calendarapp_occurrence_user_span_gist '
+        'ON calendarapp_eventoccurrence USING gist (user_id, tstzrange(time_start, time_end))'
+    )
+
+
+def drop_range_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS calendarapp_occurrence_user_span_gist')
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendarapp', '0004_event_exception'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventOccurrence',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('time_start', models.DateTimeField(verbose_name='Start time')),
+                ('time_end', models.DateTimeField(verbose_name='End time')),
+                ('original_start', models.DateTimeField(verbose_name='Original start')),
+                ('title', models.CharField(blank=True, max_length=255, null=True, verbose_name='Title')),
+                ('note', models.TextField(blank=True, null=True, verbose_name='Note')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='calendarapp.event', verbose_name='Event')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_occurrences', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Event occurrence',
+                'verbose_name_plural': 'Event occurrences',
+                'ordering': ['time_start'],
+                'indexes': [models.Index(fields=['user', 'time_start'], name='calendarapp_user_id_92767a_idx')],
+                'unique_together': {('event', 'original_start')},
+            },
+        ),
+        migrations.RunPython(create_range_index, drop_range_index),
+    ]
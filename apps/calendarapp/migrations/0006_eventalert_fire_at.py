@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:11
+
+from datetime import timedelta
+from django.db import migrations, models
+
+UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def fill_fire_at(apps, schema_editor):
+    EventAlert = apps.get_model('calendarapp', 'EventAlert')
+    alerts = []
+    for alert in EventAlert.objects.select_related('event'):
+        alert.fire_at = alert.event.time_start - timedelta(seconds=alert.value * UNIT_SECONDS.get(alert.unit, 0))
+        alerts.append(alert)
+        if len(alerts) >= 1000:
+            EventAlert.objects.bulk_update(alerts, ['fire_at'])
+            alerts = []
+    EventAlert.objects.bulk_update(alerts, ['fire_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendarapp', '0005_event_occurrence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventalert',
+            name='fire_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Fire at'),
+        ),
+        migrations.RunPython(fill_fire_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendarapp', '0006_eventalert_fire_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventalert',
+            index=models.Index(condition=models.Q(('is_sent', False)), fields=['fire_at'], name='eventalert_pending_fire_at'),
+        ),
+        migrations.AddIndex(
+            model_name='eventalert',
+            index=models.Index(condition=models.Q(('is_sent', False)), fields=['updated_at'], name='eventalert_pending_updated'),
+        ),
+        migrations.AddIndex(
+            model_name='eventoccurrence',
+            index=models.Index(fields=['event', 'time_start'], name='eventoccurrence_event_start'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendarapp', '0007_eventalert_pending_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userrequest',
+            name='result',
+            field=models.JSONField(blank=True, null=True, verbose_name='Result'),
+        ),
+        migrations.AddField(
+            model_name='userrequest',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='done', max_length=20, verbose_name='Status'),
+        ),
+    ]
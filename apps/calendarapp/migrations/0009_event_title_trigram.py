@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:17
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+INDEXES = {
+    'calendarapp_event_title_trgm': 'title',
+    'calendarapp_event_note_trgm': 'note',
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm GIN index faqat PostgreSQL da mavjud
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, column in INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON calendarapp_event USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendarapp', '0008_userrequest_status'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
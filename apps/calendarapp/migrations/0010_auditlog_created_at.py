@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:50
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendarapp', '0009_event_title_trigram'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created at'),
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 5.2.5 on 2026-10-17 07:05
+
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+
+TABLE = 'calendarapp_auditlog'
+# Hozirgi oydan keyin oldindan yaratiladigan oylik partitionlar
+AHEAD_MONTHS = 3
+
+
+def month_start(value):
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def add_constraints(schema_editor, primary_key):
+    schema_editor.execute(f'ALTER TABLE {TABLE} ADD PRIMARY KEY ({primary_key})')
+    schema_editor.execute(
+        f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_user_id_fk FOREIGN KEY (user_id) '
+        f'REFERENCES accounts_user (id) DEFERRABLE INITIALLY DEFERRED'
+    )
+    schema_editor.execute(
+        f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_event_id_fk FOREIGN KEY (event_id) '
+        f'REFERENCES calendarapp_event (id) DEFERRABLE INITIALLY DEFERRED'
+    )
+    schema_editor.execute(f'CREATE INDEX {TABLE}_event_id_idx ON {TABLE} (event_id)')
+
+
+def partition_auditlog(apps, schema_editor):
+    """
+    PostgreSQL: audit jadvalini created_at bo'yicha oylik RANGE partition larga o'tkazish.
+    PK (id, created_at) - partition kaliti PK ichida bo'lishi shart
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT min(created_at) FROM {TABLE}')
+        oldest = cursor.fetchone()[0]
+
+    now = datetime.now(timezone.utc)
+    first = month_start(oldest or now)
+    last = add_months(month_start(now), AHEAD_MONTHS)
+
+    schema_editor.execute(f'ALTER TABLE {TABLE} RENAME TO {TABLE}_old')
+    schema_editor.execute(
+        f'CREATE TABLE {TABLE} (LIKE {TABLE}_old INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)'
+    )
+    month = first
+    while month <= last:
+        schema_editor.execute(
+            f"CREATE TABLE {TABLE}_p{month:%Y_%m} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        )
+        month = add_months(month, 1)
+    # Oldindan yaratilmagan oylar uchun (audit_partitions buyrug'i keyin ajratib oladi)
+    schema_editor.execute(f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT')
+
+    schema_editor.execute(f'INSERT INTO {TABLE} SELECT * FROM {TABLE}_old')
+    schema_editor.execute(f'DROP TABLE {TABLE}_old')
+    add_constraints(schema_editor, 'id, created_at')
+
+
+def unpartition_auditlog(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(f'CREATE TABLE {TABLE}_plain (LIKE {TABLE} INCLUDING DEFAULTS)')
+    schema_editor.execute(f'INSERT INTO {TABLE}_plain SELECT * FROM {TABLE}')
+    schema_editor.execute(f'DROP TABLE {TABLE} CASCADE')
+    schema_editor.execute(f'ALTER TABLE {TABLE}_plain RENAME TO {TABLE}')
+    add_constraints(schema_editor, 'id')
+    schema_editor.execute(f'CREATE INDEX {TABLE}_user_id_idx ON {TABLE} (user_id)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_remove_user_job_remove_user_projects_and_more'),
+        ('calendarapp', '0010_auditlog_created_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_auditlog, unpartition_auditlog),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['created_at'], name='auditlog_created_at'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['object_id'], name='auditlog_object_id'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['user', 'created_at'], name='auditlog_user_created'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-17 07:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendarapp', '0011_auditlog_partitioning'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userrequest',
+            index=models.Index(fields=['created_at', 'id'], name='userrequest_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='userrequest',
+            index=models.Index(fields=['user', 'created_at'], name='userrequest_user_created'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-17 08:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendarapp', '0012_userrequest_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventinvite',
+            name='send_attempts',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Send attempts'),
+        ),
+        migrations.AddField(
+            model_name='eventinvite',
+            name='sent_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Sent at'),
+        ),
+        migrations.AddIndex(
+            model_name='eventinvite',
+            index=models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['created_at'], name='eventinvite_unsent'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendarapp', '0013_eventinvite_sent_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventinvite',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Claimed at'),
+        ),
+    ]
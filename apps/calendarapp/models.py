@@ -1,19 +1,38 @@
 import uuid
+from datetime import timedelta
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from apps.base.models import BaseModel
+from .manager import EventQuerySet, EventOccurrenceQuerySet, EventAlertQuerySet, EventInviteQuerySet
+from .recurrence import is_recurring
 
 User = get_user_model()
 
 class UserRequest(BaseModel):
     """User so'rovlari uchun model"""
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        PROCESSING = 'processing', _('Processing')
+        DONE = 'done', _('Done')
+        FAILED = 'failed', _('Failed')
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='requests', verbose_name=_('User'))
     text = models.TextField(verbose_name=_('Request text'))
     
+    # Async pipeline holati va natijasi
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.DONE, verbose_name=_('Status'))
+    result = models.JSONField(null=True, blank=True, verbose_name=_('Result'))
+    
     class Meta:
         ordering = ['-created_at']
+        # Admin changelist: keyset sahifalash va user bo'yicha filtr
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='userrequest_created_id'),
+            models.Index(fields=['user', 'created_at'], name='userrequest_user_created'),
+        ]
         verbose_name = _('User request')
         verbose_name_plural = _('User requests')
         
@@ -46,12 +65,24 @@ class Event(BaseModel):
     is_cancelled = models.BooleanField(default=False, verbose_name=_('Is cancelled'))
     timezone = models.CharField(max_length=50, default='Asia/Tashkent', verbose_name=_('Timezone'))
     
+    objects = EventQuerySet.as_manager()
+    
+    # O'zgarish xabarlarida (WebSocket) yuboriladigan fieldlar
+    NOTIFY_FIELDS = ('title', 'all_day', 'time_start', 'time_end', 'repeat', 'url', 'note', 'is_cancelled', 'timezone')
     
     class Meta:
         ordering = ['time_start']
         indexes = [
             models.Index(fields=['user', 'time_start']),
             models.Index(fields=['time_start', 'time_end']),
+            # PostgreSQL: GiST (user_id, tstzrange(time_start, time_end)) - migration 0003 da
+        ]
+        constraints = [
+            # tstzrange(time_start, time_end) faqat shu shartda to'g'ri
+            models.CheckConstraint(
+                condition=models.Q(time_end__gte=models.F('time_start')),
+                name='event_time_end_gte_start',
+            ),
         ]
         verbose_name = _('Event')
         verbose_name_plural = _('Events')
@@ -66,13 +97,97 @@ class Event(BaseModel):
             return _("All day")
         return self.time_end - self.time_start
     
-    def save(self, *args, **kwargs):
-        # All-day event uchun vaqtni sozlash
+    def apply_all_day(self):
+        """All-day event uchun vaqtni sozlash (bulk_create save() ni chaqirmaydi)"""
         if self.all_day:
             self.time_start = self.time_start.replace(hour=0, minute=0, second=0, microsecond=0)
             self.time_end = self.time_end.replace(hour=23, minute=59, second=59, microsecond=999999)
-        
+    
+    def save(self, *args, **kwargs):
+        self.apply_all_day()
         super().save(*args, **kwargs)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def changed_fields(self) -> dict:
+        """DB dan o'qilgandan beri o'zgargan NOTIFY_FIELDS (yangi obyekt uchun hammasi)"""
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return {name: getattr(self, name) for name in self.NOTIFY_FIELDS}
+        deferred = self.get_deferred_fields()
+        return {
+            name: getattr(self, name)
+            for name in self.NOTIFY_FIELDS
+            if name in loaded and name not in deferred and loaded[name] != getattr(self, name)
+        }
+
+
+class EventException(BaseModel):
+    """
+    Takrorlanuvchi event (RRULE) ning bitta takrorlanishi uchun istisno:
+    bekor qilish yoki vaqt / sarlavhani o'zgartirish (override)
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='exceptions', verbose_name=_('Event'))
+    # RRULE bo'yicha asl boshlanish vaqti
+    original_start = models.DateTimeField(verbose_name=_('Original start'))
+    is_cancelled = models.BooleanField(default=False, verbose_name=_('Is cancelled'))
+    
+    # Override (bo'sh bo'lsa event qiymati ishlatiladi)
+    time_start = models.DateTimeField(null=True, blank=True, verbose_name=_('Start time'))
+    time_end = models.DateTimeField(null=True, blank=True, verbose_name=_('End time'))
+    title = models.CharField(max_length=255, blank=True, null=True, verbose_name=_('Title'))
+    note = models.TextField(blank=True, null=True, verbose_name=_('Note'))
+    
+    class Meta:
+        ordering = ['original_start']
+        unique_together = ['event', 'original_start']
+        verbose_name = _('Event exception')
+        verbose_name_plural = _('Event exceptions')
+    
+    def __str__(self):
+        return f"{self.event.title} - {self.original_start}"
+
+
+class EventOccurrence(BaseModel):
+    """
+    Event dan hosil qilinadigan (materialized) takrorlanishlar jadvali.
+    Oddiy event - bitta qator, RRULE - sync paytida tugamaganlaridan horizon gacha
+    har bir takrorlanish (o'tganlari tarix sifatida qoladi).
+    Bekor qilingan eventlar va takrorlanishlar bu yerda saqlanmaydi
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='occurrences', verbose_name=_('Event'))
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='event_occurrences', verbose_name=_('User'))
+    
+    time_start = models.DateTimeField(verbose_name=_('Start time'))
+    time_end = models.DateTimeField(verbose_name=_('End time'))
+    original_start = models.DateTimeField(verbose_name=_('Original start'))
+    
+    # EventException override (bo'sh bo'lsa event qiymati)
+    title = models.CharField(max_length=255, blank=True, null=True, verbose_name=_('Title'))
+    note = models.TextField(blank=True, null=True, verbose_name=_('Note'))
+    
+    objects = EventOccurrenceQuerySet.as_manager()
+    
+    class Meta:
+        ordering = ['time_start']
+        unique_together = ['event', 'original_start']
+        indexes = [
+            models.Index(fields=['user', 'time_start']),
+            # Alertlar uchun eventning keyingi takrorlanishi
+            models.Index(fields=['event', 'time_start'], name='eventoccurrence_event_start'),
+            # PostgreSQL: GiST (user_id, tstzrange(time_start, time_end)) - migration da
+        ]
+        verbose_name = _('Event occurrence')
+        verbose_name_plural = _('Event occurrences')
+    
+    def __str__(self):
+        return f"{self.event.title} - {self.time_start}"
 
 
 class EventInvite(BaseModel):
@@ -91,8 +206,19 @@ class EventInvite(BaseModel):
     email = models.EmailField(verbose_name=_('Email'))
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name=_('Status'))
     
+    # Taklif emaili (invites.py): yuborilgan vaqt, worker band qilgan vaqt (lease) va urinishlar soni
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Sent at'))
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Claimed at'))
+    send_attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_('Send attempts'))
+    
+    objects = EventInviteQuerySet.as_manager()
+    
     class Meta:
         unique_together = ['event', 'email']
+        indexes = [
+            # Yuborilmagan takliflar navbati
+            models.Index(fields=['created_at'], condition=models.Q(sent_at__isnull=True), name='eventinvite_unsent'),
+        ]
         verbose_name = _('Event invite')
         verbose_name_plural = _('Event invites')
     
@@ -120,7 +246,18 @@ class EventAlert(BaseModel):
     is_sent = models.BooleanField(default=False, verbose_name=_('Is sent'))
     sent_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Sent at'))
     
+    # Yuborilish vaqti: event.time_start - offset (dispatcher shu bo'yicha ishlaydi)
+    fire_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Fire at'))
+    
+    objects = EventAlertQuerySet.as_manager()
+    
     class Meta:
+        indexes = [
+            # "Keyingi N ta alert" - yuborilmaganlar bo'yicha partial index
+            models.Index(fields=['fire_at'], condition=models.Q(is_sent=False), name='eventalert_pending_fire_at'),
+            # Dispatcher refill: oxirgi refill dan beri o'zgarganlar
+            models.Index(fields=['updated_at'], condition=models.Q(is_sent=False), name='eventalert_pending_updated'),
+        ]
         verbose_name = _('Event alert')
         verbose_name_plural = _('Event alerts')
     
@@ -144,6 +281,24 @@ class EventAlert(BaseModel):
     def display_text(self):
         """Ko'rinadigan matn: '10m', '1h', '1d'"""
         return f"{self.value}{self.unit}"
+    
+    def compute_fire_at(self, time_start=None):
+        """Event boshlanishidan offset ayirilgan vaqt"""
+        time_start = time_start or self.event.time_start
+        return time_start - timedelta(seconds=self.offset_seconds)
+    
+    def save(self, *args, **kwargs):
+        if is_recurring(self.event):
+            from .occurrences import next_fire_at
+
+            # Takrorlanuvchi event: keyingi occurrence bo'yicha (EventOccurrence jadvalidan)
+            self.fire_at = next_fire_at([self], timezone.now())[self.pk]
+        else:
+            self.fire_at = self.compute_fire_at()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and EventAlertQuerySet.FIRE_AT_FIELDS.intersection(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'fire_at'}
+        super().save(*args, **kwargs)
 
 
 class ParsedEventDraft(BaseModel):
@@ -205,8 +360,16 @@ class AuditLog(BaseModel):
     model_name = models.CharField(max_length=100, verbose_name=_('Model name'))
     object_id = models.UUIDField(verbose_name=_('Object ID'))
     changes = models.JSONField(default=dict, verbose_name=_('Changes'))
+    # Amal bajarilgan vaqt: obyekt yaratilganda qo'yiladi (audit sink keyinroq yozsa ham o'zgarmaydi)
+    created_at = models.DateTimeField(default=timezone.now, verbose_name=_('Created at'))
     
     class Meta:
         ordering = ['-created_at']
+        # PostgreSQL da jadval created_at bo'yicha oylik partition larga bo'lingan (migration 0011, partitions.py)
+        indexes = [
+            models.Index(fields=['created_at'], name='auditlog_created_at'),
+            models.Index(fields=['object_id'], name='auditlog_object_id'),
+            models.Index(fields=['user', 'created_at'], name='auditlog_user_created'),
+        ]
         verbose_name = _('Audit log')
         verbose_name_plural = _('Audit logs')
\ No newline at end of file
@@ -1,14 +1,394 @@
+import multiprocessing
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
+from functools import lru_cache
 from dateutil import parser as date_parser
 import pytz
-from langdetect import detect, DetectorFactory
-from langdetect.lang_detect_exception import LangDetectException
 from django.conf import settings
 from django.utils import timezone
+from .language_detector import LanguageDetector
+from .parse_cache import ParseCache
 
-# Langdetect uchun seed
-DetectorFactory.seed = 0
+
+# Dastlabki tilni aniqlash uchun so'zlar
+LANGUAGE_KEYWORDS = {
+    'uz': {
+        'keywords': ['va', 'lekin', 'yoki', 'ertaga', 'bugun', 'uchun'],
+        'common_words': ['va', 'lekin', 'yoki', 'uchun', 'bilan']
+    },
+    'ru': {
+        'keywords': ['и', 'но', 'или', 'завтра', 'сегодня', 'для'],
+        'common_words': ['и', 'но', 'или', 'для', 'с']
+    },
+    'en': {
+        'keywords': ['and', 'but', 'or', 'tomorrow', 'today', 'for'],
+        'common_words': ['the', 'and', 'for', 'with', 'that']
+    }
+}
+
+# Ma'nolari
+KEYWORDS = {
+    'uz': {
+        'ertaga': 'tomorrow',
+        'bugun': 'today',
+        'kecha': 'yesterday',
+        'dushanba': 'monday',
+        'seshanba': 'tuesday',
+        'chorshanba': 'wednesday',
+        'payshanba': 'thursday',
+        'juma': 'friday',
+        'shanba': 'saturday',
+        'yakshanba': 'sunday',
+        'butun kun': 'all_day',
+        'har': 'every',
+        'daqiqa': 'minute',
+        'soat': 'hour',
+        'kun': 'day',
+        'hafta': 'week',
+        'oy': 'month',
+        'yil': 'year',
+        'vaqt': 'time',
+        'boshlanish': 'start',
+        'tugash': 'end',
+        'oldin': 'before',
+        'keyin': 'after',
+        'saat': 'o\'clock',
+    },
+    'ru': {
+        'завтра': 'tomorrow',
+        'сегодня': 'today',
+        'вчера': 'yesterday',
+        'понедельник': 'monday',
+        'вторник': 'tuesday',
+        'среда': 'wednesday',
+        'четверг': 'thursday',
+        'пятница': 'friday',
+        'суббота': 'saturday',
+        'воскресенье': 'sunday',
+        'целый день': 'all_day',
+        'весь день': 'all_day',
+        'каждый': 'every',
+        'ежедневно': 'daily',
+        'еженедельно': 'weekly',
+        'минута': 'minute',
+        'час': 'hour',
+        'день': 'day',
+        'неделя': 'week',
+        'месяц': 'month',
+        'год': 'year',
+        'время': 'time',
+        'начало': 'start',
+        'конец': 'end',
+        'до': 'before',
+        'после': 'after',
+        'в': 'at',
+    },
+    'en': {
+        'tomorrow': 'tomorrow',
+        'today': 'today',
+        'yesterday': 'yesterday',
+        'monday': 'monday',
+        'tuesday': 'tuesday',
+        'wednesday': 'wednesday',
+        'thursday': 'thursday',
+        'friday': 'friday',
+        'saturday': 'saturday',
+        'sunday': 'sunday',
+        'all day': 'all_day',
+        'whole day': 'all_day',
+        'every': 'every',
+        'daily': 'daily',
+        'weekly': 'weekly',
+        'monthly': 'monthly',
+        'minute': 'minute',
+        'hour': 'hour',
+        'day': 'day',
+        'week': 'week',
+        'month': 'month',
+        'year': 'year',
+        'time': 'time',
+        'start': 'start',
+        'end': 'end',
+        'before': 'before',
+        'after': 'after',
+        'at': 'at',
+    }
+}
+
+INTENT_KEYWORDS = {
+    'uz': {
+        'create': ['yarat', 'qo\'sh', 'qosh', 'tuz', 'kirit'],
+        'update': ['o\'zgartir', 'yangila', 'tahrir', 'edit'],
+        'delete': ['o\'chir', 'delete', 'uchir', 'toza'],
+        'show': ['ko\'rsat', 'korsat', 'korish', 'qidir'],
+        'remind': ['eslat', 'ogoh', 'alert'],
+        'cancel': ['bekor', 'cancel', 'otkaz'],
+    },
+    'ru': {
+        'create': ['создать', 'добавить', 'создай', 'добавь'],
+        'update': ['изменить', 'обновить', 'редактировать', 'измен'],
+        'delete': ['удалить', 'убрать', 'стереть', 'удали'],
+        'show': ['показать', 'посмотреть', 'найти', 'искать'],
+        'remind': ['напомнить', 'напоминание', 'напомни'],
+        'cancel': ['отменить', 'отмена', 'отмени'],
+    },
+    'en': {
+        'create': ['create', 'add', 'make', 'new'],
+        'update': ['update', 'edit', 'change', 'modify'],
+        'delete': ['delete', 'remove', 'erase', 'cancel'],
+        'show': ['show', 'view', 'find', 'search'],
+        'remind': ['remind', 'alert', 'notify'],
+        'cancel': ['cancel', 'stop', 'abort'],
+    }
+}
+
+# Sarlavhadan olib tashlanadigan patternlar (tartib muhim - ketma-ket qo'llanadi)
+TITLE_STRIP_PATTERNS = [
+    r'\d{1,2}[:.]\d{2}',  # 14:30, 2.30
+    r'\d+\s*(daqiqa|soat|kun|hafta|oy|minut|hour|day|week|month)',
+    r'ertaga|bugun|kecha|завтра|сегодня|вчера|tomorrow|today|yesterday',
+    r'dushanba|seshanba|chorshanba|payshanba|juma|shanba|yakshanba',
+    r'понедельник|вторник|среда|четверг|пятница|суббота|воскресенье',
+    r'monday|tuesday|wednesday|thursday|friday|saturday|sunday',
+    r'@\w+',  # @mention
+    r'[\w\.-]+@[\w\.-]+\.\w+',  # Email
+    r'https?://\S+',  # URL
+]
+
+TITLE_STOP_WORDS = {
+    'uz': ['uchun', 'bilan', 'da', 'ga', 'ni', 'ning', 'va', 'lekin', 'yoki'],
+    'ru': ['для', 'с', 'в', 'на', 'по', 'и', 'но', 'или'],
+    'en': ['for', 'with', 'at', 'on', 'in', 'and', 'but', 'or', 'the']
+}
+
+ALL_DAY_KEYWORDS = {
+    'uz': ['butun kun', 'kun bo\'yi', 'toliq kun', 'kunning hammasi'],
+    'ru': ['целый день', 'весь день', 'на весь день', 'полный день'],
+    'en': ['all day', 'whole day', 'full day', 'entire day']
+}
+
+# Sana kalit so'zlari: ('days', n) -> now + n kun, ('weekday', n) -> keyingi hafta kuni
+DATE_KEYWORDS = {
+    'uz': {
+        'ertaga': ('days', 1),
+        'bugun': ('days', 0),
+        'kecha': ('days', -1),
+        'dushanba': ('weekday', 0),
+        'seshanba': ('weekday', 1),
+        'chorshanba': ('weekday', 2),
+        'payshanba': ('weekday', 3),
+        'juma': ('weekday', 4),
+        'shanba': ('weekday', 5),
+        'yakshanba': ('weekday', 6),
+    },
+    'ru': {
+        'завтра': ('days', 1),
+        'сегодня': ('days', 0),
+        'вчера': ('days', -1),
+        'понедельник': ('weekday', 0),
+        'вторник': ('weekday', 1),
+        'среда': ('weekday', 2),
+        'четверг': ('weekday', 3),
+        'пятница': ('weekday', 4),
+        'суббота': ('weekday', 5),
+        'воскресенье': ('weekday', 6),
+    },
+    'en': {
+        'tomorrow': ('days', 1),
+        'today': ('days', 0),
+        'yesterday': ('days', -1),
+        'monday': ('weekday', 0),
+        'tuesday': ('weekday', 1),
+        'wednesday': ('weekday', 2),
+        'thursday': ('weekday', 3),
+        'friday': ('weekday', 4),
+        'saturday': ('weekday', 5),
+        'sunday': ('weekday', 6),
+    }
+}
+
+HOUR_MINUTE_PATTERNS = [
+    r'(\d{1,2})[:.](\d{2})',  # 14:30, 2.30
+    r'(\d{1,2})\s*soat',  # 2 soat
+    r'(\d{1,2})\s*часов',  # 2 часов
+    r'(\d{1,2})\s*o\'clock',  # 2 o'clock
+    r'(\d{1,2})\s*am',  # 2 am
+    r'(\d{1,2})\s*pm',  # 2 pm
+    r'(\d{1,2})\s*утра',  # 2 утра
+    r'(\d{1,2})\s*вечера',  # 2 вечера
+]
+
+REPEAT_PATTERNS = {
+    'uz': {
+        'har kun': 'RRULE:FREQ=DAILY',
+        'har hafta': 'RRULE:FREQ=WEEKLY',
+        'har oy': 'RRULE:FREQ=MONTHLY',
+        'har yil': 'RRULE:FREQ=YEARLY',
+        'har juma': 'RRULE:FREQ=WEEKLY;BYDAY=FR',
+        'dushanba kunlari': 'RRULE:FREQ=WEEKLY;BYDAY=MO',
+        'haftasiga': 'RRULE:FREQ=WEEKLY',
+        'oyiga': 'RRULE:FREQ=MONTHLY',
+    },
+    'ru': {
+        'каждый день': 'RRULE:FREQ=DAILY',
+        'ежедневно': 'RRULE:FREQ=DAILY',
+        'каждую неделю': 'RRULE:FREQ=WEEKLY',
+        'еженедельно': 'RRULE:FREQ=WEEKLY',
+        'каждый месяц': 'RRULE:FREQ=MONTHLY',
+        'ежемесячно': 'RRULE:FREQ=MONTHLY',
+        'каждую пятницу': 'RRULE:FREQ=WEEKLY;BYDAY=FR',
+        'по пятницам': 'RRULE:FREQ=WEEKLY;BYDAY=FR',
+    },
+    'en': {
+        'every day': 'RRULE:FREQ=DAILY',
+        'daily': 'RRULE:FREQ=DAILY',
+        'every week': 'RRULE:FREQ=WEEKLY',
+        'weekly': 'RRULE:FREQ=WEEKLY',
+        'every month': 'RRULE:FREQ=MONTHLY',
+        'monthly': 'RRULE:FREQ=MONTHLY',
+        'every friday': 'RRULE:FREQ=WEEKLY;BYDAY=FR',
+        'on fridays': 'RRULE:FREQ=WEEKLY;BYDAY=FR',
+        'bi-weekly': 'RRULE:FREQ=WEEKLY;INTERVAL=2',
+    }
+}
+
+# Pattern: raqam + m/h/d/w
+ALERT_PATTERNS = {
+    'uz': [
+        (r'(\d+)\s*daqiqa\s*oldin', 'm'),
+        (r'(\d+)\s*soat\s*oldin', 'h'),
+        (r'(\d+)\s*kun\s*oldin', 'd'),
+        (r'(\d+)\s*hafta\s*oldin', 'w'),
+        (r'(\d+)\s*m\s*oldin', 'm'),
+        (r'(\d+)\s*h\s*oldin', 'h'),
+        (r'(\d+)\s*d\s*oldin', 'd'),
+        (r'(\d+)\s*w\s*oldin', 'w'),
+        (r'eslatma\s*(\d+)\s*daqiqa', 'm'),
+        (r'eslatma\s*(\d+)\s*soat', 'h'),
+    ],
+    'ru': [
+        (r'(\d+)\s*минут\w*\s*(?:до|перед)', 'm'),
+        (r'(\d+)\s*час\w*\s*(?:до|перед)', 'h'),
+        (r'(\d+)\s*дн\w*\s*(?:до|перед)', 'd'),
+        (r'(\d+)\s*недел\w*\s*(?:до|перед)', 'w'),
+        (r'(\d+)\s*м\s*(?:до|перед)', 'm'),
+        (r'(\d+)\s*ч\s*(?:до|перед)', 'h'),
+        (r'(\d+)\s*д\s*(?:до|перед)', 'd'),
+        (r'(\d+)\s*н\s*(?:до|перед)', 'w'),
+        (r'напомин\w+\s*(\d+)\s*минут', 'm'),
+        (r'напомин\w+\s*(\d+)\s*час', 'h'),
+    ],
+    'en': [
+        (r'(\d+)\s*minutes?\s*before', 'm'),
+        (r'(\d+)\s*hours?\s*before', 'h'),
+        (r'(\d+)\s*days?\s*before', 'd'),
+        (r'(\d+)\s*weeks?\s*before', 'w'),
+        (r'(\d+)\s*m\s*before', 'm'),
+        (r'(\d+)\s*h\s*before', 'h'),
+        (r'(\d+)\s*d\s*before', 'd'),
+        (r'(\d+)\s*w\s*before', 'w'),
+        (r'remind\w*\s*(\d+)\s*minutes?', 'm'),
+        (r'remind\w*\s*(\d+)\s*hours?', 'h'),
+    ]
+}
+
+SUGGESTION_TRANSLATIONS = {
+    'uz': {
+        'time_missing': "Iltimos, vaqtni ko'rsating (masalan: 'ertaga 14:00', 'juma kuni')",
+        'short_duration': "Bu vaqt juda qisqa, davomiylikni ko'paytirishni xohlaysizmi?",
+        'long_duration': "Bu vaqt juda uzoq, davomiylikni qisqartirishni xohlaysizmi?",
+        'add_alert': "Ogohlantirish qo'shishni xohlaysizmi?",
+        'add_repeat': "Takrorlanish qo'shishni xohlaysizmi?",
+    },
+    'ru': {
+        'time_missing': "Пожалуйста, укажите время (например: 'завтра 14:00', 'в пятницу')",
+        'short_duration': "Это очень короткое время, хотите увеличить продолжительность?",
+        'long_duration': "Это очень долгое время, хотите сократить продолжительность?",
+        'add_alert': "Хотите добавить напоминание?",
+        'add_repeat': "Хотите добавить повторение?",
+    },
+    'en': {
+        'time_missing': "Please specify time (e.g., 'tomorrow 14:00', 'on Friday')",
+        'short_duration': "This is very short duration, do you want to extend it?",
+        'long_duration': "This is very long duration, do you want to shorten it?",
+        'add_alert': "Do you want to add an alert?",
+        'add_repeat': "Do you want to add repetition?",
+    }
+}
+
+EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+URL_RE = re.compile(r'https?://\S+')
+ALERT_STRING_RE = re.compile(r'(\d+)([mhdw])')
+DIGIT_RE = re.compile(r'\d')
+
+_TITLE_STRIP_RES = [re.compile(pattern, re.IGNORECASE) for pattern in TITLE_STRIP_PATTERNS]
+_HOUR_MINUTE_RES = [(re.compile(pattern), pattern) for pattern in HOUR_MINUTE_PATTERNS]
+
+
+class PriorityMatcher:
+    """
+    Kalit so'zlardan bitta alternation automat.
+    Natija - matnda uchragan eng yuqori ustuvorlikdagi (ro'yxatdagi birinchi) so'z qiymati,
+    ya'ni `for word in words: if word in text` sikli bilan bir xil, lekin bitta o'tishda.
+    """
+
+    def __init__(self, pairs):
+        self.values = {}
+        self.ranks = {}
+        for rank, (word, value) in enumerate(pairs):
+            if word not in self.ranks:
+                self.ranks[word] = rank
+                self.values[word] = value
+        words = sorted(self.ranks, key=self.ranks.get)
+        # Lookahead har bir pozitsiyada (ustma-ust tushganda ham) eng ustuvor so'zni beradi
+        self.regex = re.compile('(?=(' + '|'.join(re.escape(word) for word in words) + '))') if words else None
+
+    def match(self, text: str):
+        if self.regex is None:
+            return None
+        best = None
+        for found in self.regex.finditer(text):
+            rank = self.ranks[found.group(1)]
+            if best is None or rank < self.ranks[best]:
+                best = found.group(1)
+                if rank == 0:
+                    break
+        return self.values[best] if best is not None else None
+
+
+class LanguageMatcher:
+    """Bitta til uchun oldindan kompilyatsiya qilingan pattern jadvallari"""
+
+    def __init__(self, language):
+        intents = INTENT_KEYWORDS.get(language, INTENT_KEYWORDS['en'])
+        self.intent = PriorityMatcher(
+            (word, intent.upper()) for intent, words in intents.items() for word in words
+        )
+        self.all_day = PriorityMatcher((word, True) for word in ALL_DAY_KEYWORDS.get(language, []))
+        self.date_keyword = PriorityMatcher(DATE_KEYWORDS.get(language, {}).items())
+        self.repeat = PriorityMatcher(REPEAT_PATTERNS.get(language, {}).items())
+        self.stop_words = frozenset(TITLE_STOP_WORDS.get(language, []))
+
+        alert_patterns = ALERT_PATTERNS.get(language, ALERT_PATTERNS['en'])
+        self.alerts = [(re.compile(pattern, re.IGNORECASE), unit) for pattern, unit in alert_patterns]
+        # Tezkor filter: birorta alert pattern mos kelmasa, alohida patternlar ishlatilmaydi
+        self.any_alert = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern, _ in alert_patterns), re.IGNORECASE
+        )
+
+
+@lru_cache(maxsize=None)
+def _build_matcher(language):
+    return LanguageMatcher(language)
+
+
+def get_matcher(language: str) -> LanguageMatcher:
+    """Til uchun matcher (bir marta quriladi). Noma'lum tillar bitta umumiy matcherdan foydalanadi"""
+    return _build_matcher(language if language in INTENT_KEYWORDS else None)
 
 
 class CalendarNLPParser:
@@ -16,180 +396,34 @@ class CalendarNLPParser:
     NLP parser for calendar events
     Django uchun optimallashtirilgan versiya
     """
-    
-    def __init__(self):
+
+    def __init__(self, cache: ParseCache = None):
         self.default_timezone = getattr(settings, 'TIME_ZONE', 'Asia/Tashkent')
-        
-        # Dastlabki tilni aniqlash uchun so'zlar
-        self.language_keywords = {
-            'uz': {
-                'keywords': ['va', 'lekin', 'yoki', 'ertaga', 'bugun', 'uchun'],
-                'common_words': ['va', 'lekin', 'yoki', 'uchun', 'bilan']
-            },
-            'ru': {
-                'keywords': ['и', 'но', 'или', 'завтра', 'сегодня', 'для'],
-                'common_words': ['и', 'но', 'или', 'для', 'с']
-            },
-            'en': {
-                'keywords': ['and', 'but', 'or', 'tomorrow', 'today', 'for'],
-                'common_words': ['the', 'and', 'for', 'with', 'that']
-            }
-        }
-        
-        # Ma'nolari
-        self.keywords = {
-            'uz': {
-                'ertaga': 'tomorrow',
-                'bugun': 'today',
-                'kecha': 'yesterday',
-                'dushanba': 'monday',
-                'seshanba': 'tuesday',
-                'chorshanba': 'wednesday',
-                'payshanba': 'thursday',
-                'juma': 'friday',
-                'shanba': 'saturday',
-                'yakshanba': 'sunday',
-                'butun kun': 'all_day',
-                'har': 'every',
-                'daqiqa': 'minute',
-                'soat': 'hour',
-                'kun': 'day',
-                'hafta': 'week',
-                'oy': 'month',
-                'yil': 'year',
-                'vaqt': 'time',
-                'boshlanish': 'start',
-                'tugash': 'end',
-                'oldin': 'before',
-                'keyin': 'after',
-                'saat': 'o\'clock',
-            },
-            'ru': {
-                'завтра': 'tomorrow',
-                'сегодня': 'today',
-                'вчера': 'yesterday',
-                'понедельник': 'monday',
-                'вторник': 'tuesday',
-                'среда': 'wednesday',
-                'четверг': 'thursday',
-                'пятница': 'friday',
-                'суббота': 'saturday',
-                'воскресенье': 'sunday',
-                'целый день': 'all_day',
-                'весь день': 'all_day',
-                'каждый': 'every',
-                'ежедневно': 'daily',
-                'еженедельно': 'weekly',
-                'минута': 'minute',
-                'час': 'hour',
-                'день': 'day',
-                'неделя': 'week',
-                'месяц': 'month',
-                'год': 'year',
-                'время': 'time',
-                'начало': 'start',
-                'конец': 'end',
-                'до': 'before',
-                'после': 'after',
-                'в': 'at',
-            },
-            'en': {
-                'tomorrow': 'tomorrow',
-                'today': 'today',
-                'yesterday': 'yesterday',
-                'monday': 'monday',
-                'tuesday': 'tuesday',
-                'wednesday': 'wednesday',
-                'thursday': 'thursday',
-                'friday': 'friday',
-                'saturday': 'saturday',
-                'sunday': 'sunday',
-                'all day': 'all_day',
-                'whole day': 'all_day',
-                'every': 'every',
-                'daily': 'daily',
-                'weekly': 'weekly',
-                'monthly': 'monthly',
-                'minute': 'minute',
-                'hour': 'hour',
-                'day': 'day',
-                'week': 'week',
-                'month': 'month',
-                'year': 'year',
-                'time': 'time',
-                'start': 'start',
-                'end': 'end',
-                'before': 'before',
-                'after': 'after',
-                'at': 'at',
-            }
-        }
-    
+        self.language_keywords = LANGUAGE_KEYWORDS
+        self.keywords = KEYWORDS
+        self.language_detector = LanguageDetector(
+            cache_size=getattr(settings, 'CALENDAR_NLP_LANGUAGE_CACHE_SIZE', 4096)
+        )
+        # parse() natijalari uchun kesh (None - keshsiz)
+        self.cache = cache
+
     def get_current_time(self, user_timezone: str = None):
         """Joriy vaqtni olish - Django bilan"""
         if user_timezone:
             tz = pytz.timezone(user_timezone)
             return timezone.now().astimezone(tz)
         return timezone.now()
-    
+
     def detect_language(self, text: str) -> str:
         """
-        Matndan tilni avtomatik aniqlash
-        1. langdetect kutubxonasi
-        2. Keyword orqali aniqlash
-        3. Default: 'uz'
+        Matndan tilni avtomatik aniqlash (LanguageDetector orqali)
+        1. Alifbo histogrammasi
+        2. uz/ru/en token lug'ati
+        3. Faqat noaniq matnlar uchun langdetect
+        4. Default: 'uz'
         """
-        if not text or len(text.strip()) < 3:
-            return 'uz'
-        
-        # 1. Langdetect orqali aniqlash
-        try:
-            detected_lang = detect(text)
-            lang_map = {'en': 'en', 'ru': 'ru'}
-            if detected_lang in lang_map:
-                return lang_map[detected_lang]
-        except LangDetectException:
-            pass
-        
-        # 2. Keyword orqali aniqlash
-        text_lower = text.lower()
-        
-        # Til bo'yicha hisoblash
-        scores = {'uz': 0, 'ru': 0, 'en': 0}
-        
-        # Uz tili uchun (lotin va kirill)
-        uz_keywords = ['va', 'lekin', 'yoki', 'uchun', 'bilan', 'da', 'ga', 'ni', 'ning']
-        for keyword in uz_keywords:
-            if keyword in text_lower:
-                scores['uz'] += 1
-        
-        # Rus tili uchun
-        ru_keywords = ['и', 'но', 'или', 'для', 'с', 'в', 'на', 'по']
-        for keyword in ru_keywords:
-            if keyword in text_lower:
-                scores['ru'] += 1
-        
-        # Ingliz tili uchun
-        en_keywords = ['the', 'and', 'for', 'with', 'that', 'this', 'have', 'has']
-        for keyword in en_keywords:
-            if keyword in text_lower:
-                scores['en'] += 1
-        
-        # Max score bo'lgan til
-        max_score_lang = max(scores, key=scores.get)
-        
-        # Agar hech qaysi tilda aniq belgi bo'lmasa
-        if scores[max_score_lang] == 0:
-            # Alifbo orqali aniqlash
-            if re.search(r'[а-яА-ЯёЁ]', text):
-                return 'ru'
-            elif re.search(r'[a-zA-Z]', text) and not re.search(r'[а-яА-ЯёЁ]', text):
-                return 'en'
-            else:
-                return 'uz'  # Lotin harflari, default Uzbek
-        else:
-            return max_score_lang
-    
+        return self.language_detector.detect(text).language
+
     def parse(self, prompt: str, language: str = None, user_timezone: str = None):
         """
         Promptdan event fieldlarini extract qilish
@@ -202,23 +436,43 @@ class CalendarNLPParser:
                 'extracted_data': {},
                 'suggestions': ['Please enter a valid prompt']
             }
-        
+
         # Timezone ni aniqlash
         if not user_timezone:
             user_timezone = self.default_timezone
-        
+
+        if self.cache is None:
+            return self._parse(prompt, language, user_timezone)
+
+        key, result = self._get_cached(prompt, language, user_timezone)
+        if result is None:
+            result = self._parse(prompt, language, user_timezone)
+            self.cache.set(key, result)
+        return result
+
+    def _get_cached(self, prompt: str, language: str, user_timezone: str):
+        """Kesh kaliti va keshdagi natija (topilmasa None)"""
+        key = self.cache.make_key(prompt, language, user_timezone)
+        result = self.cache.get(key)
+        if result is not None:
+            # Kalit normallashtirilgan, promptga bog'liq fieldlar qayta to'ldiriladi
+            result['original_prompt'] = prompt
+            result['extracted_data']['note'] = self._extract_note(prompt)
+        return key, result
+
+    def _parse(self, prompt: str, language: str, user_timezone: str):
         # Tilni aniqlash
         if not language:
             language = self.detect_language(prompt)
-        
+
         prompt_lower = prompt.lower()
-        
+
         # Intent classification
         intent = self._detect_intent(prompt_lower, language)
-        
+
         # Slot filling
         extracted_data = self._extract_slots(prompt, language, user_timezone)
-        
+
         return {
             'intent': intent,
             'language': language,
@@ -227,64 +481,74 @@ class CalendarNLPParser:
             'suggestions': self._generate_suggestions(extracted_data, language),
             'original_prompt': prompt
         }
-    
+
+    def parse_many(self, prompts, language: str = None, user_timezone: str = None) -> list:
+        """
+        Ko'p promptlarni bir vaqtda parse qilish (bulk import uchun).
+        Katta batchlar process pool da parallel ishlanadi, natijalar tartibi saqlanadi
+        """
+        prompts = list(prompts)
+        threshold = getattr(settings, 'CALENDAR_NLP_BATCH_POOL_THRESHOLD', 32)
+        if len(prompts) < threshold:
+            return [self.parse(prompt, language, user_timezone) for prompt in prompts]
+
+        user_timezone = user_timezone or self.default_timezone
+        results = [None] * len(prompts)
+        keys = {}
+        if self.cache is not None:
+            for index, prompt in enumerate(prompts):
+                if prompt and prompt.strip():
+                    keys[index], results[index] = self._get_cached(prompt, language, user_timezone)
+        pending = [index for index, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+
+        pool, workers = _get_pool()
+        chunksize = max(1, len(pending) // (workers * 4))
+        try:
+            parsed = pool.map(
+                _parse_in_worker,
+                [(prompts[index], language, user_timezone) for index in pending],
+                chunksize=chunksize,
+            )
+            for index, result in zip(pending, parsed):
+                results[index] = result
+                if index in keys:
+                    self.cache.set(keys[index], result)
+        except BrokenProcessPool:
+            # Worker o'lib qolsa - pool ni qayta yaratish va shu process ning o'zida ishlash
+            _reset_pool()
+            for index in pending:
+                results[index] = self.parse(prompts[index], language, user_timezone)
+        return results
+
     def _calculate_confidence(self, prompt: str, extracted_data: dict) -> float:
         """Ishenchilik darajasini hisoblash"""
         confidence = 0.5  # Base confidence
-        
+
         # Title mavjud bo'lsa
         if extracted_data.get('title') and extracted_data['title'] != 'Event':
             confidence += 0.2
-        
+
         # Vaqt mavjud bo'lsa
         if extracted_data.get('time_start'):
             confidence += 0.2
-        
+
         # Boshqa fieldlar mavjud bo'lsa
         extra_fields = ['repeat', 'invite', 'alert', 'url', 'note']
         for field in extra_fields:
             if extracted_data.get(field):
                 confidence += 0.05
-        
+
         # Max 0.95
         return min(confidence, 0.95)
-    
+
     def _detect_intent(self, prompt: str, language: str) -> str:
         """Intent ni aniqlash"""
-        intent_keywords = {
-            'uz': {
-                'create': ['yarat', 'qo\'sh', 'qosh', 'tuz', 'kirit'],
-                'update': ['o\'zgartir', 'yangila', 'tahrir', 'edit'],
-                'delete': ['o\'chir', 'delete', 'uchir', 'toza'],
-                'show': ['ko\'rsat', 'korsat', 'korish', 'qidir'],
-                'remind': ['eslat', 'ogoh', 'alert'],
-                'cancel': ['bekor', 'cancel', 'otkaz'],
-            },
-            'ru': {
-                'create': ['создать', 'добавить', 'создай', 'добавь'],
-                'update': ['изменить', 'обновить', 'редактировать', 'измен'],
-                'delete': ['удалить', 'убрать', 'стереть', 'удали'],
-                'show': ['показать', 'посмотреть', 'найти', 'искать'],
-                'remind': ['напомнить', 'напоминание', 'напомни'],
-                'cancel': ['отменить', 'отмена', 'отмени'],
-            },
-            'en': {
-                'create': ['create', 'add', 'make', 'new'],
-                'update': ['update', 'edit', 'change', 'modify'],
-                'delete': ['delete', 'remove', 'erase', 'cancel'],
-                'show': ['show', 'view', 'find', 'search'],
-                'remind': ['remind', 'alert', 'notify'],
-                'cancel': ['cancel', 'stop', 'abort'],
-            }
-        }
-        
-        keywords = intent_keywords.get(language, intent_keywords['en'])
-        
-        for intent, intent_words in keywords.items():
-            for word in intent_words:
-                if word in prompt:
-                    return intent.upper()
-        
+        intent = get_matcher(language).intent.match(prompt)
+        if intent:
+            return intent
+
         # Agar intent aniqlanmasa, kontekstga qarab
         if '?' in prompt:
             return 'SHOW'
@@ -292,222 +556,143 @@ class CalendarNLPParser:
             return 'REMIND'
         else:
             return 'CREATE'  # Default
-    
+
     def _extract_slots(self, prompt: str, language: str, user_timezone: str) -> dict:
         """Fieldlarni extract qilish"""
         extracted = {}
-        
+
         # 1. Title (qolgan text)
         extracted['title'] = self._extract_title(prompt, language)
-        
+
         # 2. All-day
         extracted['all_day'] = self._extract_all_day(prompt, language)
-        
+
         # 3. Time start & end
         times = self._extract_time(prompt, language, user_timezone)
         extracted.update(times)
-        
+
         # 4. Repeat
         extracted['repeat'] = self._extract_repeat(prompt, language)
-        
+
         # 5. Invite (email list)
         extracted['invite'] = self._extract_invites(prompt)
-        
+
         # 6. Alert
         extracted['alert'] = self._extract_alerts(prompt, language)
-        
+
         # 7. URL
         extracted['url'] = self._extract_url(prompt)
-        
+
         # 8. Note
         extracted['note'] = self._extract_note(prompt)
-        
+
         return extracted
-    
+
     def _extract_title(self, prompt: str, language: str) -> str:
         """Sarlavha extract"""
-        prompt_clean = prompt.strip()
-        
-        # Vaqt, taklif, ogohlantirish patternlari
-        time_patterns = [
-            r'\d{1,2}[:.]\d{2}',  # 14:30, 2.30
-            r'\d+\s*(daqiqa|soat|kun|hafta|oy|minut|hour|day|week|month)',
-            r'ertaga|bugun|kecha|завтра|сегодня|вчера|tomorrow|today|yesterday',
-            r'dushanba|seshanba|chorshanba|payshanba|juma|shanba|yakshanba',
-            r'понедельник|вторник|среда|четверг|пятница|суббота|воскресенье',
-            r'monday|tuesday|wednesday|thursday|friday|saturday|sunday',
-            r'@\w+',  # @mention
-            r'[\w\.-]+@[\w\.-]+\.\w+',  # Email
-            r'https?://\S+',  # URL
-        ]
-        
-        # Promptni tozalash
-        cleaned_prompt = prompt_clean
-        for pattern in time_patterns:
-            cleaned_prompt = re.sub(pattern, '', cleaned_prompt, flags=re.IGNORECASE)
-        
+        # Vaqt, taklif, ogohlantirish patternlarini olib tashlash
+        cleaned_prompt = prompt.strip()
+        for pattern in _TITLE_STRIP_RES:
+            cleaned_prompt = pattern.sub('', cleaned_prompt)
+
         # Maxsus so'zlarni olib tashlash
-        stop_words = {
-            'uz': ['uchun', 'bilan', 'da', 'ga', 'ni', 'ning', 'va', 'lekin', 'yoki'],
-            'ru': ['для', 'с', 'в', 'на', 'по', 'и', 'но', 'или'],
-            'en': ['for', 'with', 'at', 'on', 'in', 'and', 'but', 'or', 'the']
-        }
-        
-        words = cleaned_prompt.split()
-        filtered_words = []
-        
-        for word in words:
-            if word.lower() not in stop_words.get(language, []):
-                filtered_words.append(word)
-        
+        stop_words = get_matcher(language).stop_words
+        filtered_words = [word for word in cleaned_prompt.split() if word.lower() not in stop_words]
+
         # Agar sarlavha bo'sh bo'lsa
         if not filtered_words:
             return "Event"
-        
+
         # Max 5 so'z
         title = ' '.join(filtered_words[:5])
-        
+
         # Agar juda qisqa bo'lsa
         if len(title) < 3:
             return "Meeting" if language == 'en' else "Uchrashuv" if language == 'uz' else "Встреча"
-        
+
         return title
-    
+
     def _extract_all_day(self, prompt: str, language: str) -> bool:
         """All-day extract"""
-        all_day_keywords = {
-            'uz': ['butun kun', 'kun bo\'yi', 'toliq kun', 'kunning hammasi'],
-            'ru': ['целый день', 'весь день', 'на весь день', 'полный день'],
-            'en': ['all day', 'whole day', 'full day', 'entire day']
-        }
-        
-        keywords = all_day_keywords.get(language, [])
-        prompt_lower = prompt.lower()
-        
-        for keyword in keywords:
-            if keyword in prompt_lower:
-                return True
-        
-        return False
-    
+        return bool(get_matcher(language).all_day.match(prompt.lower()))
+
     def _extract_time(self, prompt: str, language: str, user_timezone: str) -> dict:
         """Vaqt extract - Django bilan"""
         now = self.get_current_time(user_timezone)
-        
-        # Time patterns
-        time_patterns = {
-            'uz': {
-                'ertaga': now + timedelta(days=1),
-                'bugun': now,
-                'kecha': now - timedelta(days=1),
-                'dushanba': self._next_weekday(now, 0),
-                'seshanba': self._next_weekday(now, 1),
-                'chorshanba': self._next_weekday(now, 2),
-                'payshanba': self._next_weekday(now, 3),
-                'juma': self._next_weekday(now, 4),
-                'shanba': self._next_weekday(now, 5),
-                'yakshanba': self._next_weekday(now, 6),
-            },
-            'ru': {
-                'завтра': now + timedelta(days=1),
-                'сегодня': now,
-                'вчера': now - timedelta(days=1),
-                'понедельник': self._next_weekday(now, 0),
-                'вторник': self._next_weekday(now, 1),
-                'среда': self._next_weekday(now, 2),
-                'четверг': self._next_weekday(now, 3),
-                'пятница': self._next_weekday(now, 4),
-                'суббота': self._next_weekday(now, 5),
-                'воскресенье': self._next_weekday(now, 6),
-            },
-            'en': {
-                'tomorrow': now + timedelta(days=1),
-                'today': now,
-                'yesterday': now - timedelta(days=1),
-                'monday': self._next_weekday(now, 0),
-                'tuesday': self._next_weekday(now, 1),
-                'wednesday': self._next_weekday(now, 2),
-                'thursday': self._next_weekday(now, 3),
-                'friday': self._next_weekday(now, 4),
-                'saturday': self._next_weekday(now, 5),
-                'sunday': self._next_weekday(now, 6),
-            }
-        }
-        
-        prompt_lower = prompt.lower()
-        
+
         # Keyword orqali aniqlash
-        for keyword, date_obj in time_patterns.get(language, {}).items():
-            if keyword in prompt_lower:
-                # Soatni aniqlash
-                hour_minute = self._extract_hour_minute(prompt)
-                if hour_minute:
-                    date_obj = date_obj.replace(hour=hour_minute['hour'], 
-                                              minute=hour_minute['minute'])
-                
-                time_end = date_obj + timedelta(hours=1)
-                
-                return {
-                    'time_start': date_obj.isoformat(),
-                    'time_end': time_end.isoformat()
-                }
-        
+        date_keyword = get_matcher(language).date_keyword.match(prompt.lower())
+        if date_keyword:
+            kind, value = date_keyword
+            if kind == 'weekday':
+                date_obj = self._next_weekday(now, value)
+            else:
+                date_obj = now + timedelta(days=value)
+
+            # Soatni aniqlash
+            hour_minute = self._extract_hour_minute(prompt)
+            if hour_minute:
+                date_obj = date_obj.replace(hour=hour_minute['hour'],
+                                          minute=hour_minute['minute'])
+
+            time_end = date_obj + timedelta(hours=1)
+
+            return {
+                'time_start': date_obj.isoformat(),
+                'time_end': time_end.isoformat()
+            }
+
         # Dateparser orqali
         try:
             parsed_date = date_parser.parse(prompt, fuzzy=True)
-            
+
             if parsed_date:
                 tz = pytz.timezone(user_timezone)
                 if parsed_date.tzinfo is None:
                     parsed_date = tz.localize(parsed_date)
                 else:
                     parsed_date = parsed_date.astimezone(tz)
-                    
+
                 time_end = parsed_date + timedelta(hours=1)
-                
+
                 return {
                     'time_start': parsed_date.isoformat(),
                     'time_end': time_end.isoformat()
                 }
         except:
             pass
-        
+
         # Agar vaqt topilmasa, default (keyingi soat)
         default_start = now + timedelta(hours=1)
         default_end = default_start + timedelta(hours=1)
-        
+
         return {
             'time_start': default_start.isoformat(),
             'time_end': default_end.isoformat()
         }
-    
+
     def _next_weekday(self, d, weekday):
         """Berilgan kundan keyingi hafta kunini topish"""
         days_ahead = weekday - d.weekday()
         if days_ahead <= 0:  # Agar bugun yoki o'tgan bo'lsa
             days_ahead += 7
         return d + timedelta(days_ahead)
-    
+
     def _extract_hour_minute(self, prompt: str):
         """Soat:minute formatini extract qilish"""
-        patterns = [
-            r'(\d{1,2})[:.](\d{2})',  # 14:30, 2.30
-            r'(\d{1,2})\s*soat',  # 2 soat
-            r'(\d{1,2})\s*часов',  # 2 часов
-            r'(\d{1,2})\s*o\'clock',  # 2 o'clock
-            r'(\d{1,2})\s*am',  # 2 am
-            r'(\d{1,2})\s*pm',  # 2 pm
-            r'(\d{1,2})\s*утра',  # 2 утра
-            r'(\d{1,2})\s*вечера',  # 2 вечера
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, prompt.lower())
+        prompt_lower = prompt.lower()
+
+        # Barcha patternlar raqamdan boshlanadi
+        if not DIGIT_RE.search(prompt_lower):
+            return None
+
+        for regex, pattern in _HOUR_MINUTE_RES:
+            match = regex.search(prompt_lower)
             if match:
                 try:
                     hour = int(match.group(1))
                     minute = int(match.group(2)) if len(match.groups()) > 1 and match.group(2) else 0
-                    
+
                     # AM/PM convert
                     if 'pm' in pattern and hour < 12:
                         hour += 12
@@ -517,199 +702,209 @@ class CalendarNLPParser:
                         hour += 12
                     elif 'утра' in pattern and hour == 12:
                         hour = 0
-                    
+
                     # 24 soat formatida
                     if hour < 24 and minute < 60:
                         return {'hour': hour, 'minute': minute}
                 except (IndexError, ValueError):
                     continue
-        
+
         return None
-    
+
     def _extract_repeat(self, prompt: str, language: str) -> str:
         """Repeat extract"""
-        repeat_patterns = {
-            'uz': {
-                'har kun': 'RRULE:FREQ=DAILY',
-                'har hafta': 'RRULE:FREQ=WEEKLY',
-                'har oy': 'RRULE:FREQ=MONTHLY',
-                'har yil': 'RRULE:FREQ=YEARLY',
-                'har juma': 'RRULE:FREQ=WEEKLY;BYDAY=FR',
-                'dushanba kunlari': 'RRULE:FREQ=WEEKLY;BYDAY=MO',
-                'haftasiga': 'RRULE:FREQ=WEEKLY',
-                'oyiga': 'RRULE:FREQ=MONTHLY',
-            },
-            'ru': {
-                'каждый день': 'RRULE:FREQ=DAILY',
-                'ежедневно': 'RRULE:FREQ=DAILY',
-                'каждую неделю': 'RRULE:FREQ=WEEKLY',
-                'еженедельно': 'RRULE:FREQ=WEEKLY',
-                'каждый месяц': 'RRULE:FREQ=MONTHLY',
-                'ежемесячно': 'RRULE:FREQ=MONTHLY',
-                'каждую пятницу': 'RRULE:FREQ=WEEKLY;BYDAY=FR',
-                'по пятницам': 'RRULE:FREQ=WEEKLY;BYDAY=FR',
-                'еженедельно': 'RRULE:FREQ=WEEKLY',
-            },
-            'en': {
-                'every day': 'RRULE:FREQ=DAILY',
-                'daily': 'RRULE:FREQ=DAILY',
-                'every week': 'RRULE:FREQ=WEEKLY',
-                'weekly': 'RRULE:FREQ=WEEKLY',
-                'every month': 'RRULE:FREQ=MONTHLY',
-                'monthly': 'RRULE:FREQ=MONTHLY',
-                'every friday': 'RRULE:FREQ=WEEKLY;BYDAY=FR',
-                'on fridays': 'RRULE:FREQ=WEEKLY;BYDAY=FR',
-                'bi-weekly': 'RRULE:FREQ=WEEKLY;INTERVAL=2',
-            }
-        }
-        
-        patterns = repeat_patterns.get(language, {})
-        prompt_lower = prompt.lower()
-        
-        for pattern, value in patterns.items():
-            if pattern in prompt_lower:
-                return value
-        
-        return None
-    
+        return get_matcher(language).repeat.match(prompt.lower())
+
     def _extract_invites(self, prompt: str) -> list:
         """Email list extract"""
-        emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', prompt)
-        return emails
-    
+        return EMAIL_RE.findall(prompt)
+
     def _extract_alerts(self, prompt: str, language: str) -> list:
         """Alert extract (format: '10m', '1h', '1d')"""
         prompt_lower = prompt.lower()
-        
-        # Pattern: raqam + m/h/d/w
-        patterns = {
-            'uz': [
-                (r'(\d+)\s*daqiqa\s*oldin', 'm'),
-                (r'(\d+)\s*soat\s*oldin', 'h'),
-                (r'(\d+)\s*kun\s*oldin', 'd'),
-                (r'(\d+)\s*hafta\s*oldin', 'w'),
-                (r'(\d+)\s*m\s*oldin', 'm'),
-                (r'(\d+)\s*h\s*oldin', 'h'),
-                (r'(\d+)\s*d\s*oldin', 'd'),
-                (r'(\d+)\s*w\s*oldin', 'w'),
-                (r'eslatma\s*(\d+)\s*daqiqa', 'm'),
-                (r'eslatma\s*(\d+)\s*soat', 'h'),
-            ],
-            'ru': [
-                (r'(\d+)\s*минут\w*\s*(?:до|перед)', 'm'),
-                (r'(\d+)\s*час\w*\s*(?:до|перед)', 'h'),
-                (r'(\d+)\s*дн\w*\s*(?:до|перед)', 'd'),
-                (r'(\d+)\s*недел\w*\s*(?:до|перед)', 'w'),
-                (r'(\d+)\s*м\s*(?:до|перед)', 'm'),
-                (r'(\d+)\s*ч\s*(?:до|перед)', 'h'),
-                (r'(\d+)\s*д\s*(?:до|перед)', 'd'),
-                (r'(\d+)\s*н\s*(?:до|перед)', 'w'),
-                (r'напомин\w+\s*(\d+)\s*минут', 'm'),
-                (r'напомин\w+\s*(\d+)\s*час', 'h'),
-            ],
-            'en': [
-                (r'(\d+)\s*minutes?\s*before', 'm'),
-                (r'(\d+)\s*hours?\s*before', 'h'),
-                (r'(\d+)\s*days?\s*before', 'd'),
-                (r'(\d+)\s*weeks?\s*before', 'w'),
-                (r'(\d+)\s*m\s*before', 'm'),
-                (r'(\d+)\s*h\s*before', 'h'),
-                (r'(\d+)\s*d\s*before', 'd'),
-                (r'(\d+)\s*w\s*before', 'w'),
-                (r'remind\w*\s*(\d+)\s*minutes?', 'm'),
-                (r'remind\w*\s*(\d+)\s*hours?', 'h'),
-            ]
-        }
-        
+        matcher = get_matcher(language)
+
+        if not matcher.any_alert.search(prompt_lower):
+            return []
+
         alerts = []
-        lang_patterns = patterns.get(language, patterns['en'])
-        
-        for pattern, unit in lang_patterns:
-            matches = re.findall(pattern, prompt_lower, re.IGNORECASE)
-            for value in matches:
+        for regex, unit in matcher.alerts:
+            for value in regex.findall(prompt_lower):
                 alerts.append(f"{value}{unit}")
-        
+            if len(alerts) >= 3:
+                break
+
         return alerts[:3]  # Max 3 ta alert
-    
+
     def _extract_url(self, prompt: str) -> str:
         """URL extract"""
-        urls = re.findall(r'https?://\S+', prompt)
-        return urls[0] if urls else None
-    
+        match = URL_RE.search(prompt)
+        return match.group(0) if match else None
+
     def _extract_note(self, prompt: str) -> str:
         """Note extract"""
         # Max 500 belgi
         if len(prompt) > 500:
             return prompt[:497] + "..."
         return prompt
-    
+
     def _generate_suggestions(self, extracted_data: dict, language: str) -> list:
         """Tilga mos takliflar generatsiya"""
         suggestions = []
-        
-        translations = {
-            'uz': {
-                'time_missing': "Iltimos, vaqtni ko'rsating (masalan: 'ertaga 14:00', 'juma kuni')",
-                'short_duration': "Bu vaqt juda qisqa, davomiylikni ko'paytirishni xohlaysizmi?",
-                'long_duration': "Bu vaqt juda uzoq, davomiylikni qisqartirishni xohlaysizmi?",
-                'add_alert': "Ogohlantirish qo'shishni xohlaysizmi?",
-                'add_repeat': "Takrorlanish qo'shishni xohlaysizmi?",
-            },
-            'ru': {
-                'time_missing': "Пожалуйста, укажите время (например: 'завтра 14:00', 'в пятницу')",
-                'short_duration': "Это очень короткое время, хотите увеличить продолжительность?",
-                'long_duration': "Это очень долгое время, хотите сократить продолжительность?",
-                'add_alert': "Хотите добавить напоминание?",
-                'add_repeat': "Хотите добавить повторение?",
-            },
-            'en': {
-                'time_missing': "Please specify time (e.g., 'tomorrow 14:00', 'on Friday')",
-                'short_duration': "This is very short duration, do you want to extend it?",
-                'long_duration': "This is very long duration, do you want to shorten it?",
-                'add_alert': "Do you want to add an alert?",
-                'add_repeat': "Do you want to add repetition?",
-            }
-        }
-        
-        lang_translations = translations.get(language, translations['en'])
-        
+
+        lang_translations = SUGGESTION_TRANSLATIONS.get(language, SUGGESTION_TRANSLATIONS['en'])
+
         # Agar vaqt berilmagan bo'lsa
         if 'time_start' not in extracted_data:
             suggestions.append(lang_translations['time_missing'])
-        
+
         # Agar duration katta bo'lsa
         if 'time_start' in extracted_data and 'time_end' in extracted_data:
             try:
                 start = datetime.fromisoformat(extracted_data['time_start'].replace('Z', '+00:00'))
                 end = datetime.fromisoformat(extracted_data['time_end'].replace('Z', '+00:00'))
                 duration = end - start
-                
+
                 if duration < timedelta(minutes=15):
                     suggestions.append(lang_translations['short_duration'])
                 elif duration > timedelta(days=7):
                     suggestions.append(lang_translations['long_duration'])
             except:
                 pass
-        
+
         # Boshqa takliflar
         if not extracted_data.get('alert'):
             suggestions.append(lang_translations['add_alert'])
-        
+
         if not extracted_data.get('repeat'):
             suggestions.append(lang_translations['add_repeat'])
-        
+
         return suggestions[:3]  # Max 3 ta taklif
 
 
+_parser = None
+_parser_lock = threading.Lock()
+
+
+def get_parser() -> CalendarNLPParser:
+    """
+    Process bo'yicha yagona parser (thread-safe).
+    Parser holatsiz, shuning uchun barcha request va WebSocket ulanishlari bitta nusxadan foydalanadi
+    """
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = CalendarNLPParser(cache=ParseCache.from_settings())
+    return _parser
+
+
+def warm_up() -> CalendarNLPParser:
+    """
+    Parserni ishga tayyorlash: matcher jadvallarini qurish va langdetect profillarini yuklash.
+    Worker birinchi NLP so'rovida cold-start kechikishini to'lamasligi uchun
+    """
+    parser = get_parser()
+    for language in INTENT_KEYWORDS:
+        get_matcher(language)
+    get_matcher(None)
+    # Birinchi langdetect chaqiruvi barcha profillarni yuklaydi
+    parser.language_detector.warm_up()
+    parser.parse('Ertaga soat 10:00 da uchrashuv', language='uz')
+    return parser
+
+
+def warm_up_server():
+    """
+    Server process (runserver / gunicorn - core.wsgi, daphne - core.asgi) ishga tushganda:
+    CALENDAR_NLP_WARMUP yoqilgan bo'lsa warm_up(). Management command, Celery va pool
+    worker lari bu modullarni yuklamaydi
+    """
+    if getattr(settings, 'CALENDAR_NLP_WARMUP', True):
+        return warm_up()
+    return None
+
+
+_pool = None
+_pool_workers = 1
+_pool_lock = threading.Lock()
+
+
+def _init_pool_worker():
+    """Pool worker: Django ni sozlash (spawn rejimida) va parserni tayyorlash"""
+    from django.apps import apps
+    if not apps.ready:
+        import django
+        django.setup()
+    warm_up()
+
+
+def _parse_in_worker(args):
+    prompt, language, user_timezone = args
+    return get_parser().parse(prompt, language, user_timezone)
+
+
+def _pool_context():
+    """
+    Worker lar fork qilinmaydi: web process da thread lar (audit sink, notifications timer,
+    executor lar) ishlaydi, ko'p thread li process ni fork qilish lock larni qulflangan holda
+    nusxalab deadlock ga olib kelishi mumkin. Default - forkserver (bo'lmasa spawn)
+    """
+    method = getattr(settings, 'CALENDAR_NLP_BATCH_START_METHOD', None)
+    if not method:
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+def _get_pool():
+    """Batch parse uchun process pool (bir marta yaratiladi) va worker soni"""
+    global _pool, _pool_workers
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool_workers = getattr(settings, 'CALENDAR_NLP_BATCH_WORKERS', None) or os.cpu_count() or 1
+                _pool = ProcessPoolExecutor(
+                    max_workers=_pool_workers, initializer=_init_pool_worker, mp_context=_pool_context(),
+                )
+    return _pool, _pool_workers
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
 # Django uchun helper funksiyalar
 class CalendarNLPHelper:
     """Django model bilan integratsiya uchun helper"""
-    
+
+    @staticmethod
+    def parse_datetime(value, default_timezone: str = 'Asia/Tashkent'):
+        """ISO string (yoki datetime) dan timezone-aware datetime"""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if value.tzinfo is None:
+            value = pytz.timezone(default_timezone).localize(value)
+        return value
+
+    @staticmethod
+    def parse_alert(alert_str: str):
+        """'10m' -> (10, 'm'); noto'g'ri format uchun None"""
+        match = ALERT_STRING_RE.match(alert_str)
+        if match:
+            return int(match.group(1)), match.group(2)
+        return None
+
     @staticmethod
     def create_draft_from_parse(user, parse_result):
         """Parsed natijadan draft yaratish"""
         from .models import ParsedEventDraft
-        
+
         draft = ParsedEventDraft.objects.create(
             user=user,
             original_text=parse_result['original_prompt'],
@@ -719,24 +914,24 @@ class CalendarNLPHelper:
             expires_at=timezone.now() + timedelta(hours=24)  # 24 soat
         )
         return draft
-    
+
     @staticmethod
     def create_event_from_draft(draft):
         """Draft dan event yaratish"""
         from .models import Event, EventInvite, EventAlert
-        
+
         extracted = draft.extracted_data
-        
+
         # Timezone convert
         tz = pytz.timezone('Asia/Tashkent')
         time_start = datetime.fromisoformat(extracted['time_start'])
         time_end = datetime.fromisoformat(extracted['time_end'])
-        
+
         if time_start.tzinfo is None:
             time_start = tz.localize(time_start)
         if time_end.tzinfo is None:
             time_end = tz.localize(time_end)
-        
+
         # Event yaratish
         event = Event.objects.create(
             user=draft.user,
@@ -748,7 +943,7 @@ class CalendarNLPHelper:
             url=extracted.get('url'),
             note=extracted.get('note'),
         )
-        
+
         # Invites qo'shish
         for email in extracted.get('invite', []):
             EventInvite.objects.create(
@@ -756,23 +951,23 @@ class CalendarNLPHelper:
                 email=email,
                 status='pending'
             )
-        
+
         # Alerts qo'shish
         for alert_str in extracted.get('alert', []):
             # '10m' -> value=10, unit='m'
-            match = re.match(r'(\d+)([mhdw])', alert_str)
+            match = ALERT_STRING_RE.match(alert_str)
             if match:
                 EventAlert.objects.create(
                     event=event,
                     value=int(match.group(1)),
                     unit=match.group(2)
                 )
-        
+
         # Draft ni confirmed qilish
         draft.is_confirmed = True
         draft.confirmed_at = timezone.now()
         draft.save()
-        
+
         return event
 
 
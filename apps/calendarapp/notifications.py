@@ -0,0 +1,169 @@
+import asyncio
+import atexit
+import logging
+import threading
+from datetime import date, datetime
+from uuid import UUID
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    # Shu oraliqdagi (soniya) o'zgarishlar bitta frame ga yig'iladi; 0 - commit dan keyin darhol
+    'WINDOW': 0.25,
+    # Bitta frame dagi o'zgarishlar soni
+    'MAX_BATCH': 500,
+}
+
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'CALENDAR_NOTIFICATIONS', {})}
+
+
+def serialize(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def compact(fields: dict) -> dict:
+    """Faqat oddiy qiymatlar (F() / expression lar tashlab yuboriladi)"""
+    return {
+        name: serialize(value)
+        for name, value in fields.items()
+        if value is None or isinstance(value, (str, int, float, bool, datetime, date, UUID))
+    }
+
+
+def merge(old, new):
+    """Bitta obyektning ketma-ket o'zgarishlarini birlashtirish (None - yuborish shart emas)"""
+    if old is None:
+        return new
+    if new['op'] == DELETED:
+        # Oyna ichida yaratilib o'chirilgan obyekt haqida xabar kerak emas
+        return None if old['op'] == CREATED else new
+    if old['op'] == DELETED:
+        return new
+    return {**old, 'fields': {**old.get('fields', {}), **new.get('fields', {})}}
+
+
+class ChangeBuffer:
+    """
+    O'zgarishlarni user bo'yicha yig'ib, WINDOW ichida har bir user ga bitta
+    `calendar_changes` frame yuborish (bulk action / import - yuzlab publish o'rniga bitta)
+    """
+
+    def __init__(self, window=0.25, max_batch=500):
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        self._tasks = set()
+
+    def add(self, changes):
+        """changes - [(user_id, change)]"""
+        with self._lock:
+            for user_id, change in changes:
+                pending = self._pending.setdefault(user_id, {})
+                key = (change['model'], change['id'])
+                merged = merge(pending.pop(key, None), change)
+                if merged is not None:
+                    pending[key] = merged
+                if change['model'] == 'event' and change['op'] == DELETED:
+                    # O'chirilgan event ning invite / alert lari haqidagi xabarlar endi kerak emas
+                    children = [
+                        child_key for child_key, child in pending.items()
+                        if child.get('fields', {}).get('event_id') == change['id']
+                    ]
+                    for child_key in children:
+                        del pending[child_key]
+            if self.window > 0 and self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if self.window <= 0:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._timer = None
+        if not pending:
+            return
+
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Timer / atexit thread ida event loop yo'q - barcha publish lar bitta loop da
+            asyncio.run(self.publish(channel_layer, pending))
+            return
+        # WINDOW=0 va commit ishlab turgan loop li thread da - publish shu loop ga task
+        task = loop.create_task(self.publish(channel_layer, pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def publish(self, channel_layer, pending):
+        for user_id, changes in pending.items():
+            items = list(changes.values())
+            for index in range(0, len(items), self.max_batch):
+                try:
+                    await channel_layer.group_send(f"user_{user_id}", {
+                        "type": "calendar_changes",
+                        "changes": items[index:index + self.max_batch],
+                    })
+                except Exception:
+                    logger.exception(f"Calendar changes publish failed for user {user_id}")
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer() -> ChangeBuffer:
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                config = get_config()
+                _buffer = ChangeBuffer(window=config['WINDOW'], max_batch=config['MAX_BATCH'])
+                # Process tugashidan oldin (management command, celery) qolganlarini yuborish
+                atexit.register(_buffer.flush)
+    return _buffer
+
+
+def notify(user_id, model: str, op: str, object_id, fields=None):
+    """O'zgarishni tranzaksiya commit bo'lgach buffer ga qo'shish"""
+    notify_many(model, op, [(user_id, object_id)], fields)
+
+
+def notify_many(model: str, op: str, owners, fields=None):
+    """
+    Bir xil o'zgarish ko'p obyekt uchun (queryset.update / bulk_create):
+    owners - [(user_id, object_id)], commit da bitta callback
+    """
+    if not get_config()['ENABLED']:
+        return
+    fields = compact(fields) if fields else None
+    changes = []
+    for user_id, object_id in owners:
+        if user_id is None:
+            continue
+        change = {'model': model, 'op': op, 'id': str(object_id)}
+        if fields:
+            change['fields'] = fields
+        changes.append((user_id, change))
+    if changes:
+        transaction.on_commit(lambda: get_buffer().add(changes))
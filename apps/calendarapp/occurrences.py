@@ -0,0 +1,218 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+from .models import Event, EventAlert, EventException, EventOccurrence
+from .recurrence import Occurrence, RecurrenceExpander, is_recurring
+
+DEFAULTS = {
+    # Takrorlanishlar shuncha kun oldinga materializatsiya qilinadi
+    'HORIZON_DAYS': 365,
+    'BATCH_SIZE': 500,
+}
+
+UPDATE_FIELDS = ['time_start', 'time_end', 'title', 'note']
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'CALENDAR_OCCURRENCES', {})}
+
+
+def horizon_end(now=None):
+    return (now or timezone.now()) + timedelta(days=get_config()['HORIZON_DAYS'])
+
+
+def materialized_until(now=None):
+    """Jadval ishonchli qamrab oladigan chegara (horizon job kuniga bir marta yuradi)"""
+    return horizon_end(now) - timedelta(days=1)
+
+
+def load_exceptions(events) -> dict:
+    """{event_id: {original_start: EventException}}"""
+    exceptions = {}
+    ids = [event.pk for event in events if is_recurring(event)]
+    if ids:
+        for exception in EventException.objects.filter(event_id__in=ids):
+            exceptions.setdefault(exception.event_id, {})[exception.original_start] = exception
+    return exceptions
+
+
+def build_occurrences(event, until, expander, exceptions, since=None, now=None) -> dict:
+    """
+    Event uchun kerakli occurrence qatorlari: {original_start: EventOccurrence}.
+    since berilsa faqat original_start > since bo'lganlari (horizon ni uzaytirish uchun),
+    aks holda now da tugamagan takrorlanishlardan boshlab - o'tganlari qayta ochilmaydi
+    """
+    if event.is_cancelled:
+        return {}
+    if not is_recurring(event):
+        return {event.time_start: EventOccurrence(
+            event=event,
+            user_id=event.user_id,
+            time_start=event.time_start,
+            time_end=event.time_end,
+            original_start=event.time_start,
+        )}
+
+    if since is None:
+        # iter_occurrences o'zi davomiylikni ayiradi: now da davom etayotganlari ham kiradi
+        start = now or timezone.now()
+    else:
+        start = since - (event.time_end - event.time_start)
+    rows = {}
+    for occurrence in expander.iter_occurrences(event, start, until, exceptions):
+        original_start = occurrence.original_start
+        if since is not None and original_start <= since:
+            continue
+        exception = exceptions.get(original_start)
+        rows[original_start] = EventOccurrence(
+            event=event,
+            user_id=event.user_id,
+            time_start=occurrence.time_start,
+            time_end=occurrence.time_end,
+            original_start=original_start,
+            title=exception.title if exception else None,
+            note=exception.note if exception else None,
+        )
+    return rows
+
+
+def sync_occurrences(events, until=None, now=None):
+    """
+    Eventlar uchun occurrence jadvalini diff bo'yicha yangilash:
+    keraksiz qatorlar o'chiriladi, yangilari bulk_create, o'zgarganlari bulk_update.
+    Takrorlanuvchi eventning now gacha tugagan qatorlari tarix sifatida o'zgarmaydi.
+    Oxirida takrorlanuvchi eventlar alertlari keyingi occurrence ga o'tkaziladi
+    """
+    events = list(events)
+    if not events:
+        return
+    now = now or timezone.now()
+    until = until or horizon_end(now)
+    batch_size = get_config()['BATCH_SIZE']
+    expander = RecurrenceExpander.from_settings()
+    exceptions = load_exceptions(events)
+
+    existing = {}
+    for row in EventOccurrence.objects.filter(event__in=events):
+        existing.setdefault(row.event_id, {})[row.original_start] = row
+
+    to_create, to_update, to_delete = [], [], []
+    for event in events:
+        desired = build_occurrences(event, until, expander, exceptions.get(event.pk, {}), now=now)
+        current = existing.get(event.pk, {})
+        keep_history = is_recurring(event) and not event.is_cancelled
+
+        for original_start, row in current.items():
+            if original_start not in desired and not (keep_history and row.time_end <= now):
+                to_delete.append(row.pk)
+
+        for original_start, row in desired.items():
+            old = current.get(original_start)
+            if old is None:
+                to_create.append(row)
+            elif any(getattr(old, field) != getattr(row, field) for field in UPDATE_FIELDS):
+                for field in UPDATE_FIELDS:
+                    setattr(old, field, getattr(row, field))
+                to_update.append(old)
+
+    with transaction.atomic():
+        if to_delete:
+            EventOccurrence.objects.filter(pk__in=to_delete).delete()
+        EventOccurrence.objects.bulk_create(to_create, batch_size=batch_size)
+        EventOccurrence.objects.bulk_update(to_update, UPDATE_FIELDS, batch_size=batch_size)
+        series = [event for event in events if is_recurring(event)]
+        if series:
+            EventAlert.objects.filter(event__in=series).sync_fire_at(now)
+
+
+def next_fire_at(alerts, after) -> dict:
+    """
+    Takrorlanuvchi event alertlari uchun {alert_id: fire_at}: vaqti after dan keyingi birinchi
+    occurrence bo'yicha (horizon ichida bo'lmasa None). Har bir offset uchun bitta so'rov
+    """
+    by_offset = defaultdict(list)
+    for alert in alerts:
+        by_offset[alert.offset_seconds].append(alert)
+
+    fire_times = {}
+    for offset, group in by_offset.items():
+        offset = timedelta(seconds=offset)
+        starts = dict(
+            EventOccurrence.objects
+            .filter(event_id__in={alert.event_id for alert in group}, time_start__gt=after + offset)
+            .order_by()
+            .values('event_id')
+            .annotate(next_start=Min('time_start'))
+            .values_list('event_id', 'next_start')
+        )
+        for alert in group:
+            start = starts.get(alert.event_id)
+            fire_times[alert.pk] = start - offset if start else None
+    return fire_times
+
+
+def refresh_horizon(now=None) -> dict:
+    """
+    Rolling horizon: takrorlanuvchi eventlarni yangi horizon gacha uzaytirish.
+    Hali qatori yo'q eventlar (masalan eski ma'lumotlar) to'liq sync qilinadi
+    """
+    until = horizon_end(now)
+    batch_size = get_config()['BATCH_SIZE']
+    expander = RecurrenceExpander.from_settings()
+    stats = {'events': 0, 'created': 0, 'synced': 0}
+
+    # Yozish paytida o'qilayotgan to'plam o'zgarmasligi uchun avval id lar olinadi
+    missing = list(Event.objects.active().filter(occurrences__isnull=True).values_list('pk', flat=True))
+    for ids in _batches(missing, batch_size):
+        sync_occurrences(Event.objects.filter(pk__in=ids), until)
+        stats['synced'] += len(ids)
+
+    series = list(
+        Event.objects.active().recurring()
+        .annotate(last_start=Max('occurrences__original_start'))
+        .filter(last_start__isnull=False)
+        .values_list('pk', flat=True)
+    )
+    for ids in _batches(series, batch_size):
+        batch = list(
+            Event.objects.filter(pk__in=ids).annotate(last_start=Max('occurrences__original_start'))
+        )
+        exceptions = load_exceptions(batch)
+        rows = []
+        for event in batch:
+            rows.extend(build_occurrences(
+                event, until, expander, exceptions.get(event.pk, {}), since=event.last_start,
+            ).values())
+        EventOccurrence.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+        stats['events'] += len(batch)
+        stats['created'] += len(rows)
+
+    # Oldingi horizon da keyingi occurrence topilmagan alertlar
+    stats['rearmed'] = EventAlert.objects.pending().recurring().filter(fire_at__isnull=True).sync_fire_at(now)
+    return stats
+
+
+def to_occurrence(row) -> Occurrence:
+    """EventOccurrence qatorini API uchun Occurrence ga aylantirish"""
+    return Occurrence(
+        row.event,
+        row.time_start,
+        row.time_end,
+        original_start=row.original_start if is_recurring(row.event) else None,
+        title=row.title,
+        note=row.note,
+    )
+
+
+def _batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
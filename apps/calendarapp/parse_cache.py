@@ -0,0 +1,112 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+DEFAULTS = {
+    'ENABLED': True,
+    'MAX_SIZE': 2048,
+    # Yozuv umri (soniya)
+    'TTL': 300,
+    # "now" bucket: nisbiy sanalar (ertaga, bugun) shu oraliqda bir xil natija beradi
+    'BUCKET_SECONDS': 60,
+    # Umumiy Django cache alias (masalan 'default'); None - faqat process ichida
+    'BACKEND': None,
+}
+
+
+class ParseCache:
+    """
+    parse() natijalari uchun kesh: process ichidagi LRU + TTL
+    va ixtiyoriy umumiy Django cache backend.
+    Kalit: normallashtirilgan prompt, til, timezone va "now" bucket
+    """
+
+    key_prefix = 'nlp:parse:'
+
+    def __init__(self, max_size=2048, ttl=300, bucket_seconds=60, backend=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.bucket_seconds = bucket_seconds
+        self.backend = backend
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = Counter()
+
+    @classmethod
+    def from_settings(cls):
+        """CALENDAR_NLP_PARSE_CACHE sozlamasidan kesh (o'chirilgan bo'lsa None)"""
+        config = {**DEFAULTS, **getattr(settings, 'CALENDAR_NLP_PARSE_CACHE', {})}
+        if not config['ENABLED']:
+            return None
+        return cls(
+            max_size=config['MAX_SIZE'],
+            ttl=config['TTL'],
+            bucket_seconds=config['BUCKET_SECONDS'],
+            backend=caches[config['BACKEND']] if config['BACKEND'] else None,
+        )
+
+    @staticmethod
+    def normalize(prompt: str) -> str:
+        # Sarlavha va note katta-kichik harfni saqlaydi, shuning uchun faqat chetlar kesiladi
+        return prompt.strip()
+
+    def make_key(self, prompt: str, language: str, user_timezone: str) -> str:
+        bucket = int(timezone.now().timestamp() // self.bucket_seconds)
+        raw = '\x1f'.join([self.normalize(prompt), language or 'auto', user_timezone or '', str(bucket)])
+        return self.key_prefix + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._local.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return copy.deepcopy(value)
+                del self._local[key]
+
+        if self.backend is not None:
+            value = self.backend.get(key)
+            if value is not None:
+                self._store_local(key, value)
+                with self._lock:
+                    self._stats['hits'] += 1
+                    self._stats['shared_hits'] += 1
+                return copy.deepcopy(value)
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def set(self, key: str, value: dict):
+        value = copy.deepcopy(value)
+        self._store_local(key, value)
+        if self.backend is not None:
+            self.backend.set(key, value, timeout=self.ttl)
+
+    def _store_local(self, key, value):
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.ttl, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_size:
+                self._local.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {'hits': 0, 'misses': 0, 'shared_hits': 0, **self._stats}
+            stats['size'] = len(self._local)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+            self._stats.clear()
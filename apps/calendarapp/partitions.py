@@ -0,0 +1,154 @@
+import gzip
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from django.db import connection, transaction
+from .audit import get_config
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+PARENT = AuditLog._meta.db_table
+DEFAULT_PARTITION = f"{PARENT}_default"
+PARTITION_RE = re.compile(rf"^{PARENT}_p(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(value) -> datetime:
+    value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(value, months) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month) -> str:
+    return f"{PARENT}_p{month:%Y_%m}"
+
+
+def is_partitioned() -> bool:
+    """Faqat PostgreSQL da va migration 0011 dan keyin"""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [PARENT])
+        return cursor.fetchone() is not None
+
+
+def list_partitions() -> dict:
+    """Ulangan oylik partitionlar: {month: name}"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = %s::regclass",
+            [PARENT],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    return _by_month(names)
+
+
+def list_detached() -> dict:
+    """Uzilgan, lekin hali arxivlanmagan partitionlar (oldingi archive yarim qolgan bo'lsa)"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relname FROM pg_class WHERE relkind = 'r' AND relname LIKE %s AND NOT relispartition",
+            [f"{PARENT}_p%"],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    return _by_month(names)
+
+
+def _by_month(names) -> dict:
+    partitions = {}
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            partitions[datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)] = name
+    return partitions
+
+
+def create_partition(month) -> str:
+    """
+    Oylik partition yaratish. DEFAULT partition ga tushib qolgan shu oy qatorlari
+    yangi jadvalga ko'chiriladi, keyin u ATTACH qilinadi
+    """
+    name = partition_name(month)
+    start, end = f"'{month.isoformat()}'", f"'{add_months(month, 1).isoformat()}'"
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE created_at >= {start} AND created_at < {end} RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        )
+        cursor.execute(f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ({start}) TO ({end})")
+    return name
+
+
+def ensure_partitions(ahead=None, now=None) -> list:
+    """Joriy oy va keyingi `ahead` oy uchun partitionlar"""
+    ahead = get_config()['PARTITION_AHEAD_MONTHS'] if ahead is None else ahead
+    current = month_start(now or datetime.now(timezone.utc))
+    existing = list_partitions()
+    created = []
+    for offset in range(ahead + 1):
+        month = add_months(current, offset)
+        if month not in existing:
+            created.append(create_partition(month))
+    return created
+
+
+def archive_partition(name, archive_dir) -> Path:
+    """
+    Partition ni uzish, qatorlarini {archive_dir}/{name}.jsonl.gz ga yozish va jadvalni o'chirish.
+    Fayl to'liq yozilmaguncha jadval o'chirilmaydi
+    """
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{name}.jsonl.gz"
+    partial = path.with_suffix('.gz.partial')
+
+    if name in list_partitions().values():
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {PARENT} DETACH PARTITION {name}")
+
+    rows = 0
+    with transaction.atomic():
+        # Server-side cursor - butun oy xotiraga yuklanmaydi
+        cursor = connection.chunked_cursor()
+        try:
+            cursor.execute(f"SELECT row_to_json(t)::text FROM {name} t ORDER BY created_at")
+            with open(partial, 'wb') as raw:
+                with gzip.open(raw, 'wt', encoding='utf-8') as archive:
+                    while batch := cursor.fetchmany(2000):
+                        archive.writelines(f"{line}\n" for (line,) in batch)
+                        rows += len(batch)
+                raw.flush()
+                os.fsync(raw.fileno())
+        finally:
+            cursor.close()
+    os.replace(partial, path)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE {name}")
+    logger.info(f"Audit partition archived: {name} ({rows} rows) -> {path}")
+    return path
+
+
+def apply_retention(retention_months=None, archive_dir=None, now=None, dry_run=False) -> list:
+    """RETENTION_MONTHS dan eski partitionlarni arxivlash (joriy oy hisobga kirmaydi)"""
+    config = get_config()
+    retention_months = config['RETENTION_MONTHS'] if retention_months is None else retention_months
+    archive_dir = archive_dir or config['ARCHIVE_DIR']
+    cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -retention_months)
+
+    expired = {**list_partitions(), **list_detached()}
+    names = [name for month, name in sorted(expired.items()) if month < cutoff]
+    if not dry_run:
+        for name in names:
+            archive_partition(name, archive_dir)
+    return names
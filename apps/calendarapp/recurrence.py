@@ -0,0 +1,232 @@
+import hashlib
+import heapq
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from dateutil.rrule import rrulestr
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Q
+
+DEFAULTS = {
+    # Kesh bo'lagi (chunk) uzunligi - kunlarda
+    'CHUNK_DAYS': 31,
+    'CACHE_TTL': 60 * 60 * 24,
+    # CACHES alias; None - kesh ishlatilmaydi
+    'CACHE_ALIAS': 'default',
+}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'CALENDAR_RECURRENCE', {})}
+
+
+def is_recurring(event) -> bool:
+    return bool(event.repeat and event.repeat.strip())
+
+
+def _zone(tzname):
+    try:
+        return ZoneInfo(tzname)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _build_rule(repeat: str, dtstart: datetime, tzname: str):
+    """
+    RRULE (+ EXDATE/RDATE) satridan rruleset.
+    Event timezone idagi dtstart bilan - DST da soat o'zgarmaydi.
+    Noto'g'ri qoida bo'lsa None
+    """
+    zone = _zone(tzname)
+    if zone is not None:
+        dtstart = dtstart.astimezone(zone)
+    try:
+        return rrulestr(repeat.strip(), dtstart=dtstart, forceset=True, cache=True)
+    except (ValueError, TypeError, IndexError):
+        return None
+
+
+def get_rule(event):
+    if not is_recurring(event):
+        return None
+    return _build_rule(event.repeat, event.time_start, event.timezone)
+
+
+class Occurrence:
+    """
+    Eventning bitta takrorlanishi.
+    time_start / time_end (va override qilingan title / note) dan boshqa atributlar event dan olinadi
+    """
+
+    def __init__(self, event, time_start, time_end, original_start=None, title=None, note=None):
+        self.event = event
+        self.time_start = time_start
+        self.time_end = time_end
+        self.original_start = original_start
+        self.title = title if title is not None else event.title
+        self.note = note if note is not None else event.note
+
+    def __getattr__(self, name):
+        return getattr(self.__dict__['event'], name)
+
+    @property
+    def sort_key(self):
+        return self.time_start, str(self.event.id)
+
+    def __repr__(self):
+        return f"<Occurrence {self.event.id} {self.time_start.isoformat()}>"
+
+
+class RecurrenceExpander:
+    """
+    RRULE larni so'ralgan oraliq bo'yicha lazy ochish.
+    Qoida natijalari chunk (CHUNK_DAYS) larga bo'linib Django cache da saqlanadi;
+    kalit (repeat, time_start, timezone) dan hosil bo'ladi, shuning uchun event
+    o'zgarganda eski chunklar avtomatik ishlatilmay qoladi
+    """
+
+    key_prefix = 'recurrence:'
+
+    def __init__(self, chunk_days=31, ttl=60 * 60 * 24, cache=None):
+        self.chunk = timedelta(days=chunk_days)
+        self.ttl = ttl
+        self.cache = cache
+
+    @classmethod
+    def from_settings(cls):
+        config = get_config()
+        return cls(
+            chunk_days=config['CHUNK_DAYS'],
+            ttl=config['CACHE_TTL'],
+            cache=caches[config['CACHE_ALIAS']] if config['CACHE_ALIAS'] else None,
+        )
+
+    def rule_key(self, event) -> str:
+        raw = '\x1f'.join([event.repeat.strip(), event.time_start.isoformat(), event.timezone or ''])
+        return self.key_prefix + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def chunk_index(self, value: datetime) -> int:
+        return (value - EPOCH) // self.chunk
+
+    def chunk_starts(self, event, rule, index: int) -> list:
+        """index-chunk ichidagi RRULE boshlanish vaqtlari (keshdan yoki hisoblab)"""
+        key = f'{self.rule_key(event)}:{index}'
+        if self.cache is not None:
+            starts = self.cache.get(key)
+            if starts is not None:
+                return starts
+
+        chunk_start = EPOCH + self.chunk * index
+        chunk_end = chunk_start + self.chunk
+        starts = [value for value in rule.between(chunk_start, chunk_end, inc=True) if value < chunk_end]
+        if self.cache is not None:
+            self.cache.set(key, starts, timeout=self.ttl)
+        return starts
+
+    def iter_starts(self, event, rule, lower: datetime, upper: datetime):
+        """lower <= start < upper bo'lgan RRULE boshlanishlari (streaming)"""
+        lower = max(lower, event.time_start)
+        index = self.chunk_index(lower)
+        last = self.chunk_index(upper)
+        while index <= last:
+            for start in self.chunk_starts(event, rule, index):
+                if start < lower:
+                    continue
+                if start >= upper:
+                    return
+                yield start
+            index += 1
+
+    def iter_occurrences(self, event, start: datetime, end: datetime, exceptions=None, after=None):
+        """
+        [start, end) bilan kesishadigan takrorlanishlar, time_start bo'yicha tartiblangan.
+        exceptions - {original_start: EventException}; after - (time_start, id) cursor
+        """
+        exceptions = exceptions or {}
+        rule = get_rule(event)
+        if rule is None:
+            occurrences = iter([Occurrence(event, event.time_start, event.time_end)])
+            overrides = iter(())
+        else:
+            duration = event.time_end - event.time_start
+            lower = start - duration
+            if after is not None:
+                lower = max(lower, after[0])
+            occurrences = self._iter_rule(event, rule, lower, end, duration, exceptions)
+            overrides = iter(sorted(
+                (
+                    Occurrence(
+                        event,
+                        exception.time_start or exception.original_start,
+                        exception.time_end or (exception.time_start or exception.original_start) + duration,
+                        original_start=exception.original_start,
+                        title=exception.title or None,
+                        note=exception.note,
+                    )
+                    for exception in exceptions.values()
+                    if not exception.is_cancelled
+                ),
+                key=lambda occurrence: occurrence.sort_key,
+            ))
+
+        for occurrence in heapq.merge(occurrences, overrides, key=lambda occurrence: occurrence.sort_key):
+            if occurrence.time_start >= end:
+                return
+            if occurrence.time_end <= start:
+                continue
+            if after is not None and occurrence.sort_key <= after:
+                continue
+            yield occurrence
+
+    def _iter_rule(self, event, rule, lower, upper, duration, exceptions):
+        for original_start in self.iter_starts(event, rule, lower, upper):
+            if original_start in exceptions:
+                # Bekor qilingan yoki override orqali alohida beriladi
+                continue
+            yield Occurrence(event, original_start, original_start + duration, original_start=original_start)
+
+    def expand(self, queryset, start: datetime, end: datetime, after=None, limit=None):
+        """
+        Oddiy va takrorlanuvchi eventlarni bitta tartiblangan oqimga birlashtirish (heapq.merge).
+        Oddiy eventlar DB dan keyset bo'yicha (limit bilan), RRULE lar lazy ochiladi
+        """
+        singles = queryset.filter(Q(repeat__isnull=True) | Q(repeat='')).overlapping(start, end)
+        if after is not None:
+            singles = singles.filter(
+                Q(time_start__gt=after[0]) | Q(time_start=after[0], id__gt=after[1])
+            )
+        singles = singles.order_by('time_start', 'id')
+        if limit is not None:
+            singles = singles[:limit]
+
+        series = list(
+            queryset.exclude(repeat__isnull=True).exclude(repeat='').filter(time_start__lt=end)
+        )
+        exceptions = self.load_exceptions(series, start, end)
+
+        streams = [(Occurrence(event, event.time_start, event.time_end) for event in singles.iterator())]
+        streams.extend(
+            self.iter_occurrences(event, start, end, exceptions.get(event.id), after=after)
+            for event in series
+        )
+        return heapq.merge(*streams, key=lambda occurrence: occurrence.sort_key)
+
+    def load_exceptions(self, series, start, end) -> dict:
+        """{event_id: {original_start: EventException}} - oraliqqa tegishli istisnolar, bitta so'rovda"""
+        from .models import EventException
+
+        if not series:
+            return {}
+        longest = max(event.time_end - event.time_start for event in series)
+        rows = EventException.objects.filter(event__in=series).filter(
+            Q(original_start__gte=start - longest, original_start__lt=end)
+            | Q(time_start__gte=start - longest, time_start__lt=end)
+        )
+        exceptions = {}
+        for exception in rows:
+            exceptions.setdefault(exception.event_id, {})[exception.original_start] = exception
+        return exceptions
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.core import signing
+from django.db.models import Count
+from django.urls import reverse
+from django.utils.html import format_html
+from .models import EventInvite
+from .notifications import UPDATED, get_config as get_notify_config, notify
+
+DEFAULTS = {
+    # RSVP link amal qilish muddati (soniya)
+    'MAX_AGE': 60 * 60 * 24 * 90,
+    # Bitta UPDATE ... WHERE id IN (...) dagi id lar
+    'BATCH_SIZE': 500,
+    # Bulk RSVP so'rovidagi elementlar chegarasi
+    'MAX_ITEMS': 5000,
+}
+
+SALT = 'calendarapp.rsvp'
+# Taklif qilingan odam tanlay oladigan javoblar (pending ni faqat organizer qaytaradi)
+RESPONSES = ('accepted', 'declined')
+STATUSES = ('pending', 'accepted', 'declined')
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'CALENDAR_RSVP', {})}
+
+
+def make_token(invite) -> str:
+    """Invite, event va organizer id lari imzolangan - tekshiruvgacha DB ga murojaat kerak emas"""
+    return signing.dumps([str(invite.pk), str(invite.event_id), invite.event.user_id], salt=SALT, compress=True)
+
+
+def read_token(token, max_age=None):
+    """(invite_id, event_id, owner_id); noto'g'ri / eskirgan token da signing.BadSignature"""
+    max_age = get_config()['MAX_AGE'] if max_age is None else max_age
+    payload = signing.loads(token, salt=SALT, max_age=max_age)
+    if not isinstance(payload, list) or len(payload) != 3:
+        raise signing.BadSignature('Malformed RSVP token')
+    return tuple(payload)
+
+
+def rsvp_url(token, status, site_url='') -> str:
+    return f"{site_url}{reverse('invite-rsvp', args=[token])}?status={status}"
+
+
+def response_buttons(invite, site_url='') -> str:
+    """Taklif emailidagi javob tugmalari"""
+    token = make_token(invite)
+    return format_html(
+        '<a href="{}" class="button" style="background: #10B981;">✅ Qatnashaman</a>'
+        '<a href="{}" class="button" style="background: #EF4444;">❌ Qatnasha olmayman</a>',
+        rsvp_url(token, 'accepted', site_url),
+        rsvp_url(token, 'declined', site_url),
+    )
+
+
+def set_statuses(event_id, changes: dict) -> int:
+    """
+    changes - {status: [invite_id, ...]}. Har bir status uchun BATCH_SIZE lik
+    UPDATE ... WHERE event_id = ... AND id IN (...) - har bir invite ni saqlash o'rniga
+    """
+    batch_size = get_config()['BATCH_SIZE']
+    updated = 0
+    for status, invite_ids in changes.items():
+        invite_ids = list(invite_ids)
+        for index in range(0, len(invite_ids), batch_size):
+            updated += (
+                EventInvite.objects
+                .filter(event_id=event_id, pk__in=invite_ids[index:index + batch_size])
+                .set_status(status)
+            )
+    return updated
+
+
+def invite_counts(event_id) -> dict:
+    counts = dict.fromkeys(STATUSES, 0)
+    rows = EventInvite.objects.filter(event_id=event_id).order_by().values_list('status').annotate(total=Count('pk'))
+    counts.update({status: total for status, total in rows})
+    return counts
+
+
+def push_counts(owner_id, event_id, counts=None):
+    """
+    Organizer ning WebSocket group iga event bo'yicha yig'ma javoblar (calendar_changes orqali,
+    oyna ichidagi ketma-ket RSVP lar bitta frame ga birlashadi)
+    """
+    if not get_notify_config()['ENABLED']:
+        return
+    notify(owner_id, 'event_invites', UPDATED, event_id, counts or invite_counts(event_id))
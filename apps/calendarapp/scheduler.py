@@ -0,0 +1,203 @@
+import logging
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from .models import EventAlert
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # Wheel qadami (soniya)
+    'RESOLUTION': 1,
+    # Har bir darajadagi slotlar: 60 x 1s, 60 x 1m, 24 x 1h
+    'SLOTS': (60, 60, 24),
+    # DB dan shuncha soniya oldinga yuklanadi
+    'LOOKAHEAD': 60 * 60,
+    # DB dan qayta to'ldirish oralig'i (soniya)
+    'REFILL_INTERVAL': 30,
+    # Bitta Celery task dagi alertlar soni
+    'BATCH_SIZE': 200,
+    # Shundan ko'proq kechikkan alertlar yuborilmaydi (soniya) - masalan dispatcher uzoq to'xtab qolganda
+    'MAX_LATENESS': 15 * 60,
+}
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'CALENDAR_ALERTS', {})}
+
+
+class TimingWheel:
+    """
+    Ierarxik timing wheel: add / cancel O(1), har bir qadamda faqat joriy slot ko'riladi.
+    Yuqori darajadagi slot navbati kelganda elementlari pastki darajaga tushiriladi (cascade),
+    wheel sig'imidan uzoqdagi elementlar overflow da turadi
+    """
+
+    def __init__(self, resolution=1, slots=(60, 60, 24), now=None):
+        self.resolution = resolution
+        self.slots = tuple(slots)
+        # Har bir darajadagi bitta slot necha qadam ekanligi: 1, 60, 3600 ...
+        self.spans = []
+        span = 1
+        for size in self.slots:
+            self.spans.append(span)
+            span *= size
+        self.capacity = span
+        self.levels = [[{} for _ in range(size)] for size in self.slots]
+        self.overflow = {}
+        self.entries = {}
+        self.current = self.to_tick(now if now is not None else time.time())
+
+    def to_tick(self, timestamp: float) -> int:
+        return int(timestamp // self.resolution)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def add(self, key, timestamp: float):
+        """Element qo'shish yoki vaqtini almashtirish"""
+        if key in self.entries:
+            self.cancel(key)
+        self._place(key, max(self.to_tick(timestamp), self.current))
+
+    def cancel(self, key):
+        location = self.entries.pop(key, None)
+        if location is not None:
+            location.pop(key, None)
+
+    def _place(self, key, expiry: int):
+        delta = expiry - self.current
+        for level, size in enumerate(self.slots):
+            span = self.spans[level]
+            if delta < span * size:
+                bucket = self.levels[level][(expiry // span) % size]
+                break
+        else:
+            bucket = self.overflow
+        bucket[key] = expiry
+        self.entries[key] = bucket
+
+    def advance(self, timestamp: float) -> list:
+        """Vaqtni oldinga surish va muddati kelgan kalitlarni qaytarish"""
+        target = self.to_tick(timestamp)
+        due = []
+        # Joriy qadamga qo'shilgan (muddati o'tgan) elementlar
+        due.extend(self._pop(self.levels[0][self.current % self.slots[0]]))
+        while self.current < target:
+            self.current += 1
+            self._cascade()
+            due.extend(self._pop(self.levels[0][self.current % self.slots[0]]))
+        return due
+
+    def _cascade(self):
+        for level in range(len(self.slots) - 1, 0, -1):
+            span = self.spans[level]
+            if self.current % span == 0:
+                self._reinsert(self.levels[level][(self.current // span) % self.slots[level]])
+        if self.current % self.capacity == 0 and self.overflow:
+            self._reinsert(self.overflow)
+
+    def _reinsert(self, bucket):
+        items = list(bucket.items())
+        bucket.clear()
+        for key, expiry in items:
+            self._place(key, expiry)
+
+    def _pop(self, bucket) -> list:
+        due = [key for key, expiry in bucket.items() if expiry <= self.current]
+        for key in due:
+            del bucket[key]
+            del self.entries[key]
+        return due
+
+
+class AlertDispatcher:
+    """
+    Yaqin LOOKAHEAD ichidagi yuborilmagan alertlarni timing wheel ga yuklaydi,
+    DB dan inkremental to'ldiradi va vaqti kelganlarini batch qilib Celery ga beradi.
+    Takroriy yuborishdan himoya dispatch_alerts task idagi claim bosqichida
+    """
+
+    def __init__(self, resolution=1, slots=(60, 60, 24), lookahead=3600, refill_interval=30, batch_size=200,
+                 max_lateness=900):
+        self.wheel = TimingWheel(resolution=resolution, slots=slots)
+        self.lookahead = timedelta(seconds=lookahead)
+        self.max_lateness = timedelta(seconds=max_lateness)
+        self.refill_interval = refill_interval
+        self.batch_size = batch_size
+        self.loaded_until = None
+        self.refilled_at = None
+        self._refill_clock = 0.0
+
+    @classmethod
+    def from_settings(cls, **overrides):
+        config = get_config()
+        return cls(
+            resolution=overrides.get('resolution') or config['RESOLUTION'],
+            slots=config['SLOTS'],
+            lookahead=overrides.get('lookahead') or config['LOOKAHEAD'],
+            refill_interval=overrides.get('refill_interval') or config['REFILL_INTERVAL'],
+            batch_size=overrides.get('batch_size') or config['BATCH_SIZE'],
+            max_lateness=config['MAX_LATENESS'],
+        )
+
+    def refill(self, now=None) -> int:
+        """
+        Yangi oynadagi (loaded_until, now + lookahead] alertlar va oxirgi refill dan beri
+        o'zgarganlari. Birinchi marta - MAX_LATENESS ichida kechikkan yuborilmaganlari ham,
+        undan eskilari yuborilmasdan o'tkazib yuboriladi
+        """
+        now = now or timezone.now()
+        until = now + self.lookahead
+        skipped = EventAlert.objects.stale(now - self.max_lateness).mark_skipped()
+        if skipped:
+            logger.warning(f"Skipped {skipped} alerts older than {self.max_lateness}")
+        count = 0
+        window = EventAlert.objects.due(until, after=self.loaded_until)
+        for alert_id, fire_at in window.values_list('id', 'fire_at').iterator(chunk_size=2000):
+            self.wheel.add(alert_id, fire_at.timestamp())
+            count += 1
+
+        if self.loaded_until is not None:
+            # O'zgarganlar: vaqti oyna tashqarisiga chiqqan yoki eventi bekor qilinganlari wheel dan olinadi
+            changed = EventAlert.objects.filter(is_sent=False, updated_at__gte=self.refilled_at)
+            rows = changed.values_list('id', 'fire_at', 'event__is_cancelled').iterator(chunk_size=2000)
+            for alert_id, fire_at, is_cancelled in rows:
+                if is_cancelled or fire_at is None or fire_at > until:
+                    self.wheel.cancel(alert_id)
+                else:
+                    self.wheel.add(alert_id, fire_at.timestamp())
+                    count += 1
+
+        self.loaded_until = until
+        self.refilled_at = now
+        return count
+
+    def tick(self, now=None) -> list:
+        """Vaqti kelgan alertlarni batch larga bo'lib yuborish"""
+        from .tasks import dispatch_alerts
+
+        now = now or timezone.now()
+        if self.loaded_until is None or time.monotonic() - self._refill_clock >= self.refill_interval:
+            loaded = self.refill(now)
+            self._refill_clock = time.monotonic()
+            if loaded:
+                logger.debug(f"Alert wheel refilled: {loaded} alerts, {len(self.wheel)} pending")
+
+        due = self.wheel.advance(now.timestamp())
+        batches = [due[index:index + self.batch_size] for index in range(0, len(due), self.batch_size)]
+        for batch in batches:
+            dispatch_alerts.delay([str(alert_id) for alert_id in batch])
+        return due
+
+    def run_forever(self):
+        logger.info(f"Alert dispatcher started (lookahead={self.lookahead}, resolution={self.wheel.resolution}s)")
+        while True:
+            due = self.tick()
+            if due:
+                logger.info(f"Dispatched {len(due)} alerts")
+            time.sleep(self.wheel.resolution)
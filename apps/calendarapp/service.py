@@ -0,0 +1,352 @@
+import logging
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from .models import UserRequest, Event, EventInvite, EventAlert, AuditLog, ParsedEventDraft
+from . import audit
+from . import invites as invite_emails
+from .nlp_parser import CalendarNLPHelper
+from .notifications import CREATED, notify_many
+from .occurrences import sync_occurrences
+
+logger = logging.getLogger(__name__)
+
+# Shundan past ishonchlilikdagi natijalar bo'yicha event yaratilmaydi
+MIN_CONFIDENCE = 0.7
+# Tasdiqlanmagan draft shuncha vaqtdan keyin eskiradi
+DRAFT_TTL = timedelta(minutes=10)
+# Draft orqali bajariladigan intentlar
+ACTIONABLE_INTENTS = ('CREATE', 'UPDATE', 'CANCEL', 'DELETE')
+
+
+def build_event(user, extracted_data: dict) -> Event:
+    """Parser natijasidan (saqlanmagan) Event obyekti"""
+    event = Event(
+        user=user,
+        title=(extracted_data.get('title') or 'No Title')[:255],
+        all_day=extracted_data.get('all_day', False),
+        time_start=CalendarNLPHelper.parse_datetime(extracted_data.get('time_start')),
+        time_end=CalendarNLPHelper.parse_datetime(extracted_data.get('time_end')),
+        repeat=extracted_data.get('repeat'),
+        url=extracted_data.get('url'),
+        note=extracted_data.get('note', ''),
+    )
+    event.apply_all_day()
+    return event
+
+
+def build_invites(event: Event, emails) -> list:
+    """Takrorlanmaydigan emaillar bo'yicha EventInvite lar"""
+    seen = set()
+    invites = []
+    for email in emails or []:
+        key = email.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        invites.append(EventInvite(event=event, email=email, status='pending'))
+    return invites
+
+
+def build_alerts(event: Event, alert_strings) -> list:
+    """'10m', '1h' ko'rinishidagi alertlardan EventAlert lar"""
+    alerts = []
+    for alert_str in alert_strings or []:
+        parsed = CalendarNLPHelper.parse_alert(alert_str)
+        if parsed:
+            value, unit = parsed
+            alert = EventAlert(event=event, value=value, unit=unit)
+            # bulk_create save() ni chaqirmaydi
+            alert.fire_at = alert.compute_fire_at()
+            alerts.append(alert)
+    return alerts
+
+
+def bulk_create_user_requests(user, texts, parse_results) -> list:
+    """
+    Bulk import: barcha UserRequest, Event, EventInvite va EventAlert
+    qatorlarini bitta tranzaksiyada bulk_create orqali saqlash (AuditLog - audit sink orqali).
+    Faqat CREATE intent event yaratadi, qolganlari so'rov sifatida saqlanib 'skipped' bo'ladi.
+    Har bir element bo'yicha natija ro'yxatini qaytaradi
+    """
+    requests, events, invites, alerts, logs = [], [], [], [], []
+    results = []
+
+    for index, (text, parsed) in enumerate(zip(texts, parse_results)):
+        user_request = UserRequest(user=user, text=text)
+        requests.append(user_request)
+        logs.append(AuditLog(
+            user=user,
+            action='create',
+            model_name='UserRequest',
+            object_id=user_request.id,
+            changes={'text': text},
+        ))
+
+        intent = parsed.get('intent', 'UNKNOWN')
+        confidence = parsed.get('confidence', 0.0)
+        item = {
+            'index': index,
+            'request_id': str(user_request.id),
+            'intent': intent,
+            'language': parsed.get('language'),
+            'confidence': confidence,
+            'event_id': None,
+        }
+
+        if parsed.get('error'):
+            item.update(status='error', error=parsed['error'])
+        elif intent == 'CREATE' and confidence >= MIN_CONFIDENCE:
+            extracted_data = parsed.get('extracted_data', {})
+            try:
+                event = build_event(user, extracted_data)
+            except (TypeError, ValueError) as exc:
+                item.update(status='error', error=str(exc))
+            else:
+                events.append(event)
+                invites.extend(build_invites(event, extracted_data.get('invite')))
+                alerts.extend(build_alerts(event, extracted_data.get('alert')))
+                logs.append(AuditLog(
+                    user=user,
+                    event=event,
+                    action='create',
+                    model_name='Event',
+                    object_id=event.id,
+                    changes=extracted_data,
+                ))
+                item.update(status='created', event_id=str(event.id))
+        else:
+            item['status'] = 'skipped'
+
+        user_request.result = item
+        results.append(item)
+
+    with transaction.atomic():
+        UserRequest.objects.bulk_create(requests)
+        Event.objects.bulk_create(events)
+        EventInvite.objects.bulk_create(invites)
+        EventAlert.objects.bulk_create(alerts)
+        # bulk_create signal yubormaydi; takrorlanuvchi eventlar alertlari ham shu yerda yangilanadi
+        sync_occurrences(events)
+        invite_emails.schedule({invite.event_id for invite in invites})
+        audit.record(logs)
+        notify_many('event', CREATED, [(event.user_id, event.pk) for event in events])
+
+    return results
+
+
+def find_target_event(user, title: str, near=None, lock=False):
+    """
+    UPDATE / DELETE uchun sarlavha bo'yicha eng mos va vaqti yaqin event.
+    lock=True - tanlangan qator tranzaksiya oxirigacha qulflanadi va qayta o'qiladi,
+    parallel UPDATE lar bir-birining o'zgarishini yozib yubormaydi
+    """
+    event = Event.objects.for_user(user).best_match(title, near=near)
+    if event is not None and lock:
+        event = Event.objects.select_for_update(of=('self',)).filter(pk=event.pk).first()
+    return event
+
+
+def request_audit_log(user_request: UserRequest) -> AuditLog:
+    return AuditLog(
+        user=user_request.user,
+        action='create',
+        model_name='UserRequest',
+        object_id=user_request.id,
+        changes={'text': user_request.text},
+    )
+
+
+def apply_parse_result(user, parsed: dict, audit_logs: list) -> dict:
+    """
+    Parser natijasi bo'yicha intentni bajarish (CREATE / UPDATE / CANCEL / DELETE).
+    Audit yozuvlari audit_logs ga qo'shiladi (chaqiruvchi audit sink ga beradi).
+    Tranzaksiya ichida chaqirilishi kerak
+    """
+    intent = parsed.get('intent', 'UNKNOWN')
+    confidence = parsed.get('confidence', 0.0)
+    extracted_data = parsed.get('extracted_data', {})
+    result = {
+        'intent': intent,
+        'language': parsed.get('language'),
+        'confidence': confidence,
+        'extracted_data': extracted_data,
+        'suggestions': parsed.get('suggestions', []),
+        'event_id': None,
+        'action': None,
+    }
+
+    if confidence < MIN_CONFIDENCE:
+        logger.info(f"Unknown intent or low confidence: {intent} ({confidence})")
+        return result
+
+    if intent == 'CREATE':
+        # INSERT event + invites + alerts; id client tomonda (uuid), qayta o'qish shart emas
+        event = build_event(user, extracted_data)
+        event.save(force_insert=True)
+        invites = EventInvite.objects.bulk_create(build_invites(event, extracted_data.get('invite')))
+        EventAlert.objects.bulk_create(build_alerts(event, extracted_data.get('alert')))
+        if invites:
+            invite_emails.schedule([event.id])
+        audit_logs.append(AuditLog(
+            user=user,
+            event=event,
+            action='create',
+            model_name='Event',
+            object_id=event.id,
+            changes=extracted_data,
+        ))
+        result.update(event_id=str(event.id), action='created')
+
+    elif intent == 'UPDATE':
+        # Promptdagi vaqt yangi vaqt - shuning uchun yaqin kelajakdagi eventlar afzal
+        event = find_target_event(user, extracted_data.get('title'), lock=True)
+        if event:
+            old_data = {
+                'title': event.title,
+                'time_start': event.time_start.isoformat(),
+                'time_end': event.time_end.isoformat(),
+            }
+            if extracted_data.get('time_start'):
+                event.time_start = CalendarNLPHelper.parse_datetime(extracted_data['time_start'])
+            if extracted_data.get('time_end'):
+                event.time_end = CalendarNLPHelper.parse_datetime(extracted_data['time_end'])
+            event.save(update_fields=['time_start', 'time_end', 'updated_at'])
+            new_data = {
+                'title': event.title,
+                'time_start': event.time_start.isoformat(),
+                'time_end': event.time_end.isoformat(),
+            }
+            audit_logs.append(AuditLog(
+                user=user,
+                event=event,
+                action='update',
+                model_name='Event',
+                object_id=event.id,
+                changes={'old': old_data, 'new': new_data},
+            ))
+            result.update(event_id=str(event.id), action='updated')
+
+    elif intent in ('CANCEL', 'DELETE'):
+        title = extracted_data.get('title')
+        event = find_target_event(user, title, near=CalendarNLPHelper.parse_datetime(extracted_data.get('time_start')))
+        if event:
+            event_id = event.id
+            event.delete()
+            audit_logs.append(AuditLog(
+                user=user,
+                action='delete',
+                model_name='Event',
+                object_id=event_id,
+                changes={'title': title},
+            ))
+            result.update(event_id=str(event_id), action='deleted')
+
+    else:
+        logger.info(f"Unknown intent or low confidence: {intent} ({confidence})")
+
+    return result
+
+
+def create_user_request(user, text: str) -> UserRequest:
+    """Async rejim: UserRequest (pending) va uning audit yozuvini saqlash"""
+    user_request = UserRequest(user=user, text=text, status=UserRequest.Status.PENDING)
+    with transaction.atomic():
+        user_request.save(force_insert=True)
+        audit.record([request_audit_log(user_request)])
+    return user_request
+
+
+def process_user_request(user_request: UserRequest, parsed: dict, create=False) -> dict:
+    """
+    Parser natijasini qo'llash va so'rov holati / natijasini saqlash - bitta tranzaksiyada.
+    create=True (sinxron rejim) - UserRequest ham shu tranzaksiyada yoziladi.
+    Audit yozuvlari commit dan keyin audit sink orqali (request yo'lida INSERT yo'q)
+    """
+    audit_logs = [request_audit_log(user_request)] if create else []
+    try:
+        with transaction.atomic():
+            user_request.result = apply_parse_result(user_request.user, parsed, audit_logs)
+            user_request.status = UserRequest.Status.DONE
+            if create:
+                user_request.save(force_insert=True)
+            else:
+                user_request.save(update_fields=['status', 'result', 'updated_at'])
+            audit.record(audit_logs)
+    except Exception as exc:
+        logger.exception(f"User request {user_request.id} failed")
+        fail_user_request(user_request, exc, create=create)
+    return user_request.result
+
+
+def fail_user_request(user_request: UserRequest, exc, create=False) -> dict:
+    """So'rovni FAILED deb saqlash (parse yoki intent xatosi)"""
+    user_request.status = UserRequest.Status.FAILED
+    user_request.result = {'error': str(exc)}
+    if create:
+        user_request.save(force_insert=True)
+        audit.record([request_audit_log(user_request)])
+    else:
+        user_request.save(update_fields=['status', 'result', 'updated_at'])
+    return user_request.result
+
+
+def create_draft(user, text: str, parsed: dict) -> ParsedEventDraft:
+    """Tasdiqlash uchun parser natijasini vaqtincha saqlash"""
+    return ParsedEventDraft.objects.create(
+        user=user,
+        original_text=text,
+        language=parsed.get('language') or 'uz',
+        intent=parsed.get('intent', 'UNKNOWN'),
+        extracted_data=parsed.get('extracted_data', {}),
+        expires_at=timezone.now() + DRAFT_TTL,
+    )
+
+
+def confirm_draft(user, draft_id) -> dict:
+    """
+    Draftni tasdiqlash: intent bajariladi, so'rov va natija saqlanadi.
+    Draft topilmasa, eskirgan yoki allaqachon tasdiqlangan bo'lsa None
+    """
+    now = timezone.now()
+    claimed = ParsedEventDraft.objects.filter(
+        pk=draft_id, user=user, is_confirmed=False, expires_at__gt=now,
+    ).update(is_confirmed=True, confirmed_at=now)
+    if not claimed:
+        return None
+
+    draft = ParsedEventDraft.objects.get(pk=draft_id)
+    parsed = {
+        'intent': draft.intent,
+        'language': draft.language,
+        # Foydalanuvchi tasdiqladi
+        'confidence': 1.0,
+        'extracted_data': draft.extracted_data,
+    }
+    user_request = UserRequest(user=user, text=draft.original_text)
+    return process_user_request(user_request, parsed, create=True)
+
+
+def apply_event_op(user, op: str, event_id) -> dict:
+    """WebSocket orqali keladigan tuzilgan amallar: cancel / restore / delete"""
+    queryset = Event.objects.for_user(user).filter(pk=event_id)
+    with transaction.atomic():
+        if op in ('cancel', 'restore'):
+            updated = queryset.update(is_cancelled=(op == 'cancel'))
+            action, changes = 'update', {'is_cancelled': op == 'cancel'}
+        elif op == 'delete':
+            updated, _ = queryset.delete()
+            action, changes = 'delete', {}
+        else:
+            raise ValueError(f"Unknown op: {op}")
+
+        if updated:
+            audit.record([AuditLog(
+                user=user,
+                event_id=event_id if action == 'update' else None,
+                action=action,
+                model_name='Event',
+                object_id=event_id,
+                changes=changes,
+            )])
+    return {'op': op, 'event_id': str(event_id), 'ok': bool(updated)}
@@ -0,0 +1,102 @@
+import threading
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from .manager import EventQuerySet
+from .models import Event, EventAlert, EventException, EventInvite
+from .notifications import CREATED, DELETED, UPDATED, notify
+
+# Hozir o'chirilayotgan eventlar: {event_id: user_id} (cascade dagi invite / alert lar uchun)
+_deleting = threading.local()
+
+
+def schedule_occurrence_sync(event_id):
+    """Tranzaksiya commit bo'lgach event occurrence larini yangilash"""
+    from .occurrences import sync_occurrences
+
+    transaction.on_commit(lambda: sync_occurrences(Event.objects.filter(pk=event_id)))
+
+
+def deleting_events() -> dict:
+    if not hasattr(_deleting, 'events'):
+        _deleting.events = {}
+    return _deleting.events
+
+
+def event_owner_id(instance):
+    """Invite / alert egasining id si (event cache da bo'lmasa bitta so'rov)"""
+    if 'event' in instance._state.fields_cache:
+        return instance.event.user_id
+    return Event.objects.filter(pk=instance.event_id).values_list('user_id', flat=True).first()
+
+
+@receiver(post_save, sender=Event)
+def event_saved(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    fields = instance.changed_fields()
+    if update_fields is not None:
+        fields = {name: value for name, value in fields.items() if name in update_fields}
+    # Faqat vaqt / takrorlanish o'zgarganda occurrence va alert lar qayta hisoblanadi
+    timing_changed = created or bool(EventQuerySet.OCCURRENCE_FIELDS.intersection(fields))
+    if timing_changed:
+        schedule_occurrence_sync(instance.pk)
+    if not created:
+        if timing_changed:
+            # alertlar fire_at i shu tranzaksiyada
+            instance.alerts.sync_fire_at()
+        if 'is_cancelled' in fields:
+            instance.alerts.touch()
+    if created or fields:
+        notify(instance.user_id, 'event', CREATED if created else UPDATED, instance.pk, fields)
+    # Keyingi save() faqat o'zidan keyingi o'zgarishlarni yuborishi uchun
+    instance._loaded_values = {name: getattr(instance, name) for name in Event.NOTIFY_FIELDS}
+
+
+@receiver(pre_delete, sender=Event)
+def event_deleting(sender, instance, **kwargs):
+    deleting_events()[instance.pk] = instance.user_id
+
+
+@receiver(post_delete, sender=Event)
+def event_deleted(sender, instance, **kwargs):
+    deleting_events().pop(instance.pk, None)
+    notify(instance.user_id, 'event', DELETED, instance.pk)
+
+
+@receiver(post_save, sender=EventException)
+@receiver(post_delete, sender=EventException)
+def event_exception_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_occurrence_sync(instance.event_id)
+
+
+@receiver(post_save, sender=EventInvite)
+@receiver(post_delete, sender=EventInvite)
+def event_invite_changed(sender, instance, raw=False, created=False, **kwargs):
+    if raw or instance.event_id in deleting_events():
+        # Event o'chirilishi haqidagi xabar invite larni ham qamraydi
+        return
+    deleted = kwargs['signal'] is post_delete
+    notify(
+        event_owner_id(instance), 'invite', DELETED if deleted else CREATED if created else UPDATED, instance.pk,
+        None if deleted else {'event_id': instance.event_id, 'email': instance.email, 'status': instance.status},
+    )
+
+
+@receiver(post_save, sender=EventAlert)
+@receiver(post_delete, sender=EventAlert)
+def event_alert_changed(sender, instance, raw=False, created=False, **kwargs):
+    if raw or instance.event_id in deleting_events():
+        return
+    deleted = kwargs['signal'] is post_delete
+    notify(
+        event_owner_id(instance), 'alert', DELETED if deleted else CREATED if created else UPDATED, instance.pk,
+        None if deleted else {
+            'event_id': instance.event_id,
+            'value': instance.value,
+            'unit': instance.unit,
+            'is_sent': instance.is_sent,
+            'fire_at': instance.fire_at,
+        },
+    )
@@ -0,0 +1,150 @@
+import logging
+from datetime import timedelta
+from asgiref.sync import async_to_sync
+from celery import shared_task
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.utils import timezone
+from .models import AuditLog, EventAlert, UserRequest
+from .nlp_parser import get_parser
+from .occurrences import next_fire_at, refresh_horizon
+from .recurrence import is_recurring
+from .scheduler import get_config as get_alert_config
+from .service import fail_user_request, process_user_request
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_event_occurrences():
+    """Takrorlanuvchi eventlar uchun occurrence jadvalini rolling horizon gacha to'ldirish"""
+    stats = refresh_horizon()
+    logger.info(f"Event occurrences refreshed: {stats}")
+    return stats
+
+
+def claim_alerts(alert_ids, now=None) -> list:
+    """
+    Alertlarni band qilish va yuborilgan deb belgilash (bitta tranzaksiyada).
+    Boshqa worker band qilgan qatorlar o'tkazib yuboriladi (skip_locked),
+    shuning uchun bitta alert ikki marta yuborilmaydi. Bekor qilingan eventlarniki va
+    MAX_LATENESS dan ko'proq kechikkanlari olinmaydi.
+    Takrorlanuvchi event alerti yopilmaydi - fire_at keyingi occurrence ga o'tkaziladi
+    """
+    now = now or timezone.now()
+    stale_before = now - timedelta(seconds=get_alert_config()['MAX_LATENESS'])
+    with transaction.atomic():
+        alerts = list(
+            EventAlert.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('event')
+            .filter(
+                pk__in=alert_ids, is_sent=False, event__is_cancelled=False,
+                fire_at__gte=stale_before, fire_at__lte=now,
+            )
+        )
+        for alert in alerts:
+            # Yuborilayotgan takrorlanish boshlanishi
+            alert.occurrence_start = alert.fire_at + timedelta(seconds=alert.offset_seconds)
+        series = [alert for alert in alerts if is_recurring(alert.event)]
+        single_ids = [alert.pk for alert in alerts if not is_recurring(alert.event)]
+        if single_ids:
+            EventAlert.objects.filter(pk__in=single_ids).update(is_sent=True, sent_at=now)
+        if series:
+            fire_times = next_fire_at(series, now)
+            for alert in series:
+                alert.fire_at, alert.sent_at, alert.updated_at = fire_times[alert.pk], now, now
+            EventAlert.objects.bulk_update(series, ['fire_at', 'sent_at', 'updated_at'])
+    return alerts
+
+
+@shared_task
+def dispatch_alerts(alert_ids):
+    """Vaqti kelgan alertlarni claim qilib, egasining WebSocket group iga yuborish"""
+    alerts = claim_alerts(alert_ids)
+    channel_layer = get_channel_layer()
+    for alert in alerts:
+        event = alert.event
+        async_to_sync(channel_layer.group_send)(f"user_{event.user_id}", {
+            "type": "event_alert",
+            "alert": {
+                "id": str(alert.id),
+                "event_id": str(event.id),
+                "title": event.title,
+                "time_start": alert.occurrence_start.isoformat(),
+                "before": alert.display_text,
+            },
+        })
+    logger.info(f"Alerts dispatched: {len(alerts)}/{len(alert_ids)}")
+    return len(alerts)
+
+
+@shared_task
+def parse_user_request(request_id, user_timezone=None):
+    """
+    Async pipeline: so'rovni parse qilish, intentni bajarish va natijani
+    egasining WebSocket group iga yuborish
+    """
+    updated = UserRequest.objects.filter(
+        pk=request_id, status=UserRequest.Status.PENDING,
+    ).update(status=UserRequest.Status.PROCESSING)
+    if not updated:
+        # Boshqa worker olgan yoki allaqachon bajarilgan
+        return None
+
+    user_request = UserRequest.objects.select_related('user').get(pk=request_id)
+    try:
+        parsed = get_parser().parse(user_request.text, user_timezone=user_timezone)
+    except Exception as exc:
+        # PROCESSING da qolib ketmasligi uchun - FAILED va natija baribir yuboriladi
+        logger.exception(f"User request {request_id} parse failed")
+        result = fail_user_request(user_request, exc)
+    else:
+        result = process_user_request(user_request, parsed)
+
+    async_to_sync(get_channel_layer().group_send)(f"user_{user_request.user_id}", {
+        "type": "user_request_result",
+        "request": {
+            "id": str(user_request.id),
+            "status": user_request.status,
+            "result": result,
+        },
+    })
+    return user_request.status
+
+
+@shared_task
+def write_audit_logs(rows):
+    """Audit sink spool i (CALENDAR_AUDIT['SPOOL']): yozuvlar broker orqali keladi"""
+    from .audit import write_logs
+
+    return write_logs([AuditLog(**row) for row in rows])
+
+
+@shared_task
+def maintain_audit_partitions():
+    """AuditLog: keyingi oylar uchun partitionlar va eski partitionlarni arxivlash (faqat PostgreSQL)"""
+    from .partitions import apply_retention, ensure_partitions, is_partitioned
+
+    if not is_partitioned():
+        return None
+    stats = {'created': ensure_partitions(), 'archived': apply_retention()}
+    logger.info(f"Audit partitions maintained: {stats}")
+    return stats
+
+
+@shared_task(bind=True, max_retries=5)
+def send_event_invites(self, event_ids=None):
+    """
+    Yuborilmagan taklif emaillari (event_ids bo'lmasa - hammasi, beat orqali).
+    Xato bo'lganlari eksponensial kechikish bilan qayta yuboriladi
+    """
+    from .invites import get_config, send_pending
+
+    if not get_config()['ENABLED']:
+        return None
+    stats = send_pending(event_ids)
+    logger.info(f"Invite emails: {stats}")
+    if stats['failed'] and self.request.retries < self.max_retries:
+        raise self.retry(countdown=get_config()['RETRY_DELAY'] * 2 ** self.request.retries)
+    return stats
@@ -1,3 +1,1276 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import importlib
+import json
+import sys
+import tempfile
+import threading
+import uuid
+from datetime import datetime, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipIf, skipUnless
+from zoneinfo import ZoneInfo
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.apps import apps as django_apps
+from django.core import mail, signing
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.signals import template_rendered
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from apps.accounts.models import User
+from apps.base.admin import EstimatedCountPaginator, encode_cursor, estimate_count
+from apps.base.pagination import KeysetPagination
+from . import consumers, manager, nlp_parser, notifications, signals, tasks
+from .audit import AuditSink, get_sink, to_row, write_logs
+from .invites import claim_invites, get_config as get_invite_config, render_cache, send_pending
+from .language_detector import (
+    TIER_EMPTY, TIER_FALLBACK, TIER_LANGDETECT, TIER_LEXICON, TIER_SCRIPT, LanguageDetector,
+)
+from .manager import day_range
+from .models import AuditLog, Event, EventAlert, EventException, EventInvite, EventOccurrence, UserRequest
+from .nlp_parser import CalendarNLPParser
+from .occurrences import sync_occurrences
+from .parse_cache import ParseCache
+from .partitions import (
+    add_months, apply_retention, archive_partition, ensure_partitions, is_partitioned, list_detached,
+    list_partitions, month_start, partition_name,
+)
+from .recurrence import RecurrenceExpander
+from .rsvp import make_token
+from .scheduler import AlertDispatcher, TimingWheel
+from .service import bulk_create_user_requests, process_user_request
+from .tasks import claim_alerts
 
-# Create your tests here.
+
+@override_settings(CALENDAR_NOTIFICATIONS={'ENABLED': False}, CALENDAR_INVITES={'ENABLED': False})
+class UserRequestServiceQueryTests(TestCase):
+    """
+    Har bir intent bitta tranzaksiyada, o'zgarmas sondagi so'rovlar bilan bajariladi.
+    AuditLog request yo'lida yozilmaydi - commit dan keyin audit sink orqali
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='service@example.com', password='secret')
+        start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        cls.start = start
+        cls.event = Event.objects.create(
+            user=cls.user,
+            title='Team meeting',
+            time_start=start,
+            time_end=start + timedelta(hours=1),
+        )
+
+    def parsed(self, intent, **extracted_data):
+        return {
+            'intent': intent,
+            'language': 'en',
+            'confidence': 0.95,
+            'extracted_data': extracted_data,
+            'suggestions': [],
+        }
+
+    def process(self, parsed):
+        user_request = UserRequest(user=self.user, text='text')
+        return process_user_request(user_request, parsed, create=True), user_request
+
+    def test_create_queries(self):
+        parsed = self.parsed(
+            'CREATE',
+            title='Lunch',
+            all_day=False,
+            time_start=(self.start + timedelta(hours=3)).isoformat(),
+            time_end=(self.start + timedelta(hours=4)).isoformat(),
+            invite=['a@example.com', 'b@example.com', 'A@example.com'],
+            alert=['10m', '1h'],
+        )
+        # SAVEPOINT, event, invites, alerts, user request, RELEASE
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(6):
+            result, user_request = self.process(parsed)
+        get_sink().flush()
+
+        self.assertEqual(result['action'], 'created')
+        event = Event.objects.get(pk=result['event_id'])
+        self.assertEqual(EventInvite.objects.filter(event=event).count(), 2)
+        self.assertEqual(EventAlert.objects.filter(event=event, fire_at__isnull=False).count(), 2)
+        self.assertEqual(AuditLog.objects.filter(object_id__in=[event.id, user_request.id]).count(), 2)
+        self.assertEqual(user_request.status, UserRequest.Status.DONE)
+
+    def test_update_queries(self):
+        new_start = self.start + timedelta(hours=2)
+        parsed = self.parsed(
+            'UPDATE',
+            title='meeting',
+            time_start=new_start.isoformat(),
+            time_end=(new_start + timedelta(hours=1)).isoformat(),
+        )
+        # SAVEPOINT, select event, select event FOR UPDATE, update event, alerts (fire_at), user request, RELEASE
+        with self.assertNumQueries(7):
+            result, _ = self.process(parsed)
+
+        self.assertEqual(result['action'], 'updated')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.time_start, new_start)
+
+    def test_delete_queries(self):
+        EventAlert.objects.create(event=self.event, value=10, unit='m')
+        parsed = self.parsed('DELETE', title='meeting')
+        # SAVEPOINT, select event, cascade (exceptions, invites / alerts - signal lari uchun select,
+        # occurrences, audit SET NULL, alerts), delete event, user request, RELEASE
+        with self.assertNumQueries(11):
+            result, _ = self.process(parsed)
+
+        self.assertEqual(result['action'], 'deleted')
+        self.assertFalse(Event.objects.filter(pk=self.event.pk).exists())
+
+    def test_low_confidence_queries(self):
+        parsed = self.parsed('CREATE', title='Lunch')
+        parsed['confidence'] = 0.3
+        # SAVEPOINT, user request, RELEASE
+        with self.assertNumQueries(3):
+            result, _ = self.process(parsed)
+
+        self.assertIsNone(result['action'])
+
+
+@override_settings(CALENDAR_NOTIFICATIONS={'ENABLED': False})
+class AdminChangelistQueryTests(TestCase):
+    """Changelist so'rovlari soni sahifadagi qatorlar soniga bog'liq emas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email='admin@example.com', password='secret')
+        cls.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def add_events(self, count):
+        for index in range(count):
+            user = User.objects.create_user(email=f'owner{Event.objects.count()}@example.com', password='secret')
+            event = Event.objects.create(
+                user=user,
+                title=f'Event {index}',
+                time_start=self.start,
+                time_end=self.start + timedelta(hours=1),
+            )
+            EventInvite.objects.create(event=event, email=f'guest{index}@example.com')
+            EventAlert.objects.create(event=event, value=10, unit='m')
+            AuditLog.objects.create(user=user, event=event, action='create', model_name='Event', object_id=event.id)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_changelists_constant_queries(self):
+        names = ('event', 'eventinvite', 'eventalert', 'auditlog')
+        self.add_events(2)
+        small = {name: self.count_queries(reverse(f'admin:calendarapp_{name}_changelist')) for name in names}
+        self.add_events(8)
+        for name in names:
+            with self.subTest(model=name):
+                self.assertEqual(self.count_queries(reverse(f'admin:calendarapp_{name}_changelist')), small[name])
+
+
+@override_settings(CALENDAR_NOTIFICATIONS={'ENABLED': False})
+class AlertDispatchTests(TestCase):
+    """Alertlar wheel ga yuklanishi, claim va bekor qilingan eventlar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='alerts@example.com', password='secret')
+        cls.now = timezone.now().replace(microsecond=0)
+
+    def add_alert(self, minutes, **event_fields):
+        # fire_at = now + minutes
+        start = self.now + timedelta(minutes=minutes + 10)
+        event = Event.objects.create(
+            user=self.user, title='Alert', time_start=start, time_end=start + timedelta(hours=1), **event_fields,
+        )
+        return EventAlert.objects.create(event=event, value=10, unit='m')
+
+    def dispatcher(self):
+        return AlertDispatcher(lookahead=3600, refill_interval=0, max_lateness=15 * 60)
+
+    def test_cancelled_event_alerts_skipped(self):
+        alert = self.add_alert(-1, is_cancelled=True)
+        self.assertFalse(EventAlert.objects.due(self.now).filter(pk=alert.pk).exists())
+        self.assertEqual(claim_alerts([alert.pk], self.now), [])
+        self.assertFalse(EventAlert.objects.get(pk=alert.pk).is_sent)
+
+    def test_cancel_removes_from_wheel(self):
+        alerts = [self.add_alert(5), self.add_alert(6)]
+        dispatcher = self.dispatcher()
+        self.assertEqual(dispatcher.refill(self.now), 2)
+
+        alerts[0].event.is_cancelled = True
+        alerts[0].event.save()
+        Event.objects.filter(pk=alerts[1].event_id).update(is_cancelled=True)
+        dispatcher.refill()
+        self.assertEqual(len(dispatcher.wheel), 0)
+
+        Event.objects.filter(pk=alerts[1].event_id).update(is_cancelled=False)
+        dispatcher.refill()
+        self.assertIn(alerts[1].pk, dispatcher.wheel)
+
+    def test_stale_alerts_skipped(self):
+        stale, late, upcoming = self.add_alert(-60), self.add_alert(-5), self.add_alert(5)
+        dispatcher = self.dispatcher()
+        self.assertEqual(dispatcher.refill(self.now), 2)
+        self.assertNotIn(stale.pk, dispatcher.wheel)
+        stale.refresh_from_db()
+        self.assertTrue(stale.is_sent)
+        self.assertIsNone(stale.sent_at)
+
+        claimed = claim_alerts([stale.pk, late.pk, upcoming.pk], self.now)
+        self.assertEqual([alert.pk for alert in claimed], [late.pk])
+        # Ikkinchi worker o'sha alertni qayta olmaydi
+        self.assertEqual(claim_alerts([late.pk], self.now), [])
+
+    def test_two_dispatchers_claim_once(self):
+        alert = self.add_alert(5)
+        first, second = self.dispatcher(), self.dispatcher()
+        for dispatcher in (first, second):
+            dispatcher.refill(self.now)
+            self.assertEqual(dispatcher.wheel.advance((self.now + timedelta(minutes=4)).timestamp()), [])
+            self.assertEqual(dispatcher.wheel.advance((self.now + timedelta(minutes=5)).timestamp()), [alert.pk])
+
+        fire_at = self.now + timedelta(minutes=5)
+        self.assertEqual([claimed.pk for claimed in claim_alerts([alert.pk], fire_at)], [alert.pk])
+        self.assertEqual(claim_alerts([alert.pk], fire_at), [])
+
+
+class TimingWheelTests(SimpleTestCase):
+    """Wheel: slot lar bo'yicha add / cancel, cascade va overflow"""
+
+    def test_add_and_advance(self):
+        wheel = TimingWheel(slots=(60, 60, 24), now=1000)
+        wheel.add('now', 999)
+        wheel.add('second', 1001)
+        wheel.add('minute', 1000 + 90)
+        wheel.add('hour', 1000 + 2 * 3600 + 5)
+        wheel.add('overflow', 1000 + 3 * 86400)
+        self.assertEqual(len(wheel), 5)
+
+        # O'tib ketgan vaqt - joriy qadamda
+        self.assertEqual(wheel.advance(1000), ['now'])
+        self.assertEqual(wheel.advance(1001), ['second'])
+        self.assertEqual(wheel.advance(1000 + 89), [])
+        self.assertEqual(wheel.advance(1000 + 90), ['minute'])
+        self.assertEqual(wheel.advance(1000 + 2 * 3600 + 4), [])
+        self.assertEqual(wheel.advance(1000 + 2 * 3600 + 5), ['hour'])
+        self.assertEqual(wheel.advance(1000 + 3 * 86400 - 1), [])
+        self.assertEqual(wheel.advance(1000 + 3 * 86400), ['overflow'])
+        self.assertEqual(len(wheel), 0)
+
+    def test_reschedule_and_cancel(self):
+        wheel = TimingWheel(now=0)
+        wheel.add('moved', 3600 * 5)
+        wheel.add('moved', 30)
+        wheel.add('cancelled', 30)
+        wheel.cancel('cancelled')
+        wheel.cancel('missing')
+        self.assertNotIn('cancelled', wheel)
+        self.assertEqual(wheel.advance(30), ['moved'])
+        self.assertEqual(wheel.advance(3600 * 6), [])
+
+
+class AuditSinkTests(TestCase):
+    """Audit yozuvlari vaqti va to'lib qolgan buffer"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='audit@example.com', password='secret')
+
+    def log(self, **fields):
+        return AuditLog(user=self.user, action='view', model_name='Event', object_id=uuid.uuid4(), **fields)
+
+    def test_created_at_is_action_time(self):
+        log = self.log()
+        action_time = log.created_at
+        write_logs([log])
+        self.assertEqual(AuditLog.objects.get(pk=log.pk).created_at, action_time)
+
+        row = to_row(self.log(created_at=action_time - timedelta(minutes=5)))
+        write_logs([AuditLog(**row)])
+        self.assertEqual(AuditLog.objects.get(pk=row['id']).created_at, action_time - timedelta(minutes=5))
+
+    def test_backlog_overflow_written_synchronously(self):
+        sink = AuditSink(max_size=100, max_age=3600, max_backlog=3)
+        sink.add([self.log() for _ in range(2)])
+        self.assertEqual(AuditLog.objects.count(), 0)
+        sink.add([self.log() for _ in range(3)])
+        self.assertEqual(AuditLog.objects.count(), 5)
+        self.assertEqual(sink.flush(), 0)
+
+
+class FlakyEmailBackend(locmem.EmailBackend):
+    """locmem: @fail.example.com manzillariga yuborish xato beradi, ulanishlar sanaladi"""
+
+    connections = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        FlakyEmailBackend.connections += 1
+
+    def send_messages(self, messages):
+        if any(address.endswith('@fail.example.com') for message in messages for address in message.to):
+            raise ConnectionError('Recipient refused')
+        return super().send_messages(messages)
+
+
+@override_settings(
+    CALENDAR_NOTIFICATIONS={'ENABLED': False},
+    CALENDAR_INVITES={'BATCH_SIZE': 50, 'RATE_LIMIT': 0},
+    EMAIL_BACKEND='apps.calendarapp.tests.FlakyEmailBackend',
+)
+class InviteEmailTests(TestCase):
+    """Taklif emaillari: bitta ulanish, event shabloni bir marta, xato bo'lganlari qayta yuboriladi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='organizer@example.com', password='secret')
+        start = timezone.now() + timedelta(days=1)
+        cls.event = Event.objects.create(user=cls.user, title='Demo day', time_start=start, time_end=start + timedelta(hours=2))
+        EventInvite.objects.bulk_create([
+            EventInvite(event=cls.event, email=f'guest{index}@example.com') for index in range(20)
+        ] + [EventInvite(event=cls.event, email='guest@fail.example.com')])
+
+    def setUp(self):
+        FlakyEmailBackend.connections = 0
+        render_cache.clear()
+        self.rendered = []
+        template_rendered.connect(self.on_render)
+        self.addCleanup(template_rendered.disconnect, self.on_render)
+
+    def on_render(self, sender, template, **kwargs):
+        if template.name == get_invite_config()['TEMPLATE']:
+            self.rendered.append(template.name)
+
+    def test_send_pending(self):
+        stats = send_pending()
+        self.assertEqual(stats, {'sent': 20, 'failed': 1})
+        self.assertEqual(len(mail.outbox), 20)
+        self.assertEqual(FlakyEmailBackend.connections, 1)
+        self.assertEqual(len(self.rendered), 1)
+        self.assertEqual(len({message.alternatives[0][0] for message in mail.outbox}), 20)
+
+        failed = EventInvite.objects.get(email='guest@fail.example.com')
+        self.assertIsNone(failed.sent_at)
+        self.assertIsNone(failed.claimed_at)
+        self.assertEqual(failed.send_attempts, 1)
+        self.assertEqual(EventInvite.objects.filter(sent_at__isnull=False, claimed_at__isnull=True).count(), 20)
+
+        # Keyingi ishga tushishda faqat xato bo'lgani qayta olinadi
+        EventInvite.objects.filter(pk=failed.pk).update(email='guest21@example.com')
+        self.assertEqual(send_pending(), {'sent': 1, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 21)
+
+    def test_expired_lease_reclaimed(self):
+        now = timezone.now()
+        claimed = claim_invites(5, now=now, lease=900)
+        self.assertEqual(len(claimed), 5)
+        # Worker band qilgandan keyin o'lgan: lease tugaguncha boshqasi olmaydi
+        self.assertEqual(len(claim_invites(50, now=now, lease=900)), 16)
+        self.assertEqual(claim_invites(50, now=now + timedelta(seconds=60), lease=900), [])
+        reclaimed = claim_invites(50, now=now + timedelta(seconds=901), lease=900)
+        self.assertEqual(len(reclaimed), 21)
+        self.assertFalse(EventInvite.objects.filter(sent_at__isnull=False).exists())
+
+
+@override_settings(CALENDAR_NOTIFICATIONS={'ENABLED': True})
+class InviteRsvpTests(TestCase):
+    """RSVP linki: token tekshirilguncha DB yo'q, GET o'zgartirmaydi, POST - bitta UPDATE va yig'ma sonlar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='host@example.com', password='secret')
+        start = timezone.now() + timedelta(days=1)
+        cls.event = Event.objects.create(user=cls.user, title='Review', time_start=start, time_end=start + timedelta(hours=1))
+        cls.invite = EventInvite.objects.create(event=cls.event, email='guest@example.com')
+        EventInvite.objects.create(event=cls.event, email='other@example.com')
+
+    def setUp(self):
+        # Xabarlar commit da shu buffer ga tushadi (yuborilmaydi)
+        buffer = notifications.ChangeBuffer(window=3600)
+        previous, notifications._buffer = notifications._buffer, buffer
+        self.addCleanup(setattr, notifications, '_buffer', previous)
+        self.buffer = buffer
+        self.invite = EventInvite.objects.select_related('event').get(pk=self.invite.pk)
+        self.url = reverse('invite-rsvp', args=[make_token(self.invite)])
+
+    def tearDown(self):
+        if self.buffer._timer:
+            self.buffer._timer.cancel()
+
+    def test_bad_token_no_queries(self):
+        expired = signing.dumps([str(self.invite.pk), str(self.event.pk), self.user.pk], salt='calendarapp.rsvp')
+        for url in (self.url[:-3] + 'xx/', reverse('invite-rsvp', args=[expired])):
+            with self.subTest(url=url), self.settings(CALENDAR_RSVP={'MAX_AGE': -1}), self.assertNumQueries(0):
+                self.assertEqual(self.client.get(url, {'status': 'accepted'}).status_code, 404)
+                self.assertEqual(self.client.post(url, {'status': 'accepted'}).status_code, 404)
+
+    def test_get_does_not_change_status(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'status': 'accepted'}, HTTP_ACCEPT='text/html')
+        self.assertContains(response, 'method="post"')
+        self.invite.refresh_from_db()
+        self.assertEqual(self.invite.status, 'pending')
+
+    def test_post_single_update_and_counts(self):
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, {'status': 'accepted'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['confirmed'])
+        writes = [query['sql'] for query in context.captured_queries if not query['sql'].startswith(('SELECT', 'SAVEPOINT', 'RELEASE'))]
+        self.assertEqual(len(writes), 1)
+        self.assertTrue(writes[0].startswith('UPDATE'))
+
+        self.invite.refresh_from_db()
+        self.assertEqual(self.invite.status, 'accepted')
+        change = self.buffer._pending[self.user.pk][('event_invites', str(self.event.pk))]
+        self.assertEqual(change['fields'], {'pending': 1, 'accepted': 1, 'declined': 0})
+
+
+@override_settings(CALENDAR_NOTIFICATIONS={'ENABLED': False}, CALENDAR_OCCURRENCES={'HORIZON_DAYS': 10})
+class RecurringAlertTests(TestCase):
+    """Takrorlanuvchi event: occurrence lar now dan horizon gacha, alert har bir takrorlanish uchun"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='series@example.com', password='secret')
+        cls.now = timezone.now().replace(microsecond=0)
+        # 30 kun oldin boshlangan, har kuni now + 2 soatda
+        start = cls.now - timedelta(days=30) + timedelta(hours=2)
+        cls.event = Event.objects.create(
+            user=cls.user, title='Standup', time_start=start, time_end=start + timedelta(minutes=15),
+            repeat='RRULE:FREQ=DAILY', timezone='UTC',
+        )
+
+    def test_occurrences_bounded_to_now(self):
+        sync_occurrences([self.event], now=self.now)
+        starts = list(EventOccurrence.objects.filter(event=self.event).values_list('time_start', flat=True))
+        self.assertEqual(starts[0], self.now + timedelta(hours=2))
+        self.assertEqual(len(starts), 10)
+
+        # Keyingi sync da o'tib ketgan takrorlanishlar tarix sifatida qoladi
+        sync_occurrences([self.event], now=self.now + timedelta(days=2, hours=3))
+        rows = EventOccurrence.objects.filter(event=self.event)
+        self.assertEqual(rows.first().time_start, starts[0])
+        self.assertEqual(rows.count(), 13)
+
+    def test_alert_rearmed_after_send(self):
+        sync_occurrences([self.event], now=self.now)
+        alert = EventAlert.objects.create(event=self.event, value=1, unit='h')
+        first = self.now + timedelta(hours=1)
+        self.assertEqual(alert.fire_at, first)
+
+        claimed = claim_alerts([alert.pk], first)
+        self.assertEqual([item.occurrence_start for item in claimed], [first + timedelta(hours=1)])
+        alert.refresh_from_db()
+        self.assertFalse(alert.is_sent)
+        self.assertEqual(alert.sent_at, first)
+        self.assertEqual(alert.fire_at, first + timedelta(days=1))
+        self.assertEqual(claim_alerts([alert.pk], first), [])
+        self.assertEqual(len(claim_alerts([alert.pk], first + timedelta(days=1))), 1)
+
+    def test_stale_alert_moves_to_next_occurrence(self):
+        sync_occurrences([self.event], now=self.now)
+        alert = EventAlert.objects.create(event=self.event, value=1, unit='h')
+        later = self.now + timedelta(days=3)
+        self.assertEqual(EventAlert.objects.stale(later).mark_skipped(later), 1)
+        alert.refresh_from_db()
+        self.assertFalse(alert.is_sent)
+        self.assertEqual(alert.fire_at, self.now + timedelta(days=3, hours=1))
+
+
+class ParserGoldenTests(SimpleTestCase):
+    """
+    Parser natijalari o'zgarmagan: testdata/nlp_parser_golden.json - uz/en/ru promptlar va
+    optimallashtirishdan oldingi parser natijalari (qotirilgan vaqt bilan)
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with open(Path(__file__).parent / 'testdata' / 'nlp_parser_golden.json', encoding='utf-8') as file:
+            cls.golden = json.load(file)
+        now = datetime.fromisoformat(cls.golden['now'])
+
+        class FixedClockParser(CalendarNLPParser):
+            def get_current_time(self, user_timezone=None):
+                return now.astimezone(ZoneInfo(user_timezone)) if user_timezone else now
+
+        cls.parser = FixedClockParser()
+
+    def test_golden_outputs(self):
+        for case in self.golden['cases']:
+            result = self.parser.parse(case['prompt'], language=case['language'], user_timezone=self.golden['timezone'])
+            expected = case['expected']
+            with self.subTest(prompt=case['prompt'], field='intent'):
+                self.assertEqual(result['intent'], expected['intent'])
+            for field, value in expected['extracted_data'].items():
+                with self.subTest(prompt=case['prompt'], field=field):
+                    self.assertEqual(result['extracted_data'][field], value)
+
+
+@override_settings(CALENDAR_NOTIFICATIONS={'ENABLED': False})
+class QuerySetUpdateTests(TestCase):
+    """queryset.update(): id lar faqat kerak bo'lganda, keyingi ishlar ID_BATCH_SIZE lik to'plamlarda"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='bulk@example.com', password='secret')
+        cls.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        for index in range(5):
+            event = Event.objects.create(
+                user=cls.user, title=f'Bulk {index}', time_start=cls.start, time_end=cls.start + timedelta(hours=1),
+            )
+            EventAlert.objects.create(event=event, value=10, unit='m')
+            EventInvite.objects.create(event=event, email=f'bulk{index}@example.com')
+
+    def test_plain_update_single_query(self):
+        with self.assertNumQueries(1):
+            Event.objects.filter(user=self.user).update(title='Renamed')
+        with self.assertNumQueries(1):
+            EventInvite.objects.filter(event__user=self.user).update(status='accepted')
+        with self.assertNumQueries(1):
+            EventAlert.objects.filter(event__user=self.user).update(is_sent=True)
+
+    def test_batched_follow_up(self):
+        new_start = self.start + timedelta(hours=3)
+        with mock.patch.object(manager, 'ID_BATCH_SIZE', 2):
+            Event.objects.filter(user=self.user).update(time_start=new_start, time_end=new_start + timedelta(hours=1))
+            self.assertEqual(
+                EventOccurrence.objects.filter(event__user=self.user, time_start=new_start).count(), 5,
+            )
+            self.assertEqual(
+                EventAlert.objects.filter(event__user=self.user, fire_at=new_start - timedelta(minutes=10)).count(), 5,
+            )
+            EventAlert.objects.filter(event__user=self.user).update(value=1, unit='h')
+        self.assertEqual(EventAlert.objects.filter(fire_at=new_start - timedelta(hours=1)).count(), 5)
+
+
+class LanguageDetectorTests(SimpleTestCase):
+    """Til aniqlash bosqichlari va normallashtirilgan matn bo'yicha LRU"""
+
+    def test_tiers(self):
+        detector = LanguageDetector()
+        cases = [
+            ('', 'uz', TIER_EMPTY),
+            ('завтра встреча в 10', 'ru', TIER_SCRIPT),
+            ('эртага соат ўнда учрашув', 'uz', TIER_SCRIPT),
+            ('ertaga soat 10 da uchrashuv', 'uz', TIER_LEXICON),
+            ('meeting tomorrow at 10 with the team', 'en', TIER_LEXICON),
+            ('quarterly planning session', 'en', TIER_LANGDETECT),
+            ('Bonjour tout le monde', 'uz', TIER_FALLBACK),
+        ]
+        for text, language, tier in cases:
+            with self.subTest(text=text):
+                self.assertEqual(detector.detect(text), (language, tier, False))
+
+    def test_lru(self):
+        detector = LanguageDetector(cache_size=2)
+        detector.detect('ertaga soat 10 da uchrashuv')
+        detector.detect('завтра встреча в 10')
+        # Bo'shliq, registr va apostrof farqi bitta kalit
+        self.assertTrue(detector.detect('  Ertaga SOAT 10   da uchrashuv').cached)
+        self.assertEqual(detector.detect("o‘zgartir").language, 'uz')
+        self.assertTrue(detector.detect("o'zgartir").cached)
+
+        # Yangi kalit qo'shilganda eng uzoq ishlatilmagan (ruscha) chiqarib yuborilgan
+        self.assertFalse(detector.detect('завтра встреча в 10').cached)
+        self.assertTrue(detector.detect("O'zgartir").cached)
+        stats = detector.stats()
+        self.assertEqual(stats['cache_size'], 2)
+        self.assertEqual((stats['cache_hits'], stats['cache_misses']), (3, 4))
+
+
+class ParseCacheTests(SimpleTestCase):
+    """parse() keshi: kalit tarkibi va qaytarilgan natijalar nusxa ekanligi"""
+
+    def test_key(self):
+        cache = ParseCache(bucket_seconds=60)
+        start = datetime(2025, 3, 12, 10, 0, 5, tzinfo=ZoneInfo('UTC'))
+        with mock.patch('apps.calendarapp.parse_cache.timezone.now', return_value=start):
+            key = cache.make_key('Ertaga soat 10 da uchrashuv', 'uz', 'Asia/Tashkent')
+            self.assertEqual(cache.make_key('  Ertaga soat 10 da uchrashuv\n', 'uz', 'Asia/Tashkent'), key)
+            # Sarlavha katta-kichik harfni saqlaydi
+            self.assertNotEqual(cache.make_key('ertaga soat 10 da uchrashuv', 'uz', 'Asia/Tashkent'), key)
+            self.assertNotEqual(cache.make_key('Ertaga soat 10 da uchrashuv', None, 'Asia/Tashkent'), key)
+            self.assertNotEqual(cache.make_key('Ertaga soat 10 da uchrashuv', 'uz', 'Europe/Moscow'), key)
+        with mock.patch('apps.calendarapp.parse_cache.timezone.now', return_value=start + timedelta(seconds=50)):
+            self.assertEqual(cache.make_key('Ertaga soat 10 da uchrashuv', 'uz', 'Asia/Tashkent'), key)
+        with mock.patch('apps.calendarapp.parse_cache.timezone.now', return_value=start + timedelta(seconds=60)):
+            self.assertNotEqual(cache.make_key('Ertaga soat 10 da uchrashuv', 'uz', 'Asia/Tashkent'), key)
+
+    def test_values_are_copies(self):
+        cache = ParseCache(backend=LocMemCache('parse-cache-tests', {}))
+        value = {'intent': 'create', 'extracted_data': {'title': 'Uchrashuv'}}
+        cache.set('key', value)
+        value['extracted_data']['title'] = 'Changed'
+
+        result = cache.get('key')
+        self.assertEqual(result['extracted_data']['title'], 'Uchrashuv')
+        result['extracted_data']['title'] = 'Changed'
+        self.assertEqual(cache.get('key')['extracted_data']['title'], 'Uchrashuv')
+
+        # Umumiy backend dan o'qilgani ham nusxa
+        cache.clear()
+        shared = cache.get('key')
+        shared['intent'] = 'delete'
+        self.assertEqual(cache.get('key')['intent'], 'create')
+        self.assertEqual(cache.stats()['shared_hits'], 1)
+
+    def test_parser_hits(self):
+        parser = CalendarNLPParser(cache=ParseCache())
+        first = parser.parse('Ertaga soat 10 da uchrashuv', language='uz', user_timezone='Asia/Tashkent')
+        first['extracted_data']['title'] = 'Changed'
+        second = parser.parse('Ertaga soat 10 da uchrashuv', language='uz', user_timezone='Asia/Tashkent')
+        self.assertNotEqual(second['extracted_data']['title'], 'Changed')
+        self.assertEqual((parser.cache.stats()['hits'], parser.cache.stats()['misses']), (1, 1))
+
+
+@override_settings(CALENDAR_NOTIFICATIONS={'ENABLED': False})
+class EventListPaginationTests(TestCase):
+    """GET /events/: (time_start, id) keyset - bir xil time_start li eventlar takrorlanmaydi va tushib qolmaydi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='pages@example.com', password='secret')
+        other = User.objects.create_user(email='other-pages@example.com', password='secret')
+        cls.start = timezone.now().replace(microsecond=0) + timedelta(days=2)
+        # Occurrence qatorlari commit da yoziladi
+        with cls.captureOnCommitCallbacks(execute=True):
+            for index in range(7):
+                # Uchtadan bir xil boshlanish vaqti
+                time_start = cls.start + timedelta(hours=index // 3)
+                Event.objects.create(
+                    user=cls.user, title=f'Page {index}', time_start=time_start, time_end=time_start + timedelta(minutes=30),
+                )
+            Event.objects.create(user=other, title='Other', time_start=cls.start, time_end=cls.start + timedelta(hours=1))
+        cls.expected = [
+            str(pk) for pk in Event.objects.filter(user=cls.user).order_by('time_start', 'id').values_list('pk', flat=True)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def collect(self, params):
+        rows, url = [], reverse('event-list')
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 2)
+            rows.extend(response.data['results'])
+            url, params = response.data['next'], None
+        # Bir xil time_start ichidagi tartib keyset ning id siga (occurrence yoki event) bog'liq
+        starts = [row['time_start'] for row in rows]
+        self.assertEqual(starts, sorted(starts))
+        return [row['id'] for row in rows]
+
+    def test_pages(self):
+        end = self.start + timedelta(days=1)
+        ids = self.collect({'start': self.start.isoformat(), 'end': end.isoformat(), 'page_size': 2})
+        self.assertEqual(len(ids), len(self.expected))
+        self.assertCountEqual(ids, self.expected)
+
+    def test_pages_beyond_horizon(self):
+        # materialized_until dan keyin - RRULE oqimi orqali
+        end = self.start + timedelta(days=400)
+        ids = self.collect({'start': self.start.isoformat(), 'end': end.isoformat(), 'page_size': 2})
+        self.assertEqual(len(ids), len(self.expected))
+        self.assertCountEqual(ids, self.expected)
+
+    def test_cursor(self):
+        paginator = KeysetPagination()
+        paginator.ordering = ('time_start', 'id')
+        event = Event.objects.filter(user=self.user).order_by('time_start', 'id')[2]
+        cursor = paginator.encode_cursor(paginator.get_cursor_values(event))
+        request = Request(APIRequestFactory().get('/', {'cursor': cursor}))
+        values = paginator.decode_cursor(request)
+        self.assertEqual(values, [str(event.time_start), str(event.pk)])
+
+        after = Event.objects.filter(user=self.user).filter(paginator.build_seek_filter(values)).order_by('time_start', 'id')
+        self.assertEqual([str(pk) for pk in after.values_list('pk', flat=True)], self.expected[3:])
+
+        end = self.start + timedelta(days=1)
+        for bad in ('not-base64!', paginator.encode_cursor(['x']), paginator.encode_cursor(['x', 'y'])):
+            with self.subTest(cursor=bad):
+                response = self.client.get(reverse('event-list'), {'start': self.start.isoformat(), 'end': end.isoformat(), 'cursor': bad})
+                self.assertEqual(response.status_code, 404)
+
+
+@override_settings(CALENDAR_NOTIFICATIONS={'ENABLED': False})
+class RecurrenceExpanderTests(TestCase):
+    """RRULE ni oraliq bo'yicha ochish: istisnolar, override lar, DST va oddiy eventlar bilan birlashtirish"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='rrule@example.com', password='secret')
+        cls.zone = ZoneInfo('America/New_York')
+        # 2025-03-09 da New York soatlari oldinga suriladi
+        start = datetime(2025, 3, 6, 9, 0, tzinfo=cls.zone)
+        cls.series = Event.objects.create(
+            user=cls.user, title='Daily', time_start=start, time_end=start + timedelta(minutes=30),
+            repeat='RRULE:FREQ=DAILY;COUNT=7', timezone='America/New_York',
+        )
+        EventException.objects.create(event=cls.series, original_start=datetime(2025, 3, 7, 9, 0, tzinfo=cls.zone), is_cancelled=True)
+        EventException.objects.create(
+            event=cls.series, original_start=datetime(2025, 3, 10, 9, 0, tzinfo=cls.zone),
+            time_start=datetime(2025, 3, 10, 14, 0, tzinfo=cls.zone), title='Moved',
+        )
+        single = datetime(2025, 3, 8, 12, 0, tzinfo=cls.zone)
+        cls.single = Event.objects.create(user=cls.user, title='Lunch', time_start=single, time_end=single + timedelta(hours=1))
+
+    def expand(self, start, end, **kwargs):
+        expander = RecurrenceExpander(cache=LocMemCache('recurrence-tests', {}), chunk_days=2)
+        return list(expander.expand(Event.objects.filter(user=self.user), start, end, **kwargs))
+
+    def test_expand(self):
+        occurrences = self.expand(datetime(2025, 3, 1, tzinfo=self.zone), datetime(2025, 3, 20, tzinfo=self.zone))
+        local = [(occurrence.time_start.astimezone(self.zone).strftime('%m-%d %H:%M'), occurrence.title) for occurrence in occurrences]
+        self.assertEqual(local, [
+            ('03-06 09:00', 'Daily'),
+            ('03-08 09:00', 'Daily'),
+            ('03-08 12:00', 'Lunch'),
+            # DST dan keyin ham mahalliy 09:00
+            ('03-09 09:00', 'Daily'),
+            ('03-10 14:00', 'Moved'),
+            ('03-11 09:00', 'Daily'),
+            ('03-12 09:00', 'Daily'),
+        ])
+        moved = occurrences[4]
+        self.assertEqual(moved.original_start, datetime(2025, 3, 10, 9, 0, tzinfo=self.zone))
+        self.assertEqual(moved.time_end - moved.time_start, timedelta(minutes=30))
+
+    def test_window_and_cursor(self):
+        start, end = datetime(2025, 3, 8, 9, 15, tzinfo=self.zone), datetime(2025, 3, 11, tzinfo=self.zone)
+        occurrences = self.expand(start, end)
+        # 09:00-09:30 davom etayotgani kiradi; override asl vaqti emas, yangi vaqti bo'yicha
+        self.assertEqual([occurrence.title for occurrence in occurrences], ['Daily', 'Lunch', 'Daily', 'Moved'])
+
+        after = occurrences[1].sort_key
+        rest = self.expand(start, end, after=after, limit=1)
+        self.assertEqual([occurrence.sort_key for occurrence in rest], [occurrence.sort_key for occurrence in occurrences[2:]])
+
+
+class AuditPartitionTests(TestCase):
+    """AuditLog oylik partitionlari (faqat PostgreSQL): yaratish, DEFAULT dan ko'chirish va arxivlash"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='partitions@example.com', password='secret')
+        # Migration yaratgan oylardan ancha keyin
+        cls.month = datetime(2031, 1, 1, tzinfo=ZoneInfo('UTC'))
+
+    def test_month_helpers(self):
+        self.assertEqual(month_start(datetime(2031, 1, 1, 3, 0, tzinfo=ZoneInfo('Asia/Tashkent'))), datetime(2030, 12, 1, tzinfo=ZoneInfo('UTC')))
+        self.assertEqual(add_months(self.month, -1), datetime(2030, 12, 1, tzinfo=ZoneInfo('UTC')))
+        self.assertEqual(add_months(self.month, 13), datetime(2032, 2, 1, tzinfo=ZoneInfo('UTC')))
+        self.assertEqual(partition_name(self.month), 'calendarapp_auditlog_p2031_01')
+
+    @skipIf(connection.vendor == 'postgresql', 'SQLite / boshqa DB lar uchun')
+    def test_not_partitioned(self):
+        self.assertFalse(is_partitioned())
+        output = StringIO()
+        call_command('audit_partitions', stdout=output)
+        self.assertIn('partitionlanmagan', output.getvalue())
+
+    @skipUnless(connection.vendor == 'postgresql', 'PostgreSQL partitionlari')
+    def test_create_and_archive(self):
+        self.assertTrue(is_partitioned())
+        log = AuditLog.objects.create(
+            user=self.user, action='view', model_name='Event', object_id=uuid.uuid4(),
+            created_at=self.month + timedelta(days=14),
+        )
+        self.assertEqual(ensure_partitions(ahead=1, now=self.month), ['calendarapp_auditlog_p2031_01', 'calendarapp_auditlog_p2031_02'])
+        self.assertEqual(ensure_partitions(ahead=1, now=self.month), [])
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT tableoid::regclass::text FROM calendarapp_auditlog WHERE id = %s', [log.pk])
+            # DEFAULT partition dagi qator yangi oyga ko'chirildi
+            self.assertEqual(cursor.fetchone()[0], 'calendarapp_auditlog_p2031_01')
+
+        with tempfile.TemporaryDirectory() as archive_dir:
+            now = add_months(self.month, 1)
+            names = apply_retention(retention_months=0, archive_dir=archive_dir, now=now, dry_run=True)
+            self.assertIn('calendarapp_auditlog_p2031_01', names)
+            self.assertNotIn('calendarapp_auditlog_p2031_02', names)
+
+            path = archive_partition('calendarapp_auditlog_p2031_01', archive_dir)
+            with gzip.open(path, 'rt', encoding='utf-8') as archive:
+                rows = [json.loads(line) for line in archive]
+        self.assertEqual([row['id'] for row in rows], [str(log.pk)])
+        self.assertNotIn(self.month, list_partitions())
+        self.assertNotIn(self.month, list_detached())
+        self.assertFalse(AuditLog.objects.filter(pk=log.pk).exists())
+
+
+class LargeTableAdminTests(TestCase):
+    """Taxminiy / chegaralangan COUNT va changelist dagi keyset sahifalash"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(email='large@example.com', password='secret')
+        now = timezone.now()
+        AuditLog.objects.bulk_create(
+            AuditLog(user=cls.admin, action='view', model_name='Event', object_id=uuid.uuid4(), created_at=now - timedelta(seconds=index // 2))
+            for index in range(60)
+        )
+
+    def test_count_capped(self):
+        paginator = EstimatedCountPaginator(AuditLog.objects.filter(action='view'), 10)
+        paginator.count_limit = 25
+        self.assertEqual(paginator.count, 25)
+        self.assertTrue(paginator.capped)
+        self.assertFalse(paginator.estimated)
+
+        paginator = EstimatedCountPaginator(AuditLog.objects.filter(action='view'), 10)
+        self.assertEqual(paginator.count, 60)
+        self.assertFalse(paginator.capped)
+
+    def test_count_estimated(self):
+        with mock.patch('apps.base.admin.estimate_count', return_value=250000) as estimate:
+            paginator = EstimatedCountPaginator(AuditLog.objects.all(), 10)
+            self.assertEqual(paginator.count, 250000)
+            self.assertTrue(paginator.estimated)
+            # Filtr bo'lsa statistika ishlatilmaydi
+            filtered = EstimatedCountPaginator(AuditLog.objects.filter(action='view'), 10)
+            self.assertEqual(filtered.count, 60)
+        self.assertEqual(estimate.call_count, 1)
+
+        # Kichik jadvalda aniq COUNT
+        with mock.patch('apps.base.admin.estimate_count', return_value=500):
+            self.assertEqual(EstimatedCountPaginator(AuditLog.objects.all(), 10).count, 60)
+
+    @skipIf(connection.vendor == 'postgresql', 'SQLite / boshqa DB lar uchun')
+    def test_estimate_needs_postgresql(self):
+        self.assertIsNone(estimate_count(AuditLog.objects.all()))
+
+    def test_keyset_pages(self):
+        self.client.force_login(self.admin)
+        changelist_url = reverse('admin:calendarapp_auditlog_changelist')
+        url, seen = changelist_url, []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            changelist = response.context['cl']
+            seen.extend(log.pk for log in changelist.result_list)
+            # next_url - faqat query string
+            url = changelist.next_url and changelist_url + changelist.next_url
+        expected = list(AuditLog.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+        self.assertEqual(seen, expected)
+
+        # Noto'g'ri cursor - xato sahifasi emas, filtrsiz ro'yxatga qaytish
+        response = self.client.get(changelist_url, {'cursor': encode_cursor(['x', 'y'])})
+        self.assertEqual(response.status_code, 302)
+
+
+@override_settings(CALENDAR_NOTIFICATIONS={'ENABLED': False})
+class DayRangeTests(TestCase):
+    """Kun oralig'i: DST kunlari va yarim tundan o'tadigan eventlar ([start, end) kesishish)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='days@example.com', password='secret')
+        cls.zone = ZoneInfo('America/New_York')
+
+        def add(title, start, hours):
+            start = datetime(*start, tzinfo=cls.zone)
+            Event.objects.create(user=cls.user, title=title, time_start=start, time_end=start + timedelta(hours=hours))
+
+        # 2025-03-09 - soatlar oldinga suriladigan kun
+        add('Overnight', (2025, 3, 8, 22, 0), 4)
+        add('Ends at midnight', (2025, 3, 8, 23, 0), 1)
+        add('Late', (2025, 3, 9, 23, 30), 2)
+        add('Next day', (2025, 3, 10, 0, 0), 1)
+
+    def test_dst_day_length(self):
+        start, end = day_range(datetime(2025, 3, 9).date(), 'America/New_York')
+        self.assertEqual(start, datetime(2025, 3, 9, tzinfo=self.zone))
+        # Bir xil tzinfo li datetime larni ayirish devor soatini beradi - haqiqiy davomiylik timestamp bo'yicha
+        self.assertEqual(end.timestamp() - start.timestamp(), 23 * 3600)
+        start, end = day_range(datetime(2025, 11, 2).date(), self.zone)
+        self.assertEqual(end.timestamp() - start.timestamp(), 25 * 3600)
+
+    def test_on_day(self):
+        events = Event.objects.for_user(self.user).on_day(datetime(2025, 3, 9).date(), 'America/New_York')
+        self.assertEqual(sorted(events.values_list('title', flat=True)), ['Late', 'Overnight'])
+
+        # Toshkent kuni New York kunidan oldin boshlanadi
+        events = Event.objects.for_user(self.user).on_day(datetime(2025, 3, 9).date(), 'Asia/Tashkent')
+        self.assertEqual(sorted(events.values_list('title', flat=True)), ['Ends at midnight', 'Overnight'])
+
+    def test_default_today(self):
+        with timezone.override(self.zone), mock.patch('django.utils.timezone.now', return_value=datetime(2025, 3, 9, 15, 0, tzinfo=self.zone)):
+            self.assertEqual(day_range(), (datetime(2025, 3, 9, tzinfo=self.zone), datetime(2025, 3, 10, tzinfo=self.zone)))
+
+
+@override_settings(
+    CALENDAR_NOTIFICATIONS={'ENABLED': False},
+    CALENDAR_INVITES={'ENABLED': False},
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+)
+class UserRequestPipelineTests(TestCase):
+    """POST /user-requests/create/ (202 va ?sync=1), parse_user_request task va polling"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='pipeline@example.com', password='secret')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.layer = get_channel_layer()
+        self.channel = async_to_sync(self.layer.new_channel)()
+        async_to_sync(self.layer.group_add)(f'user_{self.user.pk}', self.channel)
+
+    def pushed(self):
+        return async_to_sync(self.layer.receive)(self.channel)['request']
+
+    def test_async_create_and_poll(self):
+        with mock.patch.object(tasks.parse_user_request, 'delay') as delay, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('user-request-create'), {'text': 'Ertaga soat 14:00 da jamoa bilan uchrashuv'})
+        # Audit yozuvi sink thread ini kutmasdan (test tranzaksiyasi ichida)
+        get_sink().flush()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], UserRequest.Status.PENDING)
+        delay.assert_called_once_with(response.data['id'])
+
+        detail = reverse('user-request-detail', args=[response.data['id']])
+        self.assertEqual(self.client.get(detail).data['status'], UserRequest.Status.PENDING)
+
+        self.assertEqual(tasks.parse_user_request(response.data['id']), UserRequest.Status.DONE)
+        pushed = self.pushed()
+        self.assertEqual((pushed['id'], pushed['status']), (response.data['id'], UserRequest.Status.DONE))
+        self.assertEqual(pushed['result']['action'], 'created')
+        self.assertEqual(self.client.get(detail).data['result'], pushed['result'])
+        # Ikkinchi marta ishga tushsa hech narsa qilmaydi
+        self.assertIsNone(tasks.parse_user_request(response.data['id']))
+
+        other = User.objects.create_user(email='pipeline-other@example.com', password='secret')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(detail).status_code, 404)
+
+    def test_sync_create(self):
+        response = self.client.post(reverse('user-request-create') + '?sync=1', {'text': 'Ertaga soat 14:00 da jamoa bilan uchrashuv'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['status'], UserRequest.Status.DONE)
+        self.assertTrue(Event.objects.filter(pk=response.data['result']['event_id'], user=self.user).exists())
+
+    def test_parse_error_fails_request(self):
+        user_request = UserRequest.objects.create(user=self.user, text='Ertaga uchrashuv', status=UserRequest.Status.PENDING)
+        with mock.patch.object(CalendarNLPParser, 'parse', side_effect=RuntimeError('parser down')):
+            self.assertEqual(tasks.parse_user_request(str(user_request.pk)), UserRequest.Status.FAILED)
+
+        user_request.refresh_from_db()
+        self.assertEqual((user_request.status, user_request.result), (UserRequest.Status.FAILED, {'error': 'parser down'}))
+        pushed = self.pushed()
+        self.assertEqual((pushed['status'], pushed['result']), (UserRequest.Status.FAILED, {'error': 'parser down'}))
+
+
+@override_settings(CALENDAR_NOTIFICATIONS={'ENABLED': False}, CALENDAR_INVITES={'ENABLED': False})
+class BatchUserRequestTests(TestCase):
+    """Bulk import: har bir element bo'yicha natija, hammasi bitta tranzaksiyada"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='batch@example.com', password='secret')
+        cls.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+
+    def parsed(self, intent='CREATE', confidence=0.9, **extracted_data):
+        extracted_data.setdefault('time_start', self.start.isoformat())
+        extracted_data.setdefault('time_end', (self.start + timedelta(hours=1)).isoformat())
+        return {'intent': intent, 'language': 'en', 'confidence': confidence, 'extracted_data': extracted_data}
+
+    def test_item_results(self):
+        texts = ['create', 'low', 'delete', 'parser error', 'bad time']
+        parse_results = [
+            self.parsed(title='Lunch', invite=['a@example.com'], alert=['10m']),
+            self.parsed(confidence=0.3, title='Maybe'),
+            self.parsed('DELETE', title='Lunch'),
+            {'intent': 'UNKNOWN', 'confidence': 0.0, 'error': 'parser down'},
+            self.parsed(title='Broken', time_start='not a date'),
+        ]
+        results = bulk_create_user_requests(self.user, texts, parse_results)
+
+        self.assertEqual([item['index'] for item in results], list(range(5)))
+        self.assertEqual([item['status'] for item in results], ['created', 'skipped', 'skipped', 'error', 'error'])
+        self.assertEqual(results[3]['error'], 'parser down')
+        event = Event.objects.get(pk=results[0]['event_id'])
+        self.assertEqual((event.title, event.invites.count(), event.alerts.count()), ('Lunch', 1, 1))
+        # Har bir matn uchun so'rov, natijasi bilan
+        requests = {str(row.pk): row for row in UserRequest.objects.filter(user=self.user)}
+        self.assertEqual(len(requests), 5)
+        self.assertEqual(requests[results[1]['request_id']].result['status'], 'skipped')
+
+    def test_single_transaction(self):
+        parse_results = [self.parsed(title='Lunch', alert=['10m']), self.parsed(title='Dinner')]
+        with mock.patch.object(EventAlert.objects, 'bulk_create', side_effect=RuntimeError('db down')):
+            with self.assertRaises(RuntimeError):
+                bulk_create_user_requests(self.user, ['a', 'b'], parse_results)
+        self.assertFalse(UserRequest.objects.filter(user=self.user).exists())
+        self.assertFalse(Event.objects.filter(user=self.user).exists())
+
+    def test_batch_view(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        texts = ['Ertaga soat 14:00 da jamoa bilan uchrashuv', 'Tomorrow at 9:00 meeting with the team']
+        response = client.post(reverse('user-request-batch-create'), {'texts': texts, 'timezone': 'Asia/Tashkent'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['count'], response.data['created']), (2, 2))
+        self.assertEqual(Event.objects.filter(user=self.user).count(), 2)
+
+        response = client.post(reverse('user-request-batch-create'), {'texts': [], 'timezone': 'Mars/Base'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {'texts', 'timezone'})
+
+    @override_settings(CALENDAR_NLP_BATCH_POOL_THRESHOLD=1, CALENDAR_NLP_BATCH_WORKERS=1)
+    def test_process_pool(self):
+        self.addCleanup(nlp_parser._reset_pool)
+        nlp_parser._reset_pool()
+        prompts = ['Ertaga soat 14:00 da jamoa bilan uchrashuv', 'Tomorrow at 9:00 meeting with the team']
+        parser = CalendarNLPParser()
+        results = parser.parse_many(prompts, user_timezone='Asia/Tashkent')
+        pool, _ = nlp_parser._get_pool()
+        # Fork emas - web process thread lari bilan xavfsiz
+        self.assertNotEqual(pool._mp_context.get_start_method(), 'fork')
+        self.assertEqual(
+            [result['extracted_data']['title'] for result in results],
+            [parser.parse(prompt, user_timezone='Asia/Tashkent')['extracted_data']['title'] for prompt in prompts],
+        )
+
+
+class ParserWarmUpTests(SimpleTestCase):
+    """Warm-up faqat server process larida (core.wsgi / core.asgi), AppConfig.ready() da emas"""
+
+    def test_ready_does_not_warm_up(self):
+        with mock.patch.object(nlp_parser, 'warm_up') as warm_up:
+            django_apps.get_app_config('calendarapp').ready()
+        warm_up.assert_not_called()
+
+    def test_server_hook(self):
+        with mock.patch.object(nlp_parser, 'warm_up') as warm_up:
+            with self.settings(CALENDAR_NLP_WARMUP=False):
+                nlp_parser.warm_up_server()
+            warm_up.assert_not_called()
+            with self.settings(CALENDAR_NLP_WARMUP=True):
+                nlp_parser.warm_up_server()
+            warm_up.assert_called_once_with()
+
+    def test_wsgi_module_warms_up(self):
+        with mock.patch.object(nlp_parser, 'warm_up') as warm_up, self.settings(CALENDAR_NLP_WARMUP=True):
+            sys.modules.pop('core.wsgi', None)
+            importlib.import_module('core.wsgi')
+        warm_up.assert_called_once_with()
+
+
+@override_settings(CALENDAR_NOTIFICATIONS={'ENABLED': False})
+class BestMatchTests(TestCase):
+    """UPDATE / DELETE uchun event tanlash: rank (0.1 aniqlikda), keyin near ga yaqinlik"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='match@example.com', password='secret')
+        cls.now = timezone.now().replace(microsecond=0)
+
+    def add(self, title, days):
+        start = self.now + timedelta(days=days)
+        return Event.objects.create(user=self.user, title=title, time_start=start, time_end=start + timedelta(hours=1))
+
+    def best_match(self, text, near=None):
+        return Event.objects.for_user(self.user).best_match(text, near=near)
+
+    def test_exact_title_beats_partial(self):
+        exact = self.add('Meeting', -30)
+        for index in range(25):
+            self.add(f'Team meeting {index}', index)
+        self.assertEqual(self.best_match('meeting'), exact)
+
+    def test_tie_break_by_near(self):
+        past, future = self.add('Standup', -2), self.add('Standup', 3)
+        self.assertEqual(self.best_match('standup'), past)
+        self.assertEqual(self.best_match('standup', near=self.now + timedelta(days=2)), future)
+
+    def test_rank_rounded(self):
+        # 'project sync a' ~0.92, 'project sync ab' ~0.89 - ikkalasi 0.9, vaqt hal qiladi
+        closer, _ = self.add('Project sync AB', 1), self.add('Project sync A', 10)
+        self.assertEqual(self.best_match('project sync'), closer)
+        # Rank farqi 0.1 dan katta bo'lsa uzoqroq bo'lsa ham yuqori rank tanlanadi
+        exact = self.add('Project sync', 20)
+        self.assertEqual(self.best_match('project sync'), exact)
+
+    def test_no_match(self):
+        self.add('Lunch', 1)
+        self.assertIsNone(self.best_match('  '))
+        self.assertIsNone(self.best_match('dentist'))
+
+
+class ChangeBufferTests(SimpleTestCase):
+    """Bitta obyektning o'zgarishlari birlashadi, frame loop li thread dan ham yuboriladi"""
+
+    def change(self, op, object_id='1', model='event', **fields):
+        change = {'model': model, 'op': op, 'id': object_id}
+        if fields:
+            change['fields'] = fields
+        return change
+
+    def test_merge(self):
+        created = self.change(notifications.CREATED, title='A')
+        updated = self.change(notifications.UPDATED, title='B', note='x')
+        deleted = self.change(notifications.DELETED)
+        self.assertIs(notifications.merge(None, updated), updated)
+        self.assertIsNone(notifications.merge(created, deleted))
+        self.assertIs(notifications.merge(updated, deleted), deleted)
+        self.assertIs(notifications.merge(deleted, created), created)
+        merged = notifications.merge(created, updated)
+        self.assertEqual(merged['op'], notifications.CREATED)
+        self.assertEqual(merged['fields'], {'title': 'B', 'note': 'x'})
+
+    def test_coalescing(self):
+        buffer = notifications.ChangeBuffer(window=3600)
+        self.addCleanup(lambda: buffer._timer and buffer._timer.cancel())
+        buffer.add([(1, self.change(notifications.UPDATED, title='A'))])
+        buffer.add([
+            (1, self.change(notifications.UPDATED, title='B')),
+            (2, self.change(notifications.UPDATED, title='C')),
+            (1, self.change(notifications.CREATED, '10', 'invite', event_id='1')),
+            (1, self.change(notifications.CREATED, '11', 'invite', event_id='2')),
+        ])
+        self.assertEqual(buffer._pending[1][('event', '1')]['fields'], {'title': 'B'})
+        self.assertEqual(len(buffer._pending[2]), 1)
+
+        # Event o'chirilsa uning invite lari haqidagi xabarlar tashlanadi
+        buffer.add([(1, self.change(notifications.DELETED))])
+        self.assertEqual(set(buffer._pending[1]), {('event', '1'), ('invite', '11')})
+        self.assertEqual(buffer._pending[1][('event', '1')]['op'], notifications.DELETED)
+
+    @override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+    async def test_flush_inside_running_loop(self):
+        channel_layer = get_channel_layer()
+        channel = await channel_layer.new_channel()
+        await channel_layer.group_add('user_1', channel)
+        buffer = notifications.ChangeBuffer(window=0)
+
+        # WINDOW=0: commit loop ishlab turgan thread da bo'lsa ham xato bermaydi
+        buffer.add([(1, self.change(notifications.UPDATED, title='A'))])
+        message = await asyncio.wait_for(channel_layer.receive(channel), 1)
+        self.assertEqual(message['type'], 'calendar_changes')
+        self.assertEqual(message['changes'], [self.change(notifications.UPDATED, title='A')])
+        await asyncio.gather(*buffer._tasks)
+
+
+@override_settings(CALENDAR_NOTIFICATIONS={'ENABLED': False})
+class EventSaveSignalTests(TestCase):
+    """Occurrence / alert fire_at faqat vaqt yoki takrorlanish o'zgarganda qayta hisoblanadi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='signals@example.com', password='secret')
+        start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.event = Event.objects.create(user=cls.user, title='Standup', time_start=start, time_end=start + timedelta(hours=1))
+
+    def save(self, **changes):
+        event = Event.objects.get(pk=self.event.pk)
+        for name, value in changes.items():
+            setattr(event, name, value)
+        with mock.patch.object(signals, 'schedule_occurrence_sync') as schedule, \
+                mock.patch.object(manager.EventAlertQuerySet, 'sync_fire_at') as sync_fire_at:
+            event.save()
+        return schedule.called, sync_fire_at.called
+
+    def test_title_change_skips_occurrences(self):
+        self.assertEqual(self.save(title='Daily standup', note='x'), (False, False))
+
+    def test_time_change_syncs(self):
+        for changes in ({'time_start': self.event.time_start - timedelta(hours=1)}, {'repeat': 'FREQ=DAILY'}, {'is_cancelled': True}):
+            with self.subTest(changes=changes):
+                self.assertEqual(self.save(**changes), (True, True))
+
+
+@override_settings(
+    CALENDAR_NOTIFICATIONS={'ENABLED': False},
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+)
+class CalendarConsumerTests(TransactionTestCase):
+    """WebSocket buyruqlari: draft -> confirm, inflight chegarasi va noto'g'ri frame lar"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='ws@example.com', password='secret')
+
+    async def connect(self):
+        communicator = WebsocketCommunicator(consumers.CalendarConsumer.as_asgi(), '/ws/calendar/')
+        communicator.scope['user'] = self.user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        self.assertEqual((await communicator.receive_json_from())['type'], 'connection_success')
+        return communicator
+
+    async def request(self, communicator, message):
+        await communicator.send_json_to(message)
+        return await communicator.receive_json_from(timeout=5)
+
+    async def test_draft_confirm_flow(self):
+        communicator = await self.connect()
+        draft = await self.request(communicator, {
+            'type': 'command', 'ref': 1, 'text': 'Ertaga soat 10:00 da Sprint planning', 'timezone': 'Asia/Tashkent',
+        })
+        self.assertEqual((draft['type'], draft['ref'], draft['parsed']['intent']), ('draft', 1, 'CREATE'))
+        self.assertFalse(await Event.objects.filter(user=self.user).aexists())
+
+        result = await self.request(communicator, {'type': 'confirm', 'ref': 2, 'draft_id': draft['draft_id']})
+        self.assertEqual((result['type'], result['ref'], result['result']['action']), ('result', 2, 'created'))
+        self.assertTrue(await Event.objects.filter(pk=result['result']['event_id'], user=self.user).aexists())
+
+        # Draft faqat bir marta tasdiqlanadi
+        again = await self.request(communicator, {'type': 'confirm', 'ref': 3, 'draft_id': draft['draft_id']})
+        self.assertEqual((again['type'], again['code']), ('error', 'draft_not_found'))
+        await communicator.disconnect()
+        await sync_to_async(get_sink().flush)()
+
+    async def test_busy_rejected(self):
+        release = threading.Event()
+
+        def parse(text, user_timezone=None):
+            release.wait(5)
+            return {'intent': 'UNKNOWN', 'confidence': 0.0, 'extracted_data': {}}
+
+        with mock.patch.dict(consumers.WS_CONFIG, MAX_INFLIGHT=1), \
+                mock.patch.object(consumers, 'get_parser', return_value=mock.Mock(parse=parse)):
+            communicator = await self.connect()
+            await communicator.send_json_to({'type': 'command', 'ref': 1, 'text': 'first'})
+            busy = await self.request(communicator, {'type': 'command', 'ref': 2, 'text': 'second'})
+            self.assertEqual((busy['type'], busy['ref'], busy['code']), ('error', 2, 'busy'))
+
+            release.set()
+            first = await communicator.receive_json_from(timeout=5)
+            self.assertEqual((first['type'], first['ref']), ('result', 1))
+            await communicator.disconnect()
+
+    async def test_invalid_frames(self):
+        communicator = await self.connect()
+        await communicator.send_to(text_data='{not json')
+        self.assertEqual((await communicator.receive_json_from())['code'], 'invalid_json')
+        await communicator.send_json_to(['command'])
+        self.assertEqual((await communicator.receive_json_from())['code'], 'invalid_message')
+        unknown = await self.request(communicator, {'type': 'subscribe', 'ref': 'a'})
+        self.assertEqual((unknown['ref'], unknown['code']), ('a', 'unknown_type'))
+
+        op = await self.request(communicator, {'type': 'op', 'ref': 'b', 'op': 'archive', 'event_id': str(uuid.uuid4())})
+        self.assertEqual((op['type'], op['ref'], op['code']), ('error', 'b', 'invalid_op'))
+        self.assertIn('archive', op['message'])
+        await communicator.disconnect()
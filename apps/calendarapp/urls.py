@@ -1,7 +1,15 @@
 from django.urls import path
-from apps.calendarapp.api import UserRequestCreateView
+from apps.calendarapp.api import (
+    UserRequestCreateView, UserRequestBatchCreateView, UserRequestDetailView, EventListView,
+    InviteRsvpView, EventInviteBulkRsvpView,
+)
 
 
 urlpatterns = [
     path('user-requests/create/', UserRequestCreateView.as_view(), name='user-request-create'),
+    path('user-requests/batch/', UserRequestBatchCreateView.as_view(), name='user-request-batch-create'),
+    path('user-requests/<uuid:pk>/', UserRequestDetailView.as_view(), name='user-request-detail'),
+    path('events/', EventListView.as_view(), name='event-list'),
+    path('events/<uuid:pk>/invites/rsvp/', EventInviteBulkRsvpView.as_view(), name='event-invite-bulk-rsvp'),
+    path('rsvp/<str:token>/', InviteRsvpView.as_view(), name='invite-rsvp'),
 ]
@@ -23,6 +23,11 @@ load_dotenv()
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", os.getenv("DJANGO_SETTINGS_MODULE"))
 django.setup()
 
+# Worker birinchi so'rovni cold-start kechikishisiz qabul qilishi uchun
+from apps.calendarapp.nlp_parser import warm_up_server  # noqa: E402
+
+warm_up_server()
+
 # Postman uchun - faqat JWT middleware
 application = ProtocolTypeRouter({
     "http": get_asgi_application(),
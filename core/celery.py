@@ -12,3 +12,18 @@ app = Celery("core")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 
 app.autodiscover_tasks()
+
+app.conf.beat_schedule = {
+    "refresh-event-occurrences": {
+        "task": "apps.calendarapp.tasks.refresh_event_occurrences",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    "maintain-audit-partitions": {
+        "task": "apps.calendarapp.tasks.maintain_audit_partitions",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "send-event-invites": {
+        "task": "apps.calendarapp.tasks.send_event_invites",
+        "schedule": crontab(minute="*/5"),
+    },
+}
@@ -114,7 +114,7 @@ ROOT_URLCONF = "core.urls"
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [BASE_DIR / "templates"],
+        "DIRS": [BASE_DIR / "templates", BASE_DIR.parent / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -209,7 +209,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
     "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
@@ -219,17 +219,128 @@ REST_FRAMEWORK = {
 }
 
 AUTH_USER_MODEL = "accounts.User"
+AUTHENTICATION_BACKENDS = ["apps.accounts.backends.EmailBackend"]
+
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_CACHE_URL"),
+        }
+        if os.getenv("REDIS_CACHE_URL")
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    ),
+}
+
+# JWT auth: user snapshot kesh (soniya) va process ichidagi tekshirilgan tokenlar soni
+ACCOUNTS_AUTH_CACHE = {
+    "CACHE_ALIAS": "default",
+    "USER_TTL": 60,
+    "TOKEN_CACHE_SIZE": 10000,
+}
+
+# Login: parol hash lash uchun cheklangan executor (navbat to'lsa 429)
+ACCOUNTS_PASSWORD_EXECUTOR = {
+    "WORKERS": int(os.getenv("ACCOUNTS_PASSWORD_WORKERS", "4")),
+    "MAX_PENDING": int(os.getenv("ACCOUNTS_PASSWORD_MAX_PENDING", "16")),
+    "TIMEOUT": 5,
+    "CACHE_ALIAS": "default",
+}
 
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND")
 
 
-EMAIL_BACKEND = os.getenv("EMAIL_BACKEND")
+# NLP parserni server process (core.wsgi / core.asgi) ishga tushganda oldindan yuklash
+CALENDAR_NLP_WARMUP = os.getenv("CALENDAR_NLP_WARMUP", "True") == "True"
+# Til aniqlash natijalari uchun LRU kesh hajmi
+CALENDAR_NLP_LANGUAGE_CACHE_SIZE = 4096
+# Bulk import: bitta requestdagi maksimal prompt soni va process pool sozlamalari
+CALENDAR_NLP_BATCH_MAX_ITEMS = 500
+CALENDAR_NLP_BATCH_WORKERS = int(os.getenv("CALENDAR_NLP_BATCH_WORKERS", "0")) or None
+CALENDAR_NLP_BATCH_POOL_THRESHOLD = 32
+# Pool worker larini ishga tushirish usuli (fork emas): forkserver / spawn; bo'sh - forkserver, bo'lmasa spawn
+CALENDAR_NLP_BATCH_START_METHOD = os.getenv("CALENDAR_NLP_BATCH_START_METHOD") or None
+# parse() natijalari keshi (kalit: prompt, til, timezone, "now" bucket)
+CALENDAR_NLP_PARSE_CACHE = {
+    "ENABLED": os.getenv("CALENDAR_NLP_PARSE_CACHE_ENABLED", "True") == "True",
+    "MAX_SIZE": 2048,
+    "TTL": 300,
+    "BUCKET_SECONDS": 60,
+    # Umumiy kesh uchun CACHES alias (masalan "default"), bo'sh bo'lsa faqat process ichida
+    "BACKEND": os.getenv("CALENDAR_NLP_PARSE_CACHE_BACKEND") or None,
+}
+# RRULE takrorlanishlarini ochish: chunk uzunligi (kun) va kesh
+CALENDAR_RECURRENCE = {
+    "CHUNK_DAYS": 31,
+    "CACHE_TTL": 60 * 60 * 24,
+    "CACHE_ALIAS": "default",
+}
+# Materialized EventOccurrence jadvali: horizon (kun) va bulk batch hajmi
+CALENDAR_OCCURRENCES = {
+    "HORIZON_DAYS": 365,
+    "BATCH_SIZE": 500,
+}
+# Alert dispatcher (manage.py run_alert_dispatcher): timing wheel va DB dan to'ldirish
+CALENDAR_ALERTS = {
+    "RESOLUTION": 1,
+    "SLOTS": (60, 60, 24),
+    "LOOKAHEAD": 60 * 60,
+    "REFILL_INTERVAL": 30,
+    "BATCH_SIZE": 200,
+    "MAX_LATENESS": 15 * 60,
+}
+# WebSocket buyruqlari: umumiy thread pool va ulanish bo'yicha parallel buyruqlar limiti
+CALENDAR_WS = {
+    "WORKERS": int(os.getenv("CALENDAR_WS_WORKERS", "8")),
+    "MAX_INFLIGHT": 4,
+}
+
+# AuditLog: process ichidagi buffer (hajm / vaqt bo'yicha bulk_create), SPOOL=True - Celery orqali
+CALENDAR_AUDIT = {
+    "MAX_SIZE": 200,
+    "MAX_AGE": 2.0,
+    "MAX_BACKLOG": 10000,
+    "SPOOL": os.getenv("CALENDAR_AUDIT_SPOOL", "False") == "True",
+    # PostgreSQL oylik partitionlari: oldindan yaratish, saqlash muddati (oy), arxiv (jsonl.gz)
+    "PARTITION_AHEAD_MONTHS": 3,
+    "RETENTION_MONTHS": int(os.getenv("CALENDAR_AUDIT_RETENTION_MONTHS", "12")),
+    "ARCHIVE_DIR": os.getenv("CALENDAR_AUDIT_ARCHIVE_DIR") or str(BASE_DIR.parent / "archive" / "auditlog"),
+}
+
+CALENDAR_NOTIFICATIONS = {
+    "ENABLED": True,
+    # Shu oraliqdagi (soniya) o'zgarishlar user ga bitta frame bo'lib yuboriladi
+    "WINDOW": float(os.getenv("CALENDAR_NOTIFY_WINDOW", "0.25")),
+    "MAX_BATCH": 500,
+}
+
+
+CALENDAR_INVITES = {
+    "ENABLED": True,
+    # Bitta SMTP ulanish orqali yuboriladigan xatlar va sekundiga xatlar (worker process ichida)
+    "BATCH_SIZE": 50,
+    "RATE_LIMIT": float(os.getenv("CALENDAR_INVITE_RATE_LIMIT", "10")),
+    "MAX_ATTEMPTS": 5,
+    "SITE_URL": os.getenv("CALENDAR_SITE_URL", ""),
+}
+
+CALENDAR_RSVP = {
+    # Emaildagi javob linklari amal qilish muddati (soniya)
+    "MAX_AGE": int(os.getenv("CALENDAR_RSVP_MAX_AGE", str(60 * 60 * 24 * 90))),
+    "BATCH_SIZE": 500,
+    "MAX_ITEMS": 5000,
+}
+
+
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND") or "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = os.getenv("EMAIL_HOST")
-EMAIL_PORT = os.getenv("EMAIL_PORT")
-EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT") or 587)
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS") == "True"
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
+EMAIL_TIMEOUT = 30
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL") or EMAIL_HOST_USER or "webmaster@localhost"
 
 
 
@@ -17,3 +17,8 @@ load_dotenv()
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", os.getenv("DJANGO_SETTINGS_MODULE"))
 
 application = get_wsgi_application()
+
+# Worker birinchi so'rovni cold-start kechikishisiz qabul qilishi uchun
+from apps.calendarapp.nlp_parser import warm_up_server  # noqa: E402
+
+warm_up_server()